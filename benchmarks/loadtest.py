@@ -0,0 +1,62 @@
+"""
+Offline load test of the full optimize_resume pipeline.
+
+Drives ResumeOptimizer with the deterministic fake chat model, which
+simulates provider latency, generation speed and failures, and prints
+throughput with per-stage p50/p95/p99 latencies. No API calls are made.
+
+    poetry run python benchmarks/loadtest.py --requests 50 --concurrency 10
+"""
+import argparse
+import asyncio
+import tempfile
+from pathlib import Path
+from yaart.fake_llm import FakeChatModel, lognormal
+from yaart.loadtest import run_load_test
+from yaart.optimizer import ResumeOptimizer
+
+SAMPLE_RESUME = Path(__file__).resolve().parent.parent / "Markdown" / "sample.md"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.5,
+                        help="median time to first token in seconds")
+    parser.add_argument("--sigma", type=float, default=0.5,
+                        help="lognormal spread of the time to first token")
+    parser.add_argument("--tokens-per-second", type=float, default=80.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--resume", type=Path, default=SAMPLE_RESUME)
+    return parser.parse_args()
+
+
+async def main(args: argparse.Namespace) -> None:
+    llm = FakeChatModel(
+        seed=args.seed,
+        latency=lognormal(args.latency, args.sigma),
+        tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+    )
+    resume = args.resume.resolve()
+    with tempfile.TemporaryDirectory() as workdir:
+        for subdir in ("Markdown", "PDF"):
+            (Path(workdir) / subdir).mkdir()
+        # Keep the job database and outputs out of the working tree
+        db_path = Path(workdir) / "jobs.db"
+        async with ResumeOptimizer(llm=llm, db_path=db_path) as optimizer:
+            report = await run_load_test(
+                optimizer, resume, Path(workdir),
+                requests=args.requests, concurrency=args.concurrency
+            )
+    print(report.format())
+    for error in sorted(set(report.errors)):
+        print(f"error: {error}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,87 @@
+"""
+Per-call overhead of building prompts, parsers and chains.
+
+Compares the previous behaviour (a new PromptTemplate, format instructions
+and chain on every call) with the compiled chains ResumeAssistant now keeps.
+An instant fake chat model is used so only the orchestration cost is measured.
+
+    poetry run python benchmarks/prompt_overhead.py [iterations]
+"""
+import io
+import json
+import sys
+import time
+from contextlib import redirect_stdout
+from langchain.output_parsers import PydanticOutputParser
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from yaart.llm import ResumeAssistant, layered_prompt, output_text
+from yaart.models import JobDescription, JobRequirements, TailoredResume
+from yaart.prompts import TAILOR_RESUME_INSTRUCTIONS, TAILOR_RESUME_LAYERS
+
+RESUME = {
+    "name": "Jane Doe",
+    "title": "Data Engineer",
+    "location": "Austin, TX",
+    "phone": "5555555555",
+    "email": "jane@example.com",
+    "github": "github.com/janedoe",
+    "linkedin": "linkedin.com/in/janedoe",
+    "summary": "Data Engineer with 8 years of experience.",
+    "education": [{"degree": "BS Computer Science", "institution": "UT Austin",
+                   "dates": "08/2010 - 05/2014"}],
+    "skills": [{"category": "Languages", "skills": ["Python", "SQL"]}],
+    "experience": [{"title": "Data Engineer", "company": "Acme",
+                    "location": "Remote", "dates": "01/2020 - Present",
+                    "bullets": ["Built Spark pipelines"]}],
+}
+JOB_DESCRIPTION = JobDescription(
+    url="https://example.com/job",
+    role="Senior Data Engineer",
+    company="TestCo",
+    location="Remote",
+    responsibilities=["Build pipelines"],
+    requirements=JobRequirements(skills=["Python"], experience=[], education=[]),
+    benefits=[],
+    other_information={},
+)
+
+
+def legacy_tailor(llm, resume_content: str) -> str:
+    """The pre-compilation code path: everything rebuilt on every call"""
+    parser = PydanticOutputParser(pydantic_object=TailoredResume)
+    prompt = layered_prompt(
+        TAILOR_RESUME_INSTRUCTIONS, TAILOR_RESUME_LAYERS,
+        parser.get_format_instructions()
+    )
+    chain = prompt | llm
+    result = chain.invoke({
+        "resume": resume_content,
+        "job_description": JOB_DESCRIPTION.model_dump_json(),
+    })
+    return parser.parse(output_text(result)).to_markdown()
+
+
+def timed(iterations: int, func) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return time.perf_counter() - start
+
+
+def main(iterations: int = 2000) -> None:
+    llm = FakeListChatModel(responses=[json.dumps(RESUME)])
+    assistant = ResumeAssistant(llm=llm)
+    # Only orchestration overhead is of interest, so discard any console output
+    with redirect_stdout(io.StringIO()):
+        legacy = timed(iterations, lambda: legacy_tailor(llm, "resume"))
+        compiled = timed(
+            iterations, lambda: assistant.tailor_resume("resume", JOB_DESCRIPTION)
+        )
+    print(f"{iterations} tailor_resume calls")
+    print(f"legacy   {legacy:8.3f}s  ({legacy / iterations * 1e6:.1f} µs/call)")
+    print(f"compiled {compiled:8.3f}s  ({compiled / iterations * 1e6:.1f} µs/call)")
+    print(f"overhead removed per call: {(legacy - compiled) / iterations * 1e6:.1f} µs")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
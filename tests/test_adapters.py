@@ -0,0 +1,150 @@
+import json
+from pathlib import Path
+import pytest
+from yaart.adapters import (
+    AdapterRegistry,
+    ATSAdapter,
+    GreenhouseAdapter,
+    LeverAdapter,
+    AshbyAdapter,
+    WorkdayAdapter,
+)
+from yaart.jsonld import missing_fields
+
+FIXTURES = Path(__file__).parent / "fixtures" / "ats"
+
+def load_fixture(name):
+    return json.loads((FIXTURES / name).read_text())
+
+@pytest.mark.parametrize("url,adapter,api_url", [
+    ("https://boards.greenhouse.io/acmecorp/jobs/4012345",
+     "greenhouse",
+     "https://boards-api.greenhouse.io/v1/boards/acmecorp/jobs/4012345"
+     "?pay_transparency=true"),
+    ("https://job-boards.greenhouse.io/acmecorp?gh_jid=4012345",
+     "greenhouse",
+     "https://boards-api.greenhouse.io/v1/boards/acmecorp/jobs/4012345"
+     "?pay_transparency=true"),
+    ("https://jobs.lever.co/globex/5ac21346-8e0c/apply",
+     "lever",
+     "https://api.lever.co/v0/postings/globex/5ac21346-8e0c"),
+    ("https://jobs.ashbyhq.com/initech/8d7e5c1a",
+     "ashby",
+     "https://api.ashbyhq.com/posting-api/job-board/initech"
+     "?includeCompensation=true"),
+    ("https://umbrella.wd5.myworkdayjobs.com/en-US/External/job/Raleigh-NC/"
+     "Cloud-Security-Engineer_R-10234",
+     "workday",
+     "https://umbrella.wd5.myworkdayjobs.com/wday/cxs/umbrella/External/job/"
+     "Raleigh-NC/Cloud-Security-Engineer_R-10234"),
+])
+def test_registry_resolves_known_hosts(url, adapter, api_url):
+    resolved = AdapterRegistry().resolve(url)
+    
+    assert resolved is not None
+    assert resolved[0].name == adapter
+    assert resolved[1] == api_url
+
+@pytest.mark.parametrize("url", [
+    "https://example.com/careers/123",
+    "https://boards.greenhouse.io/acmecorp",
+    "https://jobs.lever.co/globex",
+])
+def test_registry_ignores_unknown_urls(url):
+    assert AdapterRegistry().resolve(url) is None
+
+def test_registry_register_takes_precedence():
+    class CustomAdapter(ATSAdapter):
+        name = "custom"
+        
+        def api_url(self, url):
+            return "https://api.example.com/job" if "lever" in url else None
+        
+        def to_fields(self, data, url):
+            return {"url": url}
+    
+    registry = AdapterRegistry()
+    registry.register(CustomAdapter())
+    
+    adapter, _ = registry.resolve("https://jobs.lever.co/globex/123")
+    assert adapter.name == "custom"
+
+def test_adapter_requires_both_methods():
+    class PartialAdapter(ATSAdapter):
+        def api_url(self, url):
+            return None
+    
+    with pytest.raises(TypeError):
+        PartialAdapter()
+
+def test_greenhouse_fixture():
+    fields = GreenhouseAdapter().to_fields(
+        load_fixture("greenhouse_job.json"),
+        "https://boards.greenhouse.io/acmecorp/jobs/4012345"
+    )
+    
+    assert fields["role"] == "Senior Data Engineer"
+    assert fields["company"] == "Acme Corp"
+    assert fields["location"] == "New York, NY"
+    assert fields["salary"] == "USD 150,000-190,000"
+    assert fields["responsibilities"] == [
+        "Design and operate batch and streaming pipelines",
+        "Partner with analysts on data models",
+    ]
+    assert fields["requirements"]["experience"][1] == "Strong Python and SQL"
+    assert fields["benefits"] == ["Medical, dental and vision"]
+    assert fields["other_information"]["department"] == "Data Platform"
+    assert missing_fields(fields) == []
+
+def test_lever_fixture():
+    fields = LeverAdapter().to_fields(
+        load_fixture("lever_posting.json"),
+        "https://jobs.lever.co/globex/5ac21346-8e0c-4494-8e7a-3eb92ff77902"
+    )
+    
+    assert fields["role"] == "Backend Engineer"
+    assert fields["company"] == "Globex"
+    assert fields["location"] == "Remote; San Francisco, CA"
+    assert fields["salary"] == "USD 140,000-180,000 per year salary"
+    assert fields["responsibilities"] == ["Build Go services", 
+                                          "Own on-call rotations"]
+    assert fields["requirements"]["experience"] == ["3+ years building APIs"]
+    assert "flexible hours" in fields["description"]
+    assert missing_fields(fields) == []
+
+def test_ashby_fixture():
+    fields = AshbyAdapter().to_fields(
+        load_fixture("ashby_board.json"),
+        "https://jobs.ashbyhq.com/initech/8d7e5c1a-2b3c-4d5e-9f60-1a2b3c4d5e6f"
+    )
+    
+    assert fields["role"] == "Machine Learning Engineer"
+    assert fields["company"] == "Initech"
+    assert fields["location"] == "Remote; Berlin; Munich"
+    assert fields["salary"] == "€80K – €100K"
+    assert fields["responsibilities"] == ["Train and evaluate ranking models"]
+    assert fields["requirements"]["experience"] == ["Experience with PyTorch"]
+    assert fields["other_information"]["team"] == "Applied ML"
+
+def test_ashby_missing_job():
+    with pytest.raises(ValueError):
+        AshbyAdapter().to_fields(
+            load_fixture("ashby_board.json"),
+            "https://jobs.ashbyhq.com/initech/does-not-exist"
+        )
+
+def test_workday_fixture():
+    fields = WorkdayAdapter().to_fields(
+        load_fixture("workday_job.json"),
+        "https://umbrella.wd5.myworkdayjobs.com/External/job/Raleigh-NC/"
+        "Cloud-Security-Engineer_R-10234"
+    )
+    
+    assert fields["role"] == "Cloud Security Engineer"
+    assert fields["company"] == "Umbrella Corporation"
+    assert fields["location"] == "Raleigh, NC; Austin, TX"
+    assert fields["responsibilities"] == ["Harden AWS accounts", 
+                                          "Run threat models"]
+    assert fields["requirements"]["experience"][1] == "AWS security certification"
+    assert fields["other_information"]["requisition_id"] == "R-10234"
+    assert "Secure our cloud estate." in fields["description"]
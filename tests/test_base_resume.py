@@ -0,0 +1,56 @@
+import pytest
+from yaart.base_resume import BaseResumeCache, compact_resume, resume_hash
+from yaart.models import TailoredResume
+
+@pytest.fixture
+def resume():
+    return TailoredResume.model_validate({
+        "name": "John Doe", "title": "Engineer", "location": "Remote",
+        "phone": "1234567890", "email": "john@example.com",
+        "github": "github.com/johndoe", "linkedin": "linkedin.com/in/johndoe",
+        "summary": "Engineer with 5 years of experience",
+        "education": [{"degree": "BS CS", "institution": "Test University",
+                       "dates": "08/2015 - 05/2019"}],
+        "skills": [{"category": "Languages", "skills": ["Python", "Go"]}],
+        "experience": [{
+            "title": "Senior Engineer", "company": "Tech Corp",
+            "company_description": "Leading AI Startup", "location": "Remote",
+            "dates": "06/2021 - Present", "bullets": ["Built APIs", "Cut costs"]
+        }],
+        "publications": [{"journal": "JMLR", "title": "Paper", "date": "May 2022"}],
+    })
+
+def test_resume_hash():
+    assert resume_hash("# Resume") == resume_hash(b"# Resume")
+    assert resume_hash("# Resume") != resume_hash("# Resume\n")
+
+def test_cache_round_trip(tmp_path, resume):
+    cache = BaseResumeCache(tmp_path / "resumes")
+    key = resume_hash("# Resume")
+
+    assert cache.get(key) is None
+    cache.set(key, resume)
+
+    assert cache.get(key) == resume
+    resumes = tmp_path / "resumes"
+    assert list(resumes.iterdir()) == [resumes / f"{key}.json"]
+
+def test_cache_drops_corrupt_entries(tmp_path):
+    cache = BaseResumeCache(tmp_path)
+    (tmp_path / "abc.json").write_text('{"name": "John Doe"}')
+
+    assert cache.get("abc") is None
+    assert not (tmp_path / "abc.json").exists()
+
+def test_compact_resume(resume):
+    compact = compact_resume(resume)
+
+    assert compact.startswith("Name: John Doe\nTitle: Engineer\nContact: Remote | ")
+    assert "Senior Engineer | Tech Corp (Leading AI Startup) | Remote | " \
+        "06/2021 - Present\n- Built APIs\n- Cut costs" in compact
+    assert "- Languages: Python, Go" in compact
+    assert "- BS CS | Test University | 08/2015 - 05/2019" in compact
+    assert "- JMLR | Paper | May 2022" in compact
+    assert "Open-Source" not in compact
+    assert "<" not in compact and "**" not in compact
+    assert len(compact) < len(resume.to_markdown())
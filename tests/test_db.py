@@ -1,6 +1,9 @@
+import asyncio
 import pytest
 import sqlite3
-from yaart.db import JobDatabase
+import threading
+import time
+from yaart.db import AsyncJobDatabase, JobDatabase
 from yaart.models import JobDescription, JobRequirements
 
 @pytest.fixture
@@ -22,30 +25,10 @@ def sample_job_description():
     )
 
 @pytest.fixture
-def db():
-    # Use in-memory database for testing
-    with sqlite3.connect(':memory:') as conn:
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        # Create schema
-        cursor.execute('''
-            CREATE TABLE descriptions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                url TEXT UNIQUE,
-                role TEXT,
-                company TEXT,
-                location TEXT,
-                responsibilities TEXT,
-                skills_requirements TEXT,
-                salary TEXT,
-                benefits TEXT,
-                other_information TEXT
-            )
-        ''')
-        conn.commit()
-        
-        yield JobDatabase()
+def db(tmp_path):
+    database = JobDatabase(tmp_path / "jobs.db")
+    yield database
+    database.close()
 
 def test_save_and_get_job_description(db, sample_job_description):
     # Save job description
@@ -76,3 +59,358 @@ def test_update_existing_job_description(db, sample_job_description):
     # Verify update
     result = db.get_job_description(sample_job_description.url)
     assert result.role == "Senior Software Engineer"
+
+def test_connection_is_reused_per_thread(db):
+    connection = db.connection
+    assert db.connection is connection
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(db.connection))
+    thread.start()
+    thread.join()
+    assert other[0] is not connection
+
+def test_pragmas(db):
+    conn = db.connection
+
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    assert conn.execute("PRAGMA cache_size").fetchone()[0] == -65536
+
+def test_reader_thread_sees_committed_writes(db, sample_job_description):
+    db.save_job_description(sample_job_description)
+
+    url = sample_job_description.url
+    results = []
+    thread = threading.Thread(
+        target=lambda: results.append(db.get_job_description(url))
+    )
+    thread.start()
+    thread.join()
+    assert results[0].role == sample_job_description.role
+
+def test_configurable_path_persists(tmp_path, sample_job_description):
+    path = tmp_path / "nested.db"
+    with JobDatabase(path) as db:
+        db.save_job_description(sample_job_description)
+
+    with JobDatabase(path) as db:
+        assert db.get_job_description(sample_job_description.url) is not None
+
+def test_in_memory_database_is_shared_across_threads(sample_job_description):
+    with JobDatabase(":memory:") as db:
+        thread = threading.Thread(
+            target=lambda: db.save_job_description(sample_job_description)
+        )
+        thread.start()
+        thread.join()
+
+        assert db.get_job_description(sample_job_description.url) is not None
+    # Each in-memory database is private to its JobDatabase
+    with JobDatabase(":memory:") as other:
+        assert other.get_job_description(sample_job_description.url) is None
+
+def test_bulk_save_and_lookup(db, sample_job_description):
+    jobs = [
+        sample_job_description.model_copy(update={
+            "url": f"https://example.com/job/{i}", "role": f"Engineer {i}"
+        })
+        for i in range(1500)
+    ]
+    db.save_job_descriptions(iter(jobs))
+
+    urls = [job.url for job in jobs] + ["https://nonexistent.com/job"]
+    results = db.get_job_descriptions(urls)
+
+    assert len(results) == 1500
+    assert results["https://example.com/job/42"].role == "Engineer 42"
+    assert "https://nonexistent.com/job" not in results
+    assert db.get_job_descriptions([]) == {}
+
+def test_bulk_save_is_one_transaction(db, sample_job_description):
+    invalid = sample_job_description.model_copy(update={"url": None})
+    db.connection.execute(
+        "CREATE TRIGGER reject_null_url BEFORE INSERT ON descriptions "
+        "WHEN NEW.url IS NULL BEGIN SELECT RAISE(ABORT, 'url required'); END"
+    )
+
+    with pytest.raises(sqlite3.IntegrityError):
+        db.save_job_descriptions([sample_job_description, invalid])
+
+    assert db.get_job_description(sample_job_description.url) is None
+
+@pytest.fixture
+def postings(sample_job_description):
+    def posting(slug, role, skills, responsibilities):
+        return sample_job_description.model_copy(update={
+            "url": f"https://example.com/{slug}",
+            "role": role,
+            "responsibilities": responsibilities,
+            "requirements": JobRequirements(skills=skills, experience=[], education=[]),
+        })
+    return [
+        posting("data", "Data Engineer", ["Spark", "SQL"], ["Build pipelines"]),
+        posting("backend", "Backend Engineer", ["Go", "Postgres"],
+                ["Design APIs", "Maintain data pipelines"]),
+        posting("designer", "Product Designer", ["Figma"], ["Run user research"]),
+    ]
+
+def test_search_ranks_matches(db, postings):
+    db.save_job_descriptions(postings)
+
+    results = db.search("data pipelines")
+
+    # Both mention pipelines, but only one has data in the role
+    assert [jd.url for jd in results] == [
+        "https://example.com/data", "https://example.com/backend"
+    ]
+    assert [jd.role for jd in db.search("spark")] == ["Data Engineer"]
+    # Stemming matches "research" against "researching"
+    assert [jd.role for jd in db.search("researching")] == ["Product Designer"]
+    # Field names from the stored JSON are not indexed
+    assert db.search("skills") == []
+
+def test_search_pagination(db, postings):
+    db.save_job_descriptions(postings)
+
+    first = db.search("engineer", limit=1)
+    second = db.search("engineer", limit=1, offset=1)
+
+    assert len(first) == len(second) == 1
+    assert first[0].url != second[0].url
+
+def test_search_follows_updates_and_deletes(db, postings):
+    db.save_job_descriptions(postings)
+    db.save_job_description(postings[0].model_copy(update={"role": "Analytics Lead"}))
+
+    assert [jd.role for jd in db.search("analytics")] == ["Analytics Lead"]
+    assert [jd.role for jd in db.search("role: data")] == []
+
+    with db.transaction() as conn:
+        conn.execute("DELETE FROM descriptions WHERE url = ?", (postings[2].url,))
+    assert db.search("figma") == []
+
+def test_search_indexes_existing_rows(tmp_path, postings):
+    path = tmp_path / "legacy.db"
+    with JobDatabase(path) as db:
+        db.save_job_descriptions(postings)
+        with db.transaction() as conn:
+            conn.execute("DROP TABLE descriptions_fts")
+
+    with JobDatabase(path) as db:
+        assert [jd.role for jd in db.search("figma")] == ["Product Designer"]
+
+def test_search_invalid_query(db):
+    with pytest.raises(ValueError, match="Invalid search query"):
+        db.search('"unbalanced')
+
+def test_requirements_are_normalized(db, postings):
+    db.save_job_descriptions(postings)
+    db.save_job_description(postings[1].model_copy(update={
+        "requirements": JobRequirements(
+            skills=["Golang", "postgres ", "Go"],
+            experience=["3+ years"],
+            education=["BS", "MS"]
+        )
+    }))
+
+    skills = db.connection.execute(
+        "SELECT skill FROM job_skills s JOIN descriptions d ON d.id = s.description_id "
+        "WHERE d.url = ? ORDER BY skill", (postings[1].url,)
+    ).fetchall()
+    assert [row['skill'] for row in skills] == ["go", "postgresql"]
+    education = db.connection.execute(
+        "SELECT text FROM job_requirements WHERE kind = 'education' ORDER BY position"
+    ).fetchall()
+    assert [row['text'] for row in education] == ["BS", "MS"]
+
+    with db.transaction() as conn:
+        conn.execute("DELETE FROM descriptions")
+    assert db.connection.execute("SELECT COUNT(*) FROM job_skills").fetchone()[0] == 0
+
+def test_plain_sqlite_clients_can_write(tmp_path, postings):
+    path = tmp_path / "jobs.db"
+    with JobDatabase(path) as db:
+        db.save_job_descriptions(postings)
+
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute(
+            "UPDATE descriptions SET skills_requirements = ? WHERE url = ?",
+            ('{"skills": ["Rust"], "experience": [], "education": []}', postings[0].url)
+        )
+        conn.execute("DELETE FROM descriptions WHERE url = ?", (postings[1].url,))
+    conn.close()
+
+    with JobDatabase(path) as db:
+        assert db.skill_frequency() == [("figma", 1)]
+
+def test_skill_frequency_and_cooccurrence(db, postings):
+    extra = postings[0].model_copy(update={
+        "url": "https://example.com/data-2",
+        "requirements": JobRequirements(skills=["spark", "Python"], experience=[],
+                                        education=[]),
+    })
+    db.save_job_descriptions(postings + [extra])
+
+    assert db.skill_frequency(limit=2) == [("spark", 2), ("figma", 1)]
+    assert db.skill_frequency(role="data engineer") == [
+        ("spark", 2), ("python", 1), ("sql", 1)
+    ]
+    assert db.skill_frequency(since=time.time() + 60) == []
+    assert db.skill_cooccurrence("Spark") == [("python", 1), ("sql", 1)]
+    assert db.skill_cooccurrence("figma", role="engineer") == []
+
+def test_skill_frequency_role_is_literal(db, postings):
+    db.save_job_descriptions(postings)
+
+    assert db.skill_frequency(role="%") == []
+    assert db.skill_frequency(role="data_engineer") == []
+    assert db.skill_frequency(role="data engineer") != []
+
+def test_find_by_skills(db, postings):
+    db.save_job_descriptions(postings)
+
+    assert [jd.role for jd in db.find_by_skills(["Postgres", "golang"])] == [
+        "Backend Engineer"
+    ]
+    assert db.find_by_skills(["Go", "Spark"]) == []
+    assert {jd.role for jd in db.find_by_skills(["Go", "Spark"], match_all=False)} == {
+        "Backend Engineer", "Data Engineer"
+    }
+    assert db.find_by_skills([]) == []
+
+def test_requirements_indexed_for_existing_rows(tmp_path, postings):
+    path = tmp_path / "legacy.db"
+    postings[0] = postings[0].model_copy(update={
+        "requirements": JobRequirements(skills=["Spark"], experience=["3+ years"],
+                                        education=["BS"])
+    })
+    with JobDatabase(path) as db:
+        db.save_job_descriptions(postings)
+        with db.transaction() as conn:
+            conn.execute("DROP TABLE job_skills")
+            conn.execute("DROP TABLE job_requirements")
+
+    with JobDatabase(path) as db:
+        assert db.skill_frequency(limit=1) == [("figma", 1)]
+        rows = db.connection.execute(
+            "SELECT kind, text FROM job_requirements ORDER BY kind"
+        ).fetchall()
+        assert [tuple(row) for row in rows] == [("education", "BS"),
+                                                ("experience", "3+ years")]
+
+@pytest.fixture
+def async_db(db):
+    return AsyncJobDatabase(db)
+
+@pytest.mark.asyncio
+async def test_async_save_and_get(async_db, postings):
+    await async_db.save_job_description(postings[0])
+
+    result = await async_db.get_job_description(postings[0].url)
+    assert result.role == postings[0].role
+    assert async_db.db.get_job_description(postings[0].url) is not None
+    assert [jd.role for jd in await async_db.search("spark")] == ["Data Engineer"]
+    assert await async_db.run(async_db.db.skill_frequency, None, None, 1) == [
+        ("spark", 1)
+    ]
+    await async_db.aclose()
+
+@pytest.mark.asyncio
+async def test_async_saves_are_batched(async_db, postings):
+    commits = []
+    save = async_db.db.save_job_descriptions
+    release = threading.Event()
+
+    def slow_save(job_descriptions):
+        job_descriptions = list(job_descriptions)
+        commits.append(len(job_descriptions))
+        release.wait(1)
+        save(job_descriptions)
+
+    async_db.db.save_job_descriptions = slow_save
+    first = asyncio.ensure_future(async_db.save_job_description(postings[0]))
+    await asyncio.sleep(0.05)
+    # The writer is busy with the first commit, so these queue up behind it
+    rest = [
+        asyncio.ensure_future(async_db.save_job_description(posting))
+        for posting in postings[1:]
+    ]
+    await asyncio.sleep(0.05)
+
+    # Queued saves are visible before they are committed
+    pending = await async_db.get_job_descriptions([p.url for p in postings])
+    assert set(pending) == {p.url for p in postings}
+    assert async_db.db.get_job_description(postings[2].url) is None
+
+    release.set()
+    await asyncio.gather(first, *rest)
+    assert commits == [1, 2]
+    assert len(async_db.db.get_job_descriptions([p.url for p in postings])) == 3
+    await async_db.aclose()
+
+@pytest.mark.asyncio
+async def test_async_save_failure_is_isolated(async_db, postings):
+    async_db.db.connection.execute(
+        "CREATE TRIGGER reject_designers BEFORE INSERT ON descriptions "
+        "WHEN NEW.role = 'Product Designer' BEGIN SELECT RAISE(ABORT, 'no'); END"
+    )
+
+    results = await asyncio.gather(
+        *(async_db.save_job_description(posting) for posting in postings),
+        return_exceptions=True
+    )
+
+    assert results[:2] == [None, None]
+    assert isinstance(results[2], sqlite3.IntegrityError)
+    assert await async_db.get_job_description(postings[2].url) is None
+    assert await async_db.get_job_description(postings[0].url) is not None
+    await async_db.aclose()
+
+@pytest.mark.asyncio
+async def test_async_aclose_commits_queued_saves(tmp_path, postings):
+    path = tmp_path / "jobs.db"
+    async_db = AsyncJobDatabase(path)
+    saves = [
+        asyncio.ensure_future(async_db.save_job_description(posting))
+        for posting in postings
+    ]
+    await asyncio.sleep(0)
+    await async_db.aclose()
+    await asyncio.gather(*saves)
+
+    with JobDatabase(path) as db:
+        assert len(db.get_job_descriptions([p.url for p in postings])) == 3
+
+@pytest.mark.asyncio
+async def test_async_saves_are_refused_once_closing(async_db, postings):
+    await async_db.save_job_description(postings[0])
+    closing = asyncio.ensure_future(async_db.aclose())
+    await asyncio.sleep(0)
+
+    with pytest.raises(RuntimeError, match="closed"):
+        await async_db.save_job_description(postings[1])
+    await closing
+    await async_db.aclose()
+
+    assert async_db.db.get_job_description(postings[0].url) is not None
+    assert async_db.db.get_job_description(postings[1].url) is None
+
+def test_reopens_after_close():
+    db = JobDatabase(":memory:")
+    db.close()
+
+    assert db.get_job_description("https://example.com/job") is None
+
+@pytest.mark.asyncio
+async def test_async_aclose_keeps_a_shared_database_open(db, postings):
+    async_db = AsyncJobDatabase(db)
+    await async_db.save_job_description(postings[0])
+    await async_db.aclose()
+    # Only the test thread's connection is left
+    assert list(db._connections) == [threading.current_thread()]
+
+    reopened = AsyncJobDatabase(db)
+    assert await reopened.get_job_description(postings[0].url) is not None
+    await reopened.aclose()
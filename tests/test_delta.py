@@ -0,0 +1,79 @@
+import pytest
+from yaart.delta import apply_patch, bullet_index, resume_outline
+from yaart.models import BulletPatch, ResumePatch, RolePatch, Skill, TailoredResume
+
+@pytest.fixture
+def base_resume():
+    return TailoredResume.model_validate({
+        "name": "John Doe", "title": "Engineer", "location": "Remote",
+        "phone": "1234567890", "email": "john@example.com",
+        "github": "johndoe", "linkedin": "johndoe", "summary": "Base summary",
+        "education": [{"degree": "BS CS", "institution": "Test University",
+                       "dates": "08/2015 - 05/2019"}],
+        "skills": [{"category": "Languages", "skills": ["Python", "Go"]}],
+        "experience": [
+            {"title": "Senior Engineer", "company": "Tech Corp", "location": "Remote",
+             "dates": "06/2021 - Present",
+             "bullets": ["Built APIs", "Ran on-call", "Mentored engineers"]},
+            {"title": "Engineer", "company": "Old Corp", "location": "Remote",
+             "dates": "06/2019 - 06/2021", "bullets": ["Wrote scripts"]},
+        ],
+        "open_source": [{"name": "yaart", "description": "Resume tailoring"}],
+    })
+
+def patch(*roles, **fields):
+    return ResumePatch(
+        title=fields.get("title", "Backend Engineer"),
+        summary=fields.get("summary", "Tailored summary"),
+        roles=list(roles),
+        skills=fields.get("skills", [Skill(category="Backend", skills=["Python"])]),
+    )
+
+def test_resume_outline_ids(base_resume):
+    outline = resume_outline(base_resume)
+
+    assert "[e0] Senior Engineer | Tech Corp | 06/2021 - Present" in outline
+    assert "  [e0.b2] Mentored engineers" in outline
+    assert "  [e1.b0] Wrote scripts" in outline
+    assert "- Languages: Python, Go" in outline
+    assert "john@example.com" not in outline
+
+def test_bullet_index():
+    assert bullet_index(0, " e0.b2 ") == 2
+    assert bullet_index(1, "e0.b2") is None
+    assert bullet_index(0, "b2") is None
+
+def test_apply_patch_reorders_rewords_and_drops(base_resume):
+    tailored = apply_patch(base_resume, patch(RolePatch(id="e0", bullets=[
+        BulletPatch(id="e0.b2"),
+        BulletPatch(id="e0.b0", text="Built Python REST APIs"),
+    ])))
+
+    assert tailored.experience[0].bullets == ["Mentored engineers",
+                                              "Built Python REST APIs"]
+    assert tailored.experience[1].bullets == ["Wrote scripts"]
+    assert (tailored.title, tailored.summary) == (
+        "Backend Engineer", "Tailored summary"
+    )
+    assert tailored.skills == [Skill(category="Backend", skills=["Python"])]
+    # Static fields are spliced from the base
+    assert tailored.email == base_resume.email
+    assert tailored.education == base_resume.education
+    assert tailored.open_source == base_resume.open_source
+    assert base_resume.experience[0].bullets[0] == "Built APIs"
+
+def test_apply_patch_ignores_unknown_ids(base_resume):
+    tailored = apply_patch(base_resume, patch(
+        RolePatch(id="e0", bullets=[
+            BulletPatch(id="e1.b0"), BulletPatch(id="e0.b9"),
+            BulletPatch(id="e0.b1"), BulletPatch(id="e0.b1", text="Duplicate"),
+        ]),
+        RolePatch(id="e1", bullets=[BulletPatch(id="bogus")]),
+        RolePatch(id="e7", bullets=[BulletPatch(id="e7.b0", text="Invented")]),
+        skills=[],
+    ))
+
+    assert tailored.experience[0].bullets == ["Ran on-call"]
+    assert tailored.experience[1].bullets == ["Wrote scripts"]
+    assert len(tailored.experience) == 2
+    assert tailored.skills == base_resume.skills
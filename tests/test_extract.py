@@ -0,0 +1,146 @@
+import pytest
+from yaart.extract import (
+    FastTextExtractor,
+    SoupTextExtractor,
+    extract_sections,
+    classify_heading,
+)
+
+JOB_BODY = " ".join(["Build and operate data pipelines in Python and Spark."] * 6)
+
+@pytest.fixture
+def job_page():
+    return f"""
+        <html>
+            <head>
+                <title>Data Engineer - TestCo</title>
+                <script>var tracking = 'should be removed';</script>
+                <style>body {{ color: red; }}</style>
+            </head>
+            <body>
+                <nav><a href="/">Home</a><a href="/jobs">All jobs</a></nav>
+                <div id="cookie-banner">We use cookies &amp; trackers</div>
+                <header><h1>Data Engineer</h1></header>
+                <div class="sidebar-links">Related links</div>
+                <main>
+                    <div class="job-description">
+                        <p>{JOB_BODY}</p>
+                        <ul><li>Python</li><li>Spark &amp; SQL</li></ul>
+                    </div>
+                </main>
+                <footer>Copyright TestCo</footer>
+            </body>
+        </html>
+    """
+
+def test_fast_extractor_keeps_main_content_and_title(job_page):
+    result = FastTextExtractor().extract(job_page)
+    
+    assert result.main_content
+    assert "Data Engineer - TestCo" in result.text
+    assert "Data Engineer" in result.text.splitlines()
+    assert "Build and operate data pipelines" in result.text
+    assert "- Spark & SQL" in result.text.splitlines()
+
+def test_fast_extractor_drops_boilerplate(job_page):
+    text = FastTextExtractor().extract(job_page).text
+    
+    for boilerplate in ["should be removed", "color: red", "All jobs", 
+                        "cookies", "Related links", "Copyright"]:
+        assert boilerplate not in text
+
+def test_fast_extractor_falls_back_to_whole_page():
+    html = "<html><body><main></main><div>Software Engineer Position</div>" \
+        "<script>var y = 1;</script></body></html>"
+    
+    result = FastTextExtractor().extract(html)
+    
+    assert not result.main_content
+    assert result.text == "Software Engineer Position"
+
+def test_fast_extractor_reports_size(job_page):
+    result = FastTextExtractor().extract(job_page)
+    legacy = SoupTextExtractor().extract(job_page)
+    
+    assert result.input_chars == len(job_page)
+    assert result.output_chars == len(result.text)
+    assert result.output_chars < legacy.output_chars
+    assert 0 < result.reduction < 1
+
+def test_fast_extractor_output_cap(job_page):
+    result = FastTextExtractor(max_chars=100).extract(job_page)
+    
+    assert result.truncated
+    assert result.output_chars <= 100
+
+def test_fast_extractor_input_cap():
+    html = "<p>Keep this</p>" + "<p>filler text</p>" * 10_000
+    
+    result = FastTextExtractor(max_input_chars=1000).extract(html)
+    
+    assert result.truncated
+    assert result.text.startswith("Keep this")
+    assert result.text.count("filler text") < 100
+
+def test_fast_extractor_tolerates_unclosed_tags():
+    html = "<div><p>First<p>Second<li>Third</div><nav>Menu</nav><p>Fourth"
+    
+    lines = FastTextExtractor().extract(html).text.splitlines()
+    
+    assert lines == ["First", "Second", "- Third", "Fourth"]
+
+@pytest.mark.parametrize("wrapper", [
+    '<body class="has-navbar">{}</body>',
+    '<div class="page-with-sidebar">{}</div>',
+    '<div id="social-impact-role">{}</div>',
+    '<form id="aspnetForm">{}</form>',
+    '<nav class="menu">{}</nav>',
+])
+def test_fast_extractor_keeps_content_in_wrappers(wrapper):
+    page = "<h1>Data Engineer</h1><main><p>{}</p></main>".format(JOB_BODY)
+
+    result = FastTextExtractor().extract(wrapper.format(page))
+
+    assert result.main_content
+    assert "Build and operate data pipelines" in result.text
+
+def test_fast_extractor_skips_marked_landmarks_only():
+    html = (
+        '<header class="site-header">Sign in</header>'
+        '<div class="share">Job details here</div>'
+        '<div role="navigation">Jump to</div>'
+        '<aside class="related">Similar jobs</aside>'
+    )
+
+    assert FastTextExtractor().extract(html).text == "Job details here"
+
+def test_soup_extractor_matches_legacy_output():
+    html = "<html><body><div>Software  Engineer</div><script>x</script></body></html>"
+    
+    result = SoupTextExtractor().extract(html)
+    
+    assert result.text == "Software Engineer"
+    assert not result.truncated
+
+def test_extract_sections_groups_lists_by_heading():
+    html = """
+        <p>About us</p>
+        <ul><li>Founded 2010</li></ul>
+        <h3>What you'll do</h3>
+        <ul><li>Build <b>pipelines</b></li><li>Ship features</li></ul>
+        <p><strong>Requirements:</strong></p>
+        <ul><li>5+ years of Python</li></ul>
+        <h2>Benefits</h2>
+        <ul><li>Health insurance</li></ul>
+    """
+    
+    assert extract_sections(html) == {
+        "responsibilities": ["Build pipelines", "Ship features"],
+        "experience": ["5+ years of Python"],
+        "benefits": ["Health insurance"],
+    }
+
+def test_classify_heading():
+    assert classify_heading("Tech Stack") == "skills"
+    assert classify_heading("What we offer") == "benefits"
+    assert classify_heading("About the company") is None
@@ -0,0 +1,115 @@
+import asyncio
+import random
+import time
+import pytest
+from yaart.fake_llm import (
+    FakeChatModel,
+    FakeLLMError,
+    FakeRateLimitError,
+    constant,
+    lognormal,
+    prompt_schema,
+    schema_payload,
+    uniform,
+)
+from yaart.llm import ResumeAssistant
+from yaart.models import JobDescription, JobRequirements, TailoredResume
+
+@pytest.fixture
+def job_description():
+    return JobDescription(
+        url="https://example.com/job",
+        role="Backend Engineer",
+        company="TestCo",
+        location="Remote",
+        responsibilities=["Build APIs"],
+        requirements=JobRequirements(skills=["Python"], experience=[], education=[]),
+        benefits=[],
+        other_information={},
+    )
+
+def test_schema_payload_validates(job_description):
+    payload = schema_payload(TailoredResume.model_json_schema(), random.Random(0))
+
+    resume = TailoredResume.model_validate(payload)
+    assert resume.experience and resume.skills
+
+def test_prompt_schema_reads_format_instructions():
+    text = 'Answer as JSON.\n```\n{"properties": {"a": {"type": "string"}}}\n```'
+
+    assert prompt_schema(text) == {"properties": {"a": {"type": "string"}}}
+    assert prompt_schema("No schema here") is None
+
+def test_fake_model_drives_the_pipeline(job_description):
+    assistant = ResumeAssistant(llm=FakeChatModel(seed=3))
+
+    parsed = assistant.parse_jd("Job text", "https://example.com/job")
+    markdown = assistant.tailor_resume("resume", job_description)
+
+    assert isinstance(parsed, JobDescription)
+    assert markdown.startswith("<h1")
+    assert assistant.token_usage.records[-1].output_tokens > 0
+
+def test_fake_model_structured_output(job_description):
+    assistant = ResumeAssistant(llm=FakeChatModel(), structured_output=True)
+
+    assert assistant.tailor_resume("resume", job_description).startswith("<h1")
+
+def test_fake_model_is_deterministic(job_description):
+    first = ResumeAssistant(llm=FakeChatModel(seed=1)).tailor_resume(
+        "resume", job_description
+    )
+    second = ResumeAssistant(llm=FakeChatModel(seed=1)).tailor_resume(
+        "resume", job_description
+    )
+    other = ResumeAssistant(llm=FakeChatModel(seed=2)).tailor_resume(
+        "resume", job_description
+    )
+
+    assert first == second
+    assert first != other
+
+def test_fake_model_latency_and_throughput():
+    model = FakeChatModel(latency=constant(0.05), tokens_per_second=1e6)
+
+    start = time.perf_counter()
+    asyncio.run(model.ainvoke("hello"))
+    assert time.perf_counter() - start >= 0.05
+
+    slow = FakeChatModel(tokens_per_second=10)
+    start = time.perf_counter()
+    slow.invoke("hello")  # "{}" is one token
+    assert time.perf_counter() - start >= 0.1
+
+def test_latency_distributions():
+    rng = random.Random(0)
+
+    assert constant(0.2)(rng) == 0.2
+    assert all(0.1 <= uniform(0.1, 0.3)(rng) <= 0.3 for _ in range(20))
+    assert all(lognormal(0.5)(rng) > 0 for _ in range(20))
+
+def test_fake_model_error_injection():
+    with pytest.raises(FakeRateLimitError):
+        FakeChatModel(rate_limit_rate=1.0).invoke("hello")
+    with pytest.raises(FakeLLMError):
+        FakeChatModel(error_rate=1.0).invoke("hello")
+
+    # Retries of the same prompt draw again, so some attempts succeed
+    model = FakeChatModel(error_rate=0.5)
+    outcomes = []
+    for _ in range(20):
+        try:
+            model.invoke("hello")
+            outcomes.append(True)
+        except FakeLLMError:
+            outcomes.append(False)
+    assert True in outcomes and False in outcomes
+
+def test_fake_model_streams():
+    model = FakeChatModel()
+    prompt = 'Reply with\n```\n{"properties": {"summary": {"type": "string"}}}\n```'
+
+    chunks = list(model.stream(prompt))
+
+    assert len(chunks) > 1
+    assert "".join(chunk.content for chunk in chunks) == model.invoke(prompt).content
@@ -0,0 +1,56 @@
+import httpx
+from yaart.http_cache import HTTPCache, CachedResponse, cache_key
+
+def test_cache_key_normalizes_host_and_fragment():
+    assert cache_key("HTTPS://Example.com/job#apply") == cache_key(
+        "https://example.com/job"
+    )
+    assert cache_key("https://example.com/job?id=1") != cache_key(
+        "https://example.com/job?id=2"
+    )
+
+def test_conditional_headers():
+    entry = CachedResponse(
+        url="https://example.com/job",
+        body="<html></html>",
+        etag='"abc"',
+        last_modified="Wed, 21 Oct 2015 07:28:00 GMT"
+    )
+    assert entry.conditional_headers() == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT",
+    }
+    assert CachedResponse(url="u", body="").conditional_headers() == {}
+
+def test_store_and_get_response(tmp_path):
+    cache = HTTPCache(tmp_path / "http")
+    response = httpx.Response(
+        200, text="<html>Job</html>", headers={"ETag": '"v1"'}
+    )
+    
+    cache.store_response("https://example.com/job", response)
+    entry = cache.get("https://example.com/job")
+    
+    assert entry is not None
+    assert entry.body == "<html>Job</html>"
+    assert entry.etag == '"v1"'
+    assert entry.last_modified is None
+
+def test_get_missing_and_corrupt_entries(tmp_path):
+    cache = HTTPCache(tmp_path)
+    assert cache.get("https://example.com/missing") is None
+    
+    (tmp_path / f"{cache_key('https://example.com/bad')}.json").write_text("{")
+    assert cache.get("https://example.com/bad") is None
+
+def test_delete(tmp_path):
+    cache = HTTPCache(tmp_path)
+    cache.set(CachedResponse(url="https://example.com/job", body="x"))
+    cache.delete("https://example.com/job")
+    assert cache.get("https://example.com/job") is None
+
+def test_custom_canonicalizer(tmp_path):
+    cache = HTTPCache(tmp_path, canonicalize=lambda url: url.split("?")[0])
+    cache.set(CachedResponse(url="https://example.com/job?ref=a", body="x"))
+    
+    assert cache.get("https://example.com/job?ref=b").body == "x"
@@ -0,0 +1,113 @@
+import asyncio
+import logging
+import time
+import pytest
+from unittest.mock import MagicMock
+from yaart.instrumentation import (
+    Event,
+    Instrumentation,
+    LoggingSink,
+    MemorySink,
+    OpenTelemetrySink,
+)
+
+@pytest.fixture
+def sink():
+    return MemorySink()
+
+def test_span_records_duration_and_attributes(sink):
+    instrumentation = Instrumentation([sink])
+
+    with instrumentation.span("parse_jd", url="https://example.com") as span:
+        time.sleep(0.01)
+        span["compressed"] = False
+
+    event = sink.events[0]
+    assert event.name == "parse_jd"
+    assert event.duration >= 0.01
+    assert event.attributes == {"url": "https://example.com", "compressed": False}
+    assert event.error is None
+
+def test_span_records_errors(sink):
+    instrumentation = Instrumentation([sink])
+
+    with pytest.raises(ValueError):
+        with instrumentation.span("tailor"):
+            raise ValueError("bad output")
+
+    assert sink.named("tailor")[0].error == "ValueError: bad output"
+
+@pytest.mark.asyncio
+async def test_span_marks_cancellation_without_error(sink):
+    instrumentation = Instrumentation([sink])
+
+    async def tailor():
+        with instrumentation.span("tailor"):
+            await asyncio.sleep(10)
+
+    task = asyncio.ensure_future(tailor())
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    def stream():
+        with instrumentation.span("stream"):
+            yield "chunk"
+            yield "chunk"
+
+    chunks = stream()
+    next(chunks)
+    chunks.close()
+
+    for name in ("tailor", "stream"):
+        event = sink.named(name)[0]
+        assert event.error is None
+        assert event.attributes == {"status": "cancelled"}
+
+def test_point_events(sink):
+    instrumentation = Instrumentation()
+    instrumentation.emit("cache", hit=True)
+    instrumentation.add_sink(sink)
+    instrumentation.emit("cache", cache="llm", hit=False)
+
+    assert len(sink.events) == 1
+    assert not sink.events[0].is_span
+    assert sink.events[0].attributes == {"cache": "llm", "hit": False}
+
+def test_broken_sink_does_not_fail_pipeline(sink):
+    broken = MagicMock()
+    broken.emit.side_effect = RuntimeError("sink down")
+    instrumentation = Instrumentation([broken, sink])
+
+    with instrumentation.span("extract"):
+        pass
+
+    assert len(sink.events) == 1
+
+def test_logging_sink(caplog):
+    instrumentation = Instrumentation([LoggingSink()])
+
+    with caplog.at_level(logging.INFO, logger="yaart"):
+        with instrumentation.span("render_pdf", company="TestCo"):
+            pass
+
+    record = caplog.records[0]
+    assert "render_pdf took" in record.getMessage()
+    assert "company=TestCo" in record.getMessage()
+    assert record.event.name == "render_pdf"
+
+def test_opentelemetry_sink_uses_event_times():
+    tracer = MagicMock()
+    sink = OpenTelemetrySink(tracer=tracer)
+
+    sink.emit(Event("scrape", {"url": "https://example.com", "note": None},
+                    timestamp=10.0, duration=0.5, error="ValueError: x"))
+
+    name, kwargs = tracer.start_span.call_args[0][0], tracer.start_span.call_args[1]
+    assert name == "yaart.scrape"
+    assert kwargs["start_time"] == 10_000_000_000
+    assert kwargs["attributes"] == {"url": "https://example.com"}
+    span = tracer.start_span.return_value
+    span.set_attribute.assert_called_once_with("error", "ValueError: x")
+    span.end.assert_called_once_with(end_time=10_500_000_000)
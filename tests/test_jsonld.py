@@ -0,0 +1,158 @@
+import json
+import pytest
+from yaart.jsonld import (
+    find_job_posting,
+    map_job_posting,
+    missing_fields,
+    to_job_description,
+    describe_for_llm,
+    merge_job_description,
+)
+from yaart.models import JobDescription, JobRequirements
+
+@pytest.fixture
+def posting():
+    return {
+        "@context": "https://schema.org/",
+        "@type": "JobPosting",
+        "title": "Data Engineer",
+        "description": "&lt;p&gt;Build pipelines.&lt;/p&gt;&lt;ul&gt;"
+                       "&lt;li&gt;Own Spark jobs&lt;/li&gt;&lt;/ul&gt;",
+        "hiringOrganization": {"@type": "Organization", "name": "TestCo"},
+        "jobLocation": [{
+            "@type": "Place",
+            "address": {
+                "@type": "PostalAddress",
+                "addressLocality": "Austin",
+                "addressRegion": "TX",
+                "addressCountry": "US"
+            }
+        }],
+        "jobLocationType": "TELECOMMUTE",
+        "baseSalary": {
+            "@type": "MonetaryAmount",
+            "currency": "USD",
+            "value": {
+                "@type": "QuantitativeValue",
+                "minValue": 120000,
+                "maxValue": 150000,
+                "unitText": "YEAR"
+            }
+        },
+        "qualifications": "<ul><li>5+ years with Python</li></ul>",
+        "educationRequirements": {
+            "@type": "EducationalOccupationalCredential",
+            "credentialCategory": "bachelor degree"
+        },
+        "jobBenefits": "Health insurance\n401k",
+        "employmentType": "FULL_TIME",
+        "datePosted": "2024-01-15"
+    }
+
+def page_with(data):
+    return f"""<html><head>
+        <script type="application/ld+json">{json.dumps(data)}</script>
+        </head><body><p>Page body</p></body></html>"""
+
+def test_find_job_posting_in_graph(posting):
+    data = {"@context": "https://schema.org", 
+            "@graph": [{"@type": "WebPage"}, posting]}
+    
+    assert find_job_posting(page_with(data)) == posting
+
+def test_find_job_posting_skips_invalid_json(posting):
+    html = '<script type="application/ld+json">{not json</script>' \
+        + page_with([posting])
+    
+    assert find_job_posting(html)["title"] == "Data Engineer"
+    assert find_job_posting("<html><p>No data</p></html>") is None
+
+def test_map_job_posting(posting):
+    fields = map_job_posting(posting, "https://example.com/job")
+    
+    assert fields["role"] == "Data Engineer"
+    assert fields["company"] == "TestCo"
+    assert fields["location"] == "Remote; Austin, TX, US"
+    assert fields["salary"] == "USD 120,000-150,000 per year"
+    assert fields["requirements"]["experience"] == ["5+ years with Python"]
+    assert fields["requirements"]["education"] == ["bachelor degree"]
+    assert fields["benefits"] == ["Health insurance", "401k"]
+    assert fields["other_information"] == {
+        "employment_type": "FULL_TIME", "date_posted": "2024-01-15"
+    }
+    assert "Build pipelines." in fields["description"]
+    assert "- Own Spark jobs" in fields["description"]
+
+def test_map_job_posting_list_values(posting):
+    posting["jobLocationType"] = ["TELECOMMUTE"]
+    posting["employmentType"] = ["FULL_TIME", "CONTRACTOR"]
+    posting["baseSalary"]["value"]["unitText"] = 1
+    fields = map_job_posting(posting, "https://example.com/job")
+    
+    assert fields["location"] == "Remote; Austin, TX, US"
+    assert fields["salary"] == "USD 120,000-150,000 per 1"
+    assert fields["other_information"]["employment_type"] == \
+        "FULL_TIME, CONTRACTOR"
+
+def test_missing_fields(posting):
+    fields = map_job_posting(posting, "https://example.com/job")
+    assert missing_fields(fields) == ["responsibilities"]
+    
+    del posting["qualifications"]
+    del posting["educationRequirements"]
+    fields = map_job_posting(posting, "https://example.com/job")
+    assert missing_fields(fields) == ["responsibilities", "requirements"]
+    
+    posting["responsibilities"] = "Own Spark jobs"
+    posting["skills"] = ["Python", "Spark"]
+    complete = map_job_posting(posting, "https://example.com/job")
+    assert missing_fields(complete) == []
+    
+    job_description = to_job_description(complete)
+    assert job_description.requirements.skills == ["Python", "Spark"]
+    assert job_description.responsibilities == ["Own Spark jobs"]
+
+def test_describe_for_llm(posting):
+    text = describe_for_llm(map_job_posting(posting, "https://example.com/job"))
+    
+    assert text.startswith("Title: Data Engineer\nCompany: TestCo")
+    assert "Build pipelines." in text
+
+def test_merge_prefers_structured_fields(posting):
+    fields = map_job_posting(posting, "https://example.com/job")
+    parsed = JobDescription(
+        url="https://example.com/job",
+        role="Engineer",
+        company="Other",
+        location="Somewhere",
+        responsibilities=["Own Spark jobs"],
+        requirements=JobRequirements(
+            skills=["Python"], experience=["LLM guess"], education=[]
+        ),
+        salary=None,
+        benefits=[],
+        other_information={"team": "Data", "employment_type": "guess"}
+    )
+    
+    merged = merge_job_description(fields, parsed)
+    
+    assert merged.role == "Data Engineer"
+    assert merged.company == "TestCo"
+    assert merged.responsibilities == ["Own Spark jobs"]
+    assert merged.requirements.skills == ["Python"]
+    assert merged.requirements.experience == ["5+ years with Python"]
+    assert merged.salary == "USD 120,000-150,000 per year"
+    assert merged.other_information["team"] == "Data"
+    assert merged.other_information["employment_type"] == "FULL_TIME"
+
+def test_map_job_posting_fills_from_description_sections(posting):
+    posting["description"] = (
+        "<p>About us</p><h3>What you'll do</h3><ul><li>Own Spark jobs</li></ul>"
+        "<h3>Nice to have</h3><ul><li>Airflow</li></ul>"
+    )
+    
+    fields = map_job_posting(posting, "https://example.com/job")
+    
+    assert fields["responsibilities"] == ["Own Spark jobs"]
+    assert fields["requirements"]["experience"] == ["5+ years with Python"]
+    assert missing_fields(fields) == []
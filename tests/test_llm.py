@@ -1,9 +1,21 @@
 import pytest
 from unittest.mock import Mock, patch, MagicMock
-from yaart.llm import ResumeAssistant
-from yaart.models import JobDescription, JobRequirements
+from yaart.llm import ResumeAssistant, compile_prompt, output_text
+from yaart.instrumentation import Instrumentation, MemorySink
+from yaart.models import JobDescription, JobRequirements, TailoredResume
 from langchain.output_parsers import PydanticOutputParser
+from langchain_anthropic import ChatAnthropic
+from langchain_core.language_models.fake_chat_models import (
+    FakeListChatModel, GenericFakeChatModel
+)
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
 import json
+import asyncio
+import threading
+import time
+import re
+from typing import Callable
 
 @pytest.fixture
 def mock_llm():
@@ -136,7 +148,9 @@ def test_parse_jd_invalid_response(mock_llm):
 
 @patch('yaart.llm.PydanticOutputParser')
 @patch('yaart.llm.PromptTemplate')
-def test_tailor_resume_success(mock_prompt, 
+@patch('yaart.llm.ChatPromptTemplate')
+def test_tailor_resume_success(mock_chat_prompt,
+                               mock_prompt, 
                                mock_parser, 
                                mock_llm, 
                                sample_job_description, 
@@ -148,6 +162,7 @@ def test_tailor_resume_success(mock_prompt,
     mock_prompt_instance = MagicMock()
     mock_prompt_instance.__or__ = lambda self, other: other
     mock_prompt.return_value = mock_prompt_instance
+    mock_chat_prompt.from_messages.return_value = mock_prompt_instance
     
     mock_parser_instance = MagicMock()
     mock_parser_instance.get_format_instructions.return_value = "format instructions"
@@ -179,3 +194,657 @@ def test_tailor_resume_failure(mock_llm, sample_job_description):
         )
     
     assert "Failed to tailor resume" in str(exc_info.value)
+
+def test_chains_are_compiled_once(mock_llm):
+    assistant = ResumeAssistant(llm=mock_llm)
+    
+    assert assistant.parse_jd_chain is assistant.parse_jd_chain
+    assert assistant.tailor_resume_chain is assistant.tailor_resume_chain
+
+def test_prompts_are_shared_between_assistants():
+    first = ResumeAssistant(llm=FakeListChatModel(responses=["{}"]))
+    second = ResumeAssistant(llm=FakeListChatModel(responses=["{}"]))
+    
+    assert first.parse_jd_chain is not second.parse_jd_chain
+    assert first.parse_jd_chain.first is second.parse_jd_chain.first
+    assert first.tailor_resume_chain.first is second.tailor_resume_chain.first
+
+def test_compile_prompt_caches_format_instructions():
+    parser = MagicMock()
+    parser.get_format_instructions.return_value = "format instructions"
+    
+    first = compile_prompt("{text} {format_instructions}", ["text"], parser)
+    second = compile_prompt("{text} {format_instructions}", ["text"], parser)
+    
+    assert first is second
+    assert parser.get_format_instructions.call_count == 1
+    assert first.format(text="hi") == "hi format instructions"
+
+def test_replacing_components_rebuilds_chain(mock_llm):
+    assistant = ResumeAssistant(llm=mock_llm)
+    chain = assistant.parse_jd_chain
+    
+    assistant.jd_parser = PydanticOutputParser(pydantic_object=JobDescription)
+    assert assistant.parse_jd_chain is not chain
+    
+    chain = assistant.tailor_resume_chain
+    assistant.llm = MagicMock()
+    assert assistant.tailor_resume_chain is not chain
+
+def test_output_text():
+    assert output_text(AIMessage(content="hello")) == "hello"
+    assert output_text(AIMessage(content=[{"type": "text", "text": "a"}, "b"])) == "ab"
+    assert output_text({"text": "hello"}) == "hello"
+    assert output_text("hello") == "hello"
+    with pytest.raises(ValueError):
+        output_text(42)
+
+def test_tailor_resume_with_chat_model(sample_job_description, 
+                                       sample_tailored_resume_dict):
+    llm = FakeListChatModel(responses=[json.dumps(sample_tailored_resume_dict)])
+    assistant = ResumeAssistant(llm=llm)
+    
+    result = assistant.tailor_resume("Original resume", sample_job_description)
+    
+    assert "John Doe" in result
+    assert "Developed Python applications" in result
+
+def slow_async_llm(response, delay=0.05, state=None):
+    """LLM stand-in that only supports async calls and takes `delay` seconds;
+    `state` tracks the calls in flight ("active") and the most at once
+    ("max_active")"""
+    state = state if state is not None else {}
+    state.update(active=0, max_active=0)
+    def sync_call(prompt):
+        raise AssertionError("sync path used")
+    
+    async def async_call(prompt):
+        state["active"] += 1
+        state["max_active"] = max(state["max_active"], state["active"])
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            state["active"] -= 1
+        return AIMessage(content=response)
+    
+    return RunnableLambda(sync_call, afunc=async_call)
+
+@pytest.mark.asyncio
+async def test_aparse_jd(sample_job_description):
+    llm = slow_async_llm(sample_job_description.model_dump_json(), delay=0)
+    assistant = ResumeAssistant(llm=llm)
+    
+    result = await assistant.aparse_jd("Job text", "https://example.com/other")
+    
+    assert result.role == "Software Engineer"
+    assert result.url == "https://example.com/other"
+
+@pytest.mark.asyncio
+async def test_aparse_jd_failure():
+    assistant = ResumeAssistant(llm=slow_async_llm("not json", delay=0))
+    
+    with pytest.raises(ValueError) as exc_info:
+        await assistant.aparse_jd("Job text", "https://example.com/job")
+    assert "Failed to parse job description" in str(exc_info.value)
+
+@pytest.mark.asyncio
+async def test_atailor_resume_calls_overlap(sample_job_description, 
+                                            sample_tailored_resume_dict):
+    state = {}
+    llm = slow_async_llm(json.dumps(sample_tailored_resume_dict), delay=0.01,
+                         state=state)
+    assistant = ResumeAssistant(llm=llm)
+    
+    results = await asyncio.gather(*[
+        assistant.atailor_resume("Original resume", sample_job_description)
+        for _ in range(5)
+    ])
+    
+    assert all("John Doe" in result for result in results)
+    assert state["max_active"] > 1
+
+def jd_llm(sample_job_description, delays=None, state=None):
+    """LLM stand-in answering by the job text embedded in the prompt; `state`
+    tracks async calls like slow_async_llm"""
+    state = state if state is not None else {}
+    state.update(active=0, max_active=0)
+    def respond(prompt):
+        text = prompt.to_string()
+        if "broken posting" in text:
+            return AIMessage(content="not json")
+        role = re.search(r"Role: (\w+)", text).group(1)
+        return AIMessage(content=sample_job_description.model_copy(
+            update={"role": role}).model_dump_json())
+    
+    async def arespond(prompt):
+        role = re.search(r"Role: (\w+)", prompt.to_string())
+        state["active"] += 1
+        state["max_active"] = max(state["max_active"], state["active"])
+        try:
+            await asyncio.sleep((delays or {}).get(role.group(1) if role else "", 0))
+        finally:
+            state["active"] -= 1
+        return respond(prompt)
+    
+    return RunnableLambda(respond, afunc=arespond)
+
+def test_parse_jds_returns_results_in_order(sample_job_description):
+    assistant = ResumeAssistant(llm=jd_llm(sample_job_description))
+    items = [
+        ("Role: Alpha", "https://example.com/a"),
+        ("broken posting", "https://example.com/broken"),
+        ("Role: Gamma", "https://example.com/c"),
+    ]
+    
+    results = assistant.parse_jds(items, max_concurrency=2)
+    
+    assert [r.role for r in (results[0], results[2])] == ["Alpha", "Gamma"]
+    assert results[2].url == "https://example.com/c"
+    assert isinstance(results[1], ValueError)
+    assert "Failed to parse job description" in str(results[1])
+
+@pytest.mark.asyncio
+async def test_aparse_jds_runs_concurrently_in_order(sample_job_description):
+    # Later items finish first, so results are reordered, not just collected
+    delays = {"Alpha": 0.02, "Beta": 0.01, "Gamma": 0}
+    state = {}
+    assistant = ResumeAssistant(llm=jd_llm(sample_job_description, delays, state))
+    items = [(f"Role: {role}", f"https://example.com/{role}") for role in delays]
+    
+    results = await assistant.aparse_jds(items, max_concurrency=3)
+    
+    assert [r.role for r in results] == ["Alpha", "Beta", "Gamma"]
+    assert state["max_active"] > 1
+
+def test_stream_tailor_resume_matches_tailor_resume(sample_job_description,
+                                                    sample_tailored_resume_dict):
+    response = json.dumps(sample_tailored_resume_dict, indent=2)
+    assistant = ResumeAssistant(llm=FakeListChatModel(responses=[response]))
+    
+    sections = list(assistant.stream_tailor_resume("Original resume",
+                                                   sample_job_description))
+    streamed = "".join(section.markdown for section in sections).strip()
+    
+    assert [section.name for section in sections][:4] == [
+        "header", "summary", "education", "skills"
+    ]
+    assert streamed == assistant.tailor_resume("Original resume",
+                                               sample_job_description)
+
+@pytest.mark.asyncio
+async def test_astream_tailor_resume_yields_before_completion(
+        sample_job_description, sample_tailored_resume_dict):
+    response = json.dumps(sample_tailored_resume_dict)
+    llm = FakeListChatModel(responses=[response], sleep=0.001)
+    assistant = ResumeAssistant(llm=llm)
+    loop = asyncio.get_running_loop()
+    
+    start = loop.time()
+    first_section_at = None
+    sections = []
+    async for section in assistant.astream_tailor_resume("Original resume",
+                                                         sample_job_description):
+        first_section_at = first_section_at or loop.time() - start
+        sections.append(section)
+    total = loop.time() - start
+    
+    assert sections[0].name == "header"
+    assert first_section_at < total / 2
+    assert any(s.name == "experience" and s.index == 0 for s in sections)
+
+@pytest.mark.asyncio
+async def test_astream_tailor_resume_invalid_output(sample_job_description):
+    llm = FakeListChatModel(responses=['{"name": "John Doe"}'])
+    assistant = ResumeAssistant(llm=llm)
+    
+    with pytest.raises(ValueError, match="Failed to tailor resume"):
+        async for _ in assistant.astream_tailor_resume("Original resume",
+                                                       sample_job_description):
+            pass
+
+def test_parse_jd_reports_token_usage(sample_job_description):
+    response = sample_job_description.model_dump_json()
+    assistant = ResumeAssistant(llm=FakeListChatModel(responses=[response]))
+    
+    assistant.parse_jd("Role: Software Engineer", "https://example.com/job")
+    
+    usage = assistant.token_usage.records[-1]
+    assert usage.operation == "parse_jd"
+    assert usage.llm_calls == 1
+    assert usage.output_tokens == assistant.token_counter.count(response)
+    assert usage.input_tokens > assistant.token_counter.count("Role: Software Engineer")
+    assert not usage.compressed
+
+def test_parse_jd_compresses_text_over_budget(sample_job_description):
+    prompts = []
+    def respond(prompt):
+        prompts.append(prompt.to_string())
+        return AIMessage(content=sample_job_description.model_dump_json())
+    
+    assistant = ResumeAssistant(llm=RunnableLambda(respond))
+    overhead = assistant.fit_jd_text("")[1]
+    text = "\n".join(
+        ["Software Engineer at TestCo", "Requirements: 5+ years of Python"]
+        + [f"Our company history, chapter {i}, is a long story" for i in range(200)]
+    )
+    
+    assistant.parse_jd(text, "https://example.com/job", max_input_tokens=overhead + 50)
+    
+    usage = assistant.token_usage.records[-1]
+    assert usage.compressed
+    assert usage.input_tokens <= overhead + 50 < usage.original_input_tokens
+    assert "Requirements: 5+ years of Python" in prompts[0]
+    assert "chapter 199" not in prompts[0]
+
+def test_tailor_resume_reports_token_usage(sample_job_description,
+                                           sample_tailored_resume_dict):
+    llm = FakeListChatModel(responses=[json.dumps(sample_tailored_resume_dict)])
+    assistant = ResumeAssistant(llm=llm)
+    
+    list(assistant.stream_tailor_resume("Original resume", sample_job_description))
+    
+    totals = assistant.token_usage.totals()["tailor_resume"]
+    assert totals["calls"] == 1
+    assert totals["output_tokens"] > 0
+
+def test_assistant_emits_stage_events(sample_job_description,
+                                      sample_tailored_resume_dict, capsys):
+    sink = MemorySink()
+    llm = FakeListChatModel(responses=[
+        sample_job_description.model_dump_json(),
+        json.dumps(sample_tailored_resume_dict),
+    ])
+    assistant = ResumeAssistant(llm=llm, instrumentation=Instrumentation([sink]))
+    
+    job = assistant.parse_jd("Job text", "https://example.com/job")
+    assistant.tailor_resume("Original resume", job)
+    
+    assert [e.name for e in sink.events if e.is_span] == [
+        "parse_jd", "tailor", "render_markdown"
+    ]
+    usage = sink.named("token_usage")
+    assert [e.attributes["operation"] for e in usage] == ["parse_jd", "tailor_resume"]
+    assert usage[0].attributes["output_tokens"] > 0
+    # Debug dumps of the raw and parsed output are gone
+    assert capsys.readouterr().out == ""
+
+def recording_llm(responses):
+    """Fake chat model that also records the prompts it receives"""
+    prompts = []
+    replies = iter(responses)
+    def respond(prompt):
+        prompts.append(prompt.to_string())
+        return AIMessage(content=next(replies))
+    return RunnableLambda(respond), prompts
+
+def test_parse_jd_repairs_only_invalid_fields(sample_job_description):
+    broken = sample_job_description.model_dump()
+    del broken["company"]
+    broken["requirements"]["skills"] = "Python, AWS"
+    llm, prompts = recording_llm([
+        json.dumps(broken),
+        json.dumps({"company": "TestCo",
+                    "requirements.skills": ["Python", "AWS"]}),
+    ])
+    assistant = ResumeAssistant(llm=llm)
+    
+    result = assistant.parse_jd("Job text", "https://example.com/job")
+    
+    assert result == sample_job_description
+    assert "- path: company" in prompts[1]
+    assert "- path: requirements.skills" in prompts[1]
+    assert "- path: role" not in prompts[1]
+    operations = [u.operation for u in assistant.token_usage.records]
+    assert operations == ["parse_jd", "repair"]
+
+@pytest.mark.asyncio
+async def test_atailor_resume_repairs_malformed_field(sample_job_description,
+                                                      sample_tailored_resume_dict):
+    broken = json.loads(json.dumps(sample_tailored_resume_dict))
+    broken["experience"][0]["dates"] = ["06/2019", "Present"]
+    llm, prompts = recording_llm([
+        json.dumps(broken),
+        json.dumps({"experience.0.dates": "06/2019 - Present"}),
+    ])
+    assistant = ResumeAssistant(llm=llm)
+    
+    result = await assistant.atailor_resume("Original resume", sample_job_description)
+    
+    assert "Tech Corp** San Francisco, CA | 06/2019 - Present_" in result
+    assert "Original resume" in prompts[1]
+    assert "- path: experience.0.dates" in prompts[1]
+
+def test_repair_gives_up_after_max_repairs(sample_job_description):
+    broken = sample_job_description.model_dump()
+    del broken["company"]
+    llm, prompts = recording_llm([json.dumps(broken), json.dumps({"company": 42})])
+    assistant = ResumeAssistant(llm=llm, max_repairs=1)
+    
+    with pytest.raises(ValueError, match="Failed to parse job description"):
+        assistant.parse_jd("Job text", "https://example.com/job")
+    assert len(prompts) == 2
+
+def test_unparseable_output_is_not_repaired():
+    llm, prompts = recording_llm(["I cannot help with that"])
+    assistant = ResumeAssistant(llm=llm)
+    
+    with pytest.raises(ValueError, match="Failed to parse job description"):
+        assistant.parse_jd("Job text", "https://example.com/job")
+    assert len(prompts) == 1
+
+def test_parse_jds_repairs_failed_items(sample_job_description):
+    broken = sample_job_description.model_dump()
+    del broken["company"]
+    llm, _ = recording_llm([json.dumps(broken), json.dumps({"company": "TestCo"})])
+    assistant = ResumeAssistant(llm=llm)
+    
+    results = assistant.parse_jds([("Job text", "https://example.com/job")])
+    
+    assert results == [sample_job_description]
+
+class FakeToolCallingModel(FakeListChatModel):
+    """Fake chat model that answers through a tool call when tools are bound"""
+    def bind_tools(self, tools, tool_choice=None, **kwargs):
+        name = tools[0].__name__
+        def respond(prompt):
+            assert "JSON schema" not in prompt.to_string()
+            assert f"`{name}` tool" in prompt.to_string()
+            args = json.loads(self.invoke(prompt).content)
+            return AIMessage(content="", tool_calls=[
+                {"name": name, "args": args, "id": "call_1"}
+            ])
+        return RunnableLambda(respond)
+
+def test_structured_output_uses_tool_calls(sample_job_description,
+                                           sample_tailored_resume_dict):
+    llm = FakeToolCallingModel(responses=[
+        sample_job_description.model_dump_json(),
+        json.dumps(sample_tailored_resume_dict),
+        json.dumps(sample_tailored_resume_dict),
+    ])
+    assistant = ResumeAssistant(llm=llm, structured_output=True)
+    
+    job = assistant.parse_jd("Job text", "https://example.com/job")
+    markdown = assistant.tailor_resume("Original resume", job)
+    sections = list(assistant.stream_tailor_resume("Original resume", job))
+    
+    assert job == sample_job_description
+    assert "Developed Python applications" in markdown
+    assert "".join(s.markdown for s in sections).strip() == markdown
+
+def test_structured_output_falls_back_without_tool_support(sample_job_description):
+    llm = FakeListChatModel(responses=[sample_job_description.model_dump_json()])
+    assistant = ResumeAssistant(llm=llm, structured_output=True)
+    
+    assert assistant.parse_jd("Job text", "https://example.com/job") == \
+        sample_job_description
+
+SECTIONED_RESUME = """# John Doe
+
+## Summary
+Engineer.
+
+## Professional Experience
+
+### Senior Engineer
+**Tech Corp** _Remote | 06/2021 - Present_
+
+- Built services
+
+### Engineer
+**Old Corp** _Remote | 06/2019 - 06/2021_
+
+- Wrote scripts
+
+## Skills
+
+**Languages:** Python, Bash
+"""
+
+class RoutingChatModel(FakeListChatModel):
+    """Fake chat model whose reply is computed from the prompt"""
+    respond: Callable[[str], str]
+
+    def _call(self, messages, stop=None, run_manager=None, **kwargs):
+        return self.respond(messages[-1].content)
+
+def sectioned_llm(sample_tailored_resume_dict, role_outputs):
+    """Fake model answering each per-section prompt, tracking overlap"""
+    profile = {key: value for key, value in sample_tailored_resume_dict.items()
+               if key not in ("skills", "experience")}
+    skills = {"skills": sample_tailored_resume_dict["skills"]}
+    state = {"active": 0, "max_active": 0, "prompts": []}
+    lock = threading.Lock()
+    def respond(text):
+        if "Fields to fix" in text:
+            return json.dumps({"dates": "06/2019 - 06/2021"})
+        with lock:
+            state["active"] += 1
+            state["max_active"] = max(state["max_active"], state["active"])
+            state["prompts"].append(text)
+        time.sleep(0.05)
+        with lock:
+            state["active"] -= 1
+        if "Experience entry:" in text:
+            title = next(t for t in role_outputs if f"### {t}\n" in text)
+            return role_outputs[title]
+        if "skills section" in text:
+            return json.dumps(skills)
+        return json.dumps(profile)
+    return RoutingChatModel(responses=[], respond=respond), state
+
+def role_json(title, company, *bullets):
+    return json.dumps({"title": title, "company": company, "location": "Remote",
+                       "dates": "06/2019 - Present", "bullets": list(bullets)})
+
+@pytest.fixture
+def role_outputs():
+    return {
+        "Senior Engineer": role_json("Senior Engineer", "Tech Corp",
+                                     "Built Python services on AWS"),
+        "Engineer": role_json("Engineer", "Old Corp", "Automated deploys with Bash"),
+    }
+
+def test_tailor_resume_parallel_sections(sample_job_description,
+                                         sample_tailored_resume_dict, role_outputs):
+    llm, state = sectioned_llm(sample_tailored_resume_dict, role_outputs)
+    sink = MemorySink()
+    assistant = ResumeAssistant(llm=llm, parallel_sections=True,
+                                instrumentation=Instrumentation([sink]))
+
+    result = assistant.tailor_resume(SECTIONED_RESUME, sample_job_description)
+
+    assert len(state["prompts"]) == 4
+    assert state["max_active"] > 1
+    # Roles keep base resume order whichever call finishes first
+    assert result.index("**Tech Corp**") < result.index("**Old Corp**")
+    # AWS and Bash appear in bullets but not in the tailored skills
+    assert "**Additional Skills:** AWS, Bash" in result
+    assert sink.named("tailor")[0].attributes["sections"] == 4
+    usage = assistant.token_usage.records[-1]
+    assert (usage.operation, usage.llm_calls) == ("tailor_resume", 4)
+
+@pytest.mark.asyncio
+async def test_atailor_resume_parallel_sections_repairs_one_role(
+        sample_job_description, sample_tailored_resume_dict, role_outputs):
+    role_outputs["Engineer"] = json.dumps({
+        "title": "Engineer", "company": "Old Corp", "location": "Remote",
+        "bullets": ["Automated deploys with Bash"]
+    })
+    llm, state = sectioned_llm(sample_tailored_resume_dict, role_outputs)
+    assistant = ResumeAssistant(llm=llm, parallel_sections=True)
+
+    result = await assistant.atailor_resume(SECTIONED_RESUME, sample_job_description)
+
+    assert state["max_active"] > 1
+    assert "**Old Corp** Remote | 06/2019 - 06/2021_" in result
+    assert [u.operation for u in assistant.token_usage.records] == \
+        ["tailor_resume", "repair"]
+
+def test_parallel_sections_fall_back_without_experience_section(
+        sample_job_description, sample_tailored_resume_dict):
+    llm = FakeListChatModel(responses=[json.dumps(sample_tailored_resume_dict)])
+    assistant = ResumeAssistant(llm=llm, parallel_sections=True)
+
+    result = assistant.tailor_resume("Original resume", sample_job_description)
+
+    assert "Developed Python applications" in result
+
+def test_tailor_resume_delta(sample_job_description, sample_tailored_resume_dict):
+    base = json.loads(json.dumps(sample_tailored_resume_dict))
+    base["experience"][0]["bullets"] = [
+        "Wrote scripts", "Developed Python applications"
+    ]
+    patch = {
+        "title": "Backend Engineer",
+        "summary": "Tailored summary at TestCo",
+        "roles": [{"id": "e0", "bullets": [
+            {"id": "e0.b1", "text": "Developed Python applications on AWS"},
+            {"id": "e0.b0", "text": None},
+        ]}],
+        "skills": [{"category": "Cloud", "skills": ["AWS", "Python"]}],
+    }
+    prompts = []
+    def respond(text):
+        prompts.append(text)
+        return json.dumps(patch if "Resume outline" in text else base)
+    sink = MemorySink()
+    assistant = ResumeAssistant(llm=RoutingChatModel(responses=[], respond=respond),
+                                delta_tailoring=True,
+                                instrumentation=Instrumentation([sink]))
+
+    result = assistant.tailor_resume("Original resume", sample_job_description)
+
+    assert "[e0.b1] Developed Python applications" in prompts[1]
+    assert "john@example.com" not in prompts[1]
+    assert result.index("on AWS") < result.index("- Wrote scripts")
+    assert "Tailored summary at TestCo" in result
+    assert "**Cloud:** AWS, Python" in result
+    assert "john@example.com" in result
+    assert "Test University" in result
+    assert [u.operation for u in assistant.token_usage.records] == \
+        ["parse_resume", "tailor_patch"]
+    assert sink.named("tailor")[0].attributes["delta"] is True
+
+@pytest.mark.asyncio
+async def test_delta_tailoring_parses_markdown_once(tmp_path, sample_job_description,
+                                                   sample_tailored_resume_dict):
+    patch = {"title": "Backend Engineer", "summary": "Tailored", "roles": [],
+             "skills": []}
+    def respond(text):
+        return json.dumps(patch if "Resume outline" in text
+                          else sample_tailored_resume_dict)
+    sink = MemorySink()
+    assistant = ResumeAssistant(llm=RoutingChatModel(responses=[], respond=respond),
+                                delta_tailoring=True, resume_cache=tmp_path,
+                                instrumentation=Instrumentation([sink]))
+
+    assistant.tailor_resume("Original resume", sample_job_description)
+    await assistant.atailor_resume("Original resume", sample_job_description)
+    # A fresh assistant finds the parse in the on-disk cache
+    fresh = ResumeAssistant(llm=RoutingChatModel(responses=[], respond=respond),
+                            delta_tailoring=True, resume_cache=tmp_path)
+    fresh.tailor_resume("Original resume", sample_job_description)
+
+    assert [u.operation for u in assistant.token_usage.records] == \
+        ["parse_resume", "tailor_patch", "tailor_patch"]
+    assert [u.operation for u in fresh.token_usage.records] == ["tailor_patch"]
+    assert [e.attributes["hit"] for e in sink.named("cache")
+            if e.attributes.get("cache") == "resume"] == [False, True]
+
+@pytest.mark.asyncio
+async def test_aparse_resume_error(sample_job_description):
+    llm = FakeListChatModel(responses=["not a resume"])
+    assistant = ResumeAssistant(llm=llm, delta_tailoring=True)
+
+    with pytest.raises(ValueError,
+                       match="Failed to tailor resume: Failed to parse resume"):
+        await assistant.atailor_resume("Original resume", sample_job_description)
+
+def test_tailor_prompt_layers_resume_before_job(sample_job_description):
+    assistant = ResumeAssistant(llm=FakeListChatModel(responses=["{}"]))
+    prompt = assistant.tailor_resume_chain.first
+
+    first = prompt.invoke({"resume": "Original resume",
+                           "job_description": sample_job_description.model_dump_json()})
+    second = prompt.invoke(
+        {"resume": "Original resume", "job_description": "Other job"}
+    )
+
+    system, human = first.to_messages()
+    assert "JSON schema" in system.content[0]["text"]
+    assert human.content[0]["text"] == "Resume:\nOriginal resume\n\n"
+    assert human.content[1]["text"].startswith("Job Description:\n{")
+    # Only the job description differs between jobs
+    assert second.to_messages()[0] == system
+    assert second.to_messages()[1].content[0] == human.content[0]
+    assert not any("cache_control" in block for block in system.content + human.content)
+
+def test_tailor_prompt_marks_anthropic_cache_breakpoints(sample_job_description):
+    llm = ChatAnthropic(model="claude-3-5-sonnet-20241022", api_key="test-key")
+    assistant = ResumeAssistant(llm=llm)
+
+    system, human = assistant.tailor_resume_chain.first.invoke({
+        "resume": "Original resume",
+        "job_description": sample_job_description.model_dump_json()
+    }).to_messages()
+
+    assert system.content[0]["cache_control"] == {"type": "ephemeral"}
+    assert human.content[0]["cache_control"] == {"type": "ephemeral"}
+    assert "cache_control" not in human.content[1]
+
+@pytest.mark.parametrize("structured_output", [False, True])
+def test_tailor_resume_prompt_tokens_match_sent_prompt(structured_output):
+    assistant = ResumeAssistant(llm=FakeToolCallingModel(responses=[]),
+                                structured_output=structured_output)
+    messages = assistant.tailor_resume_chain.first.format_messages(
+        resume="", job_description=""
+    )
+    blocks = [block["text"] for message in messages for block in message.content]
+
+    assert assistant._prompt_tokens("tailor_resume") == sum(
+        assistant.token_counter.count(block) for block in blocks
+    )
+
+def test_tailor_resume_reports_cached_prompt_tokens(sample_job_description,
+                                                    sample_tailored_resume_dict):
+    llm = GenericFakeChatModel(messages=iter([AIMessage(
+        content=json.dumps(sample_tailored_resume_dict),
+        usage_metadata={
+            "input_tokens": 2500, "output_tokens": 300, "total_tokens": 2800,
+            "input_token_details": {"cache_read": 2000},
+        }
+    )]))
+    assistant = ResumeAssistant(llm=llm)
+
+    assistant.tailor_resume("Original resume", sample_job_description)
+
+    usage = assistant.token_usage.records[-1]
+    assert (usage.input_tokens, usage.cached_input_tokens) == (2500, 2000)
+    totals = assistant.token_usage.totals()["tailor_resume"]
+    assert totals["cached_input_tokens"] == 2000
+
+def test_tailor_resume_sends_parsed_resume_in_compact_form(sample_job_description,
+                                                           sample_tailored_resume_dict):
+    base = TailoredResume.model_validate(sample_tailored_resume_dict)
+    llm, prompts = recording_llm([json.dumps(sample_tailored_resume_dict)])
+    assistant = ResumeAssistant(llm=llm)
+
+    assistant.tailor_resume(base, sample_job_description)
+
+    assert "Resume:\nName: John Doe\nTitle: Software Engineer\n" in prompts[0]
+    assert "Software Engineer | Tech Corp | San Francisco, CA" in prompts[0]
+
+def test_delta_tailoring_reuses_parsed_resume(sample_job_description,
+                                              sample_tailored_resume_dict):
+    base = TailoredResume.model_validate(sample_tailored_resume_dict)
+    patch = {"title": "Backend Engineer", "summary": "Tailored", "roles": [],
+             "skills": []}
+    llm, prompts = recording_llm([json.dumps(patch)])
+    assistant = ResumeAssistant(llm=llm, delta_tailoring=True)
+
+    result = assistant.tailor_resume(base, sample_job_description)
+
+    assert len(prompts) == 1
+    assert "Backend Engineer" in result
+    assert [u.operation for u in assistant.token_usage.records] == ["tailor_patch"]
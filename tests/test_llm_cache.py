@@ -0,0 +1,211 @@
+import json
+import threading
+import time
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from yaart.llm import ResumeAssistant
+from yaart.llm_cache import LLMCache, CachedLLM, BYPASS_CACHE, model_fingerprint
+from yaart.instrumentation import Instrumentation, MemorySink
+from yaart.models import JobDescription, JobRequirements
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = LLMCache(tmp_path / "llm_cache.db")
+    yield cache
+    cache.close()
+
+@pytest.fixture
+def sample_job_description():
+    return JobDescription(
+        url="https://example.com/job",
+        role="Software Engineer",
+        company="TestCo",
+        location="Remote",
+        responsibilities=["Code", "Test"],
+        requirements=JobRequirements(
+            skills=["Python", "AWS"],
+            experience=["5+ years"],
+            education=["BS in Computer Science"]
+        ),
+        salary="$100k-$150k",
+        benefits=["Health", "401k"],
+        other_information={"culture": "Great"}
+    )
+
+def test_get_and_set_count_hits_and_misses(cache):
+    key = cache.make_key("prompt", "model")
+    
+    assert cache.get(key) is None
+    cache.set(key, "completion")
+    assert cache.get(key) == "completion"
+    
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1, 
+                             "bytes": len("completion")}
+
+def test_key_depends_on_prompt_and_model(cache):
+    assert cache.make_key("a", "m1") != cache.make_key("b", "m1")
+    assert cache.make_key("a", "m1") != cache.make_key("a", "m2")
+
+def test_model_fingerprint_includes_sampling_params():
+    first = FakeListChatModel(responses=["a"])
+    second = FakeListChatModel(responses=["b"])
+    
+    assert model_fingerprint(first) != model_fingerprint(second)
+    assert "FakeListChatModel" in model_fingerprint(first)
+
+def test_entries_persist_on_disk(tmp_path):
+    path = tmp_path / "llm_cache.db"
+    first = LLMCache(path)
+    first.set("key", "completion")
+    first.close()
+    
+    second = LLMCache(path)
+    assert second.get("key") == "completion"
+    second.close()
+
+def test_ttl_expiry(tmp_path):
+    cache = LLMCache(tmp_path / "llm_cache.db", ttl=0.05)
+    cache.set("key", "completion")
+    assert cache.get("key") == "completion"
+    
+    time.sleep(0.06)
+    assert cache.get("key") is None
+    assert cache.stats()["entries"] == 0
+    cache.close()
+
+def test_lru_eviction_by_entries(tmp_path):
+    cache = LLMCache(tmp_path / "llm_cache.db", max_entries=2)
+    cache.set("a", "1")
+    time.sleep(0.01)
+    cache.set("b", "2")
+    time.sleep(0.01)
+    cache.get("a")  # "b" is now least recently used
+    time.sleep(0.01)
+    cache.set("c", "3")
+    
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+    cache.close()
+
+def test_lru_eviction_by_bytes(tmp_path):
+    cache = LLMCache(tmp_path / "llm_cache.db", max_entries=None, max_bytes=10)
+    cache.set("a", "x" * 6)
+    time.sleep(0.01)
+    cache.set("b", "y" * 6)
+    
+    assert cache.get("a") is None
+    assert cache.get("b") == "y" * 6
+    cache.close()
+
+def test_hits_defer_access_time_writes(cache):
+    cache.set("key", "completion")
+    stored = cache._conn.execute(
+        "SELECT accessed_at FROM llm_cache WHERE key = 'key'"
+    ).fetchone()[0]
+    time.sleep(0.01)
+
+    assert cache.get("key") == "completion"
+    assert cache._conn.in_transaction is False
+    assert cache._conn.execute(
+        "SELECT accessed_at FROM llm_cache WHERE key = 'key'"
+    ).fetchone()[0] == stored
+
+    cache.flush()
+    assert cache._conn.execute(
+        "SELECT accessed_at FROM llm_cache WHERE key = 'key'"
+    ).fetchone()[0] > stored
+
+@pytest.mark.asyncio
+async def test_cached_llm_async_paths_run_off_the_event_loop(cache):
+    loop_thread = threading.get_ident()
+    threads = []
+    get, set_ = cache.get, cache.set
+    cache.get = lambda *args: threads.append(threading.get_ident()) or get(*args)
+    cache.set = lambda *args: threads.append(threading.get_ident()) or set_(*args)
+    cached = CachedLLM(FakeListChatModel(responses=["answer"]), cache)
+
+    assert (await cached.ainvoke("prompt")).content == "answer"
+    assert (await cached.ainvoke("prompt")).content == "answer"
+    chunks = [chunk.content async for chunk in cached.astream("other")]
+    assert "".join(chunks) == "answer"
+
+    assert len(threads) == 5
+    assert loop_thread not in threads
+
+def test_cached_llm_bypass(cache):
+    llm = FakeListChatModel(responses=["first", "second"])
+    cached = CachedLLM(llm, cache)
+    
+    assert cached.invoke("prompt").content == "first"
+    assert cached.invoke("prompt").content == "first"
+    bypass = {"configurable": {BYPASS_CACHE: True}}
+    assert cached.invoke("prompt", bypass).content == "second"
+    # The bypassed call refreshed the cached completion
+    assert cached.invoke("prompt").content == "second"
+
+def test_assistant_parse_jd_uses_cache(cache, sample_job_description):
+    llm = FakeListChatModel(responses=[sample_job_description.model_dump_json()])
+    assistant = ResumeAssistant(llm=llm, cache=cache)
+    
+    assistant.parse_jd("Job text", "https://example.com/job")
+    assistant.parse_jd("Job text", "https://example.com/job")
+    assistant.parse_jd("Other text", "https://example.com/job")
+    assistant.parse_jd("Job text", "https://example.com/job", use_cache=False)
+    
+    # The bypassed call neither counts as a hit nor a miss
+    assert cache.stats() == {"hits": 1, "misses": 2, "entries": 2,
+                             "bytes": cache.stats()["bytes"]}
+    # Only the cache hit was served without calling the model
+    assert [usage.llm_calls for usage in assistant.token_usage.records] == [1, 0, 1, 1]
+
+@pytest.mark.asyncio
+async def test_assistant_atailor_resume_uses_cache(cache, sample_job_description):
+    resume = {
+        "name": "John Doe", "title": "Engineer", "location": "Remote",
+        "phone": "1234567890", "email": "john@example.com",
+        "github": "johndoe", "linkedin": "johndoe", "summary": "Summary",
+        "education": [], "skills": [], "experience": [],
+    }
+    llm = FakeListChatModel(responses=[json.dumps(resume), "not json"])
+    assistant = ResumeAssistant(llm=llm, cache=str(cache.path))
+    
+    first = await assistant.atailor_resume("Resume", sample_job_description)
+    second = await assistant.atailor_resume("Resume", sample_job_description)
+    
+    assert first == second
+    assert assistant.cache.stats()["hits"] == 1
+    assistant.cache.close()
+
+def test_cached_llm_stream_stores_completion(cache):
+    llm = FakeListChatModel(responses=["streamed answer", "other"])
+    cached = CachedLLM(llm, cache)
+    
+    first = "".join(chunk.content for chunk in cached.stream("prompt"))
+    second = list(cached.stream("prompt"))
+    
+    assert first == "streamed answer"
+    assert [chunk.content for chunk in second] == ["streamed answer"]
+    assert cache.stats()["hits"] == 1
+
+@pytest.mark.asyncio
+async def test_cached_llm_astream_skips_abandoned_streams(cache):
+    llm = FakeListChatModel(responses=["streamed answer"])
+    cached = CachedLLM(llm, cache)
+    
+    stream = cached.astream("prompt")
+    await stream.__anext__()
+    await stream.aclose()
+    
+    assert cache.stats()["entries"] == 0
+
+def test_cached_llm_emits_cache_events(cache):
+    sink = MemorySink()
+    cached = CachedLLM(FakeListChatModel(responses=["answer"]), cache,
+                       Instrumentation([sink]))
+    
+    cached.invoke("prompt")
+    cached.invoke("prompt")
+    cached.invoke("prompt", {"configurable": {BYPASS_CACHE: True}})
+    
+    assert [e.attributes["hit"] for e in sink.named("cache")] == [False, True]
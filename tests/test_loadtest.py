@@ -0,0 +1,67 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+from yaart.fake_llm import FakeChatModel, constant
+from yaart.loadtest import LoadTestReport, StageStats, percentile, run_load_test
+from yaart.optimizer import ResumeOptimizer
+
+def test_percentile():
+    values = [float(i) for i in range(1, 101)]
+
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([3.0], 99) == 3.0
+    assert percentile([], 50) == 0.0
+
+def test_report_format():
+    report = LoadTestReport(
+        requests=4, concurrency=2, succeeded=4, elapsed=2.0,
+        stages=[StageStats.from_durations("tailor", [0.1, 0.2, 0.3, 0.4])],
+    )
+
+    assert report.throughput == 2.0
+    assert report.stage("tailor").p50 == 0.2
+    assert "tailor" in report.format()
+    assert "2.00 req/s" in report.format()
+
+@pytest.fixture
+def output_dir(tmp_path):
+    (tmp_path / "Markdown").mkdir()
+    (tmp_path / "PDF").mkdir()
+    return tmp_path
+
+@pytest.fixture
+def base_resume(tmp_path):
+    path = tmp_path / "base_resume.md"
+    path.write_text("# Jane Doe\n\nData Engineer")
+    return path
+
+def test_run_load_test(output_dir, base_resume):
+    with patch('yaart.optimizer.JobDatabase'), patch('yaart.optimizer.md2pdf'):
+        optimizer = ResumeOptimizer(llm=FakeChatModel(latency=constant(0.01)))
+        report = asyncio.run(run_load_test(
+            optimizer, base_resume, output_dir, requests=6, concurrency=3
+        ))
+
+    assert report.succeeded == 6
+    assert report.errors == []
+    stages = [stats.stage for stats in report.stages]
+    assert stages == ["parse_jd", "tailor", "render_markdown", "render_pdf", "request"]
+    assert report.stage("parse_jd").count == 6
+    assert report.stage("request").p99 >= report.stage("tailor").p50
+    assert len(list((output_dir / "Markdown").iterdir())) == 6
+    # The harness detaches its sink afterwards
+    assert optimizer.instrumentation.sinks == []
+
+def test_run_load_test_counts_failures(output_dir, base_resume):
+    with patch('yaart.optimizer.JobDatabase'), patch('yaart.optimizer.md2pdf'):
+        optimizer = ResumeOptimizer(llm=FakeChatModel(error_rate=1.0))
+        report = asyncio.run(run_load_test(
+            optimizer, base_resume, output_dir, requests=3, concurrency=3
+        ))
+
+    assert report.succeeded == 0
+    assert len(report.errors) == 3
+    assert report.stage("parse_jd").errors == 3
+    assert report.stage("request").errors == 3
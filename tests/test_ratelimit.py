@@ -0,0 +1,35 @@
+import asyncio
+import pytest
+from yaart.ratelimit import TokenBucket, HostRateLimiter
+
+def test_token_bucket_rejects_invalid_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+    with pytest.raises(ValueError):
+        TokenBucket(rate=1, capacity=0.5)
+
+@pytest.mark.asyncio
+async def test_token_bucket_allows_burst_then_throttles():
+    bucket = TokenBucket(rate=20, capacity=3)
+    loop = asyncio.get_running_loop()
+    
+    start = loop.time()
+    for _ in range(3):
+        await bucket.acquire()
+    assert loop.time() - start < 0.04
+    
+    # Next two acquisitions must wait roughly 1/rate each
+    for _ in range(2):
+        await bucket.acquire()
+    assert loop.time() - start >= 0.09
+
+@pytest.mark.asyncio
+async def test_host_rate_limiter_isolates_hosts():
+    limiter = HostRateLimiter(rate=1, capacity=1)
+    loop = asyncio.get_running_loop()
+    
+    start = loop.time()
+    await limiter.acquire("boards.greenhouse.io")
+    await limiter.acquire("jobs.lever.co")
+    assert loop.time() - start < 0.1
+    assert limiter.bucket("jobs.lever.co") is limiter.bucket("jobs.lever.co")
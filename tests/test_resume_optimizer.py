@@ -1,10 +1,14 @@
+import asyncio
 import pytest
 from pathlib import Path
 from unittest.mock import patch, AsyncMock, MagicMock
 from yaart.optimizer import ResumeOptimizer
+from yaart.base_resume import BaseResumeCache
+from yaart.instrumentation import MemorySink
 from yaart.models import JobDescription, JobRequirements
 from yaart.scraper import JobScraper
 from yaart.db import JobDatabase
+from yaart.urls import URLCanonicalizer
 
 @pytest.fixture
 def mock_job_description():
@@ -32,9 +36,25 @@ def mock_optimizer():
          patch('yaart.optimizer.md2pdf'):
         
         optimizer = ResumeOptimizer(api_key="test-key")
+        mock_assistant.aparse_jd = AsyncMock(
+            side_effect=lambda *args: mock_assistant.parse_jd(*args)
+        )
+        mock_assistant.atailor_resume = AsyncMock(
+            side_effect=lambda *args: mock_assistant.tailor_resume(*args)
+        )
+        mock_assistant.delta_tailoring = False
+        mock_scraper.parse_page = AsyncMock()
         optimizer.assistant = mock_assistant
+        optimizer.resume_cache = None
         optimizer.scraper = mock_scraper
         optimizer.db = mock_db
+        optimizer.async_db = MagicMock()
+        optimizer.async_db.get_job_description = AsyncMock(
+            side_effect=lambda *args: mock_db.get_job_description(*args)
+        )
+        optimizer.async_db.save_job_description = AsyncMock(
+            side_effect=lambda *args: mock_db.save_job_description(*args)
+        )
         return optimizer
 
 def test_resume_optimizer_init_with_llm():
@@ -44,6 +64,7 @@ def test_resume_optimizer_init_with_llm():
     assert optimizer.assistant.llm == mock_llm
     assert isinstance(optimizer.scraper, JobScraper)
     assert isinstance(optimizer.db, JobDatabase)
+    assert optimizer.async_db.db is optimizer.db
 
 def test_resume_optimizer_init_with_api_key():
     api_key = "test-key"
@@ -236,4 +257,214 @@ async def test_optimize_resume_file_not_found(mock_optimizer):
             jd_url="https://example.com/job",
             base_resume_path=Path("nonexistent.md"),
             output_dir=Path(".")
-        )
\ No newline at end of file
+        )
+
+@pytest.mark.asyncio
+async def test_resume_optimizer_async_context_closes_scraper():
+    async with ResumeOptimizer(llm=MagicMock()) as optimizer:
+        client = optimizer.scraper.client
+        assert not client.is_closed
+    
+    assert client.is_closed
+
+
+@pytest.mark.asyncio
+async def test_resume_optimizer_is_reusable_after_aclose(tmp_path,
+                                                         mock_job_description):
+    optimizer = ResumeOptimizer(llm=MagicMock(), db_path=tmp_path / "jobs.db")
+    async with optimizer:
+        await optimizer.async_db.save_job_description(mock_job_description)
+    
+    async with optimizer:
+        stored = await optimizer.async_db.get_job_description(mock_job_description.url)
+        await optimizer.async_db.save_job_description(mock_job_description)
+    
+    assert stored == mock_job_description
+
+@pytest.mark.asyncio
+async def test_resume_optimizer_flushes_owned_llm_cache(tmp_path):
+    optimizer = ResumeOptimizer(llm=MagicMock(), llm_cache=tmp_path / "llm.db",
+                                db_path=tmp_path / "jobs.db")
+    shared = ResumeOptimizer(llm=MagicMock(), llm_cache=optimizer.assistant.cache,
+                             db_path=tmp_path / "jobs.db")
+    
+    with patch.object(optimizer.assistant.cache, "flush") as flush:
+        await shared.aclose()
+        assert not flush.called
+        await optimizer.aclose()
+    
+    flush.assert_called_once_with()
+    assert optimizer.assistant.cache.stats()["entries"] == 0
+    optimizer.assistant.cache.close()
+
+@pytest.mark.asyncio
+async def test_resume_optimizer_in_memory_db_survives_aclose(mock_job_description):
+    optimizer = ResumeOptimizer(llm=MagicMock(), db_path=":memory:")
+    await optimizer.async_db.save_job_description(mock_job_description)
+    await optimizer.aclose()
+    
+    stored = await optimizer.async_db.get_job_description(mock_job_description.url)
+    await optimizer.aclose()
+    
+    assert stored == mock_job_description
+
+@pytest.mark.asyncio
+async def test_get_job_description_revalidate_not_modified(mock_optimizer, 
+                                                           mock_job_description):
+    mock_optimizer.db.get_job_description.return_value = mock_job_description
+    mock_optimizer.scraper.revalidate_job_description = AsyncMock(
+        side_effect=lambda url, stored: stored
+    )
+    
+    result = await mock_optimizer.get_job_description(
+        "https://example.com/job", revalidate=True
+    )
+    
+    assert result == mock_job_description
+    mock_optimizer.scraper.revalidate_job_description.assert_awaited_once_with(
+        "https://example.com/job", mock_job_description
+    )
+    assert not mock_optimizer.db.save_job_description.called
+
+@pytest.mark.asyncio
+async def test_get_job_description_revalidate_changed(mock_optimizer, 
+                                                      mock_job_description):
+    stale = mock_job_description.model_copy(update={"role": "Old Role"})
+    mock_optimizer.db.get_job_description.return_value = stale
+    mock_optimizer.scraper.revalidate_job_description = AsyncMock(
+        return_value=mock_job_description
+    )
+    
+    result = await mock_optimizer.get_job_description(
+        "https://example.com/job", revalidate=True
+    )
+    
+    assert result.role == "Software Engineer"
+    mock_optimizer.db.save_job_description.assert_called_with(mock_job_description)
+
+def test_http_cache_shares_the_canonicalizer(tmp_path):
+    canonicalizer = URLCanonicalizer(drop_params=["ref"])
+    optimizer = ResumeOptimizer(llm=MagicMock(), cache_dir=tmp_path / "http",
+                                canonicalizer=canonicalizer,
+                                db_path=tmp_path / "jobs.db")
+    
+    assert optimizer.scraper.cache.canonicalize is canonicalizer
+
+@pytest.mark.asyncio
+async def test_get_job_description_canonicalizes_url(mock_optimizer, 
+                                                     mock_job_description):
+    mock_optimizer.db.get_job_description.return_value = mock_job_description
+    
+    await mock_optimizer.get_job_description(
+        "https://Example.com/job/?utm_source=linkedin"
+    )
+    
+    mock_optimizer.db.get_job_description.assert_called_with(
+        "https://example.com/job"
+    )
+
+@pytest.mark.asyncio
+async def test_get_job_description_coalesces_concurrent_calls(mock_optimizer, 
+                                                              mock_job_description):
+    async def slow_scrape(url):
+        await asyncio.sleep(0.01)
+        return mock_job_description
+    
+    mock_optimizer.db.get_job_description.return_value = None
+    mock_optimizer.scraper.scrape_job_description = AsyncMock(
+        side_effect=slow_scrape
+    )
+    
+    results = await asyncio.gather(
+        mock_optimizer.get_job_description("https://example.com/job"),
+        mock_optimizer.get_job_description("https://example.com/job?utm_source=x"),
+        mock_optimizer.get_job_description("https://example.com/job/"),
+    )
+    
+    assert all(result == mock_job_description for result in results)
+    assert mock_optimizer.scraper.scrape_job_description.call_count == 1
+    assert mock_optimizer.db.save_job_description.call_count == 1
+    assert mock_optimizer._inflight == {}
+
+@pytest.mark.asyncio
+async def test_get_job_description_coalesced_failure(mock_optimizer):
+    mock_optimizer.db.get_job_description.return_value = None
+    mock_optimizer.scraper.scrape_job_description = AsyncMock(
+        side_effect=Exception("Scrape failed")
+    )
+    
+    results = await asyncio.gather(
+        mock_optimizer.get_job_description("https://example.com/job"),
+        mock_optimizer.get_job_description("https://example.com/job"),
+        return_exceptions=True
+    )
+    
+    assert all(isinstance(result, ValueError) for result in results)
+    assert mock_optimizer.scraper.scrape_job_description.call_count == 1
+
+def test_generate_documents_emits_render_pdf_span(mock_optimizer, tmp_path):
+    sink = MemorySink()
+    mock_optimizer.instrumentation.add_sink(sink)
+    
+    mock_optimizer.generate_documents("# Resume", "TestCo", tmp_path, tmp_path)
+    
+    span = sink.named("render_pdf")[0]
+    assert span.attributes == {"company": "TestCo"}
+    assert span.error is None
+
+@pytest.mark.asyncio
+async def test_load_base_resume_parses_once_per_version(tmp_path):
+    resume = MagicMock()
+    optimizer = ResumeOptimizer(llm=MagicMock(), resume_cache=tmp_path / "resumes",
+                                db_path=tmp_path / "jobs.db")
+    optimizer.assistant.aparse_resume = AsyncMock(return_value=resume)
+    optimizer.assistant.resume_cache = MagicMock()
+    stored = {}
+    optimizer.assistant.resume_cache.get.side_effect = stored.get
+    optimizer.assistant.resume_cache.set.side_effect = stored.__setitem__
+    sink = MemorySink()
+    optimizer.instrumentation.add_sink(sink)
+    base_resume = tmp_path / "base_resume.md"
+    base_resume.write_text("# Resume v1")
+
+    assert await optimizer.load_base_resume(base_resume) is resume
+    assert await optimizer.load_base_resume(base_resume) is resume
+    base_resume.write_text("# Resume v2")
+    await optimizer.load_base_resume(base_resume)
+
+    assert [c.args[0] for c in optimizer.assistant.aparse_resume.call_args_list] \
+        == ["# Resume v1", "# Resume v2"]
+    assert [e.attributes["hit"] for e in sink.named("cache")] == [False, True, False]
+
+@pytest.mark.asyncio
+async def test_load_base_resume_parses_for_delta_tailoring(mock_optimizer, tmp_path):
+    resume = MagicMock()
+    mock_optimizer.assistant.delta_tailoring = True
+    mock_optimizer.assistant.abase_resume = AsyncMock(return_value=resume)
+    base_resume = tmp_path / "base_resume.md"
+    base_resume.write_text("# Resume")
+
+    assert await mock_optimizer.load_base_resume(base_resume) is resume
+    mock_optimizer.assistant.abase_resume.assert_awaited_once_with("# Resume")
+
+def test_tailoring_modes_reach_the_assistant(tmp_path):
+    optimizer = ResumeOptimizer(llm=MagicMock(), db_path=tmp_path / "jobs.db",
+                                structured_output=True, parallel_sections=True,
+                                delta_tailoring=True)
+
+    assert optimizer.assistant.structured_output
+    assert optimizer.assistant.parallel_sections
+    assert optimizer.assistant.delta_tailoring
+
+@pytest.mark.asyncio
+async def test_load_base_resume_without_cache(mock_optimizer, tmp_path):
+    base_resume = tmp_path / "base_resume.md"
+    base_resume.write_text("# Resume")
+
+    assert await mock_optimizer.load_base_resume(base_resume) == "# Resume"
+
+def test_resume_cache_path(tmp_path):
+    optimizer = ResumeOptimizer(llm=MagicMock(), resume_cache=tmp_path / "resumes")
+
+    assert isinstance(optimizer.resume_cache, BaseResumeCache)
+    assert (tmp_path / "resumes").is_dir()
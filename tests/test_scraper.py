@@ -1,7 +1,11 @@
+import json
+from pathlib import Path
+import asyncio
 import pytest
 from unittest.mock import AsyncMock, patch
 import httpx
-from yaart.scraper import JobScraper
+from yaart.scraper import JobScraper, FetchedPage
+from yaart.instrumentation import Instrumentation, MemorySink
 from yaart.models import JobDescription, JobRequirements
 
 @pytest.fixture
@@ -25,14 +29,14 @@ def mock_job_description():
 @pytest.fixture
 def mock_assistant():
     with patch('yaart.scraper.ResumeAssistant') as mock:
+        mock.aparse_jd = AsyncMock(
+            side_effect=lambda *args, **kwargs: mock.parse_jd(*args, **kwargs)
+        )
         return mock
 
 @pytest.mark.asyncio
 async def test_scrape_job_description_html_parsing(mock_assistant):
     """Test HTML content parsing"""
-    # Create scraper with mock assistant
-    scraper = JobScraper(assistant=mock_assistant)
-    
     # Mock response with HTML content
     mock_response = AsyncMock()
     mock_response.text = """
@@ -49,9 +53,10 @@ async def test_scrape_job_description_html_parsing(mock_assistant):
     """
     mock_response.raise_for_status = AsyncMock()
     
-    # Setup mock client
+    # Setup mock client and scraper with mock assistant
     mock_client = AsyncMock()
-    mock_client.__aenter__.return_value.get.return_value = mock_response
+    mock_client.get.return_value = mock_response
+    scraper = JobScraper(assistant=mock_assistant, client=mock_client)
     
     # Configure assistant mock
     mock_job_description = JobDescription(
@@ -72,8 +77,7 @@ async def test_scrape_job_description_html_parsing(mock_assistant):
     mock_assistant.parse_jd.return_value = mock_job_description
     
     # Execute test
-    with patch('httpx.AsyncClient', return_value=mock_client):
-        result = await scraper.scrape_job_description("https://example.com/job")
+    result = await scraper.scrape_job_description("https://example.com/job")
     
     # Verify results
     assert result == mock_job_description
@@ -87,15 +91,13 @@ async def test_scrape_job_description_html_parsing(mock_assistant):
 async def test_scrape_job_description_http_error(mock_assistant):
     # Setup mock client to raise HTTPError
     mock_client = AsyncMock()
-    mock_client.__aenter__.return_value.get.side_effect = httpx.HTTPError(
-        "Failed to fetch")
+    mock_client.get.side_effect = httpx.HTTPError("Failed to fetch")
     
     # Create scraper instance
-    scraper = JobScraper(assistant=mock_assistant)
+    scraper = JobScraper(assistant=mock_assistant, client=mock_client)
     
     # Execute test
-    with patch('httpx.AsyncClient', return_value=mock_client), \
-         pytest.raises(ValueError) as exc_info:
+    with pytest.raises(ValueError) as exc_info:
         await scraper.scrape_job_description("https://example.com/job")
     
     assert "Failed to fetch job description" in str(exc_info.value)
@@ -110,17 +112,382 @@ async def test_scrape_job_description_parsing_error(mock_assistant):
     
     # Setup mock client
     mock_client = AsyncMock()
-    mock_client.__aenter__.return_value.get.return_value = mock_response
+    mock_client.get.return_value = mock_response
     
     # Setup assistant mock to raise error
     mock_assistant.parse_jd.side_effect = ValueError("Failed to parse")
     
     # Create scraper instance
-    scraper = JobScraper(assistant=mock_assistant)
+    scraper = JobScraper(assistant=mock_assistant, client=mock_client)
     
     # Execute test
-    with patch('httpx.AsyncClient', return_value=mock_client), \
-         pytest.raises(ValueError) as exc_info:
+    with pytest.raises(ValueError) as exc_info:
         await scraper.scrape_job_description("https://example.com/job")
     
     assert "Failed to process job description" in str(exc_info.value)
+
+
+@pytest.mark.asyncio
+async def test_scraper_reuses_client_across_calls(mock_assistant):
+    scraper = JobScraper(assistant=mock_assistant)
+    
+    client = scraper.client
+    assert client is scraper.client
+    assert not client.is_closed
+    
+    await scraper.aclose()
+    assert client.is_closed
+    # A fresh pool is created lazily after close
+    assert scraper.client is not client
+    await scraper.aclose()
+
+@pytest.mark.asyncio
+async def test_scraper_does_not_close_injected_client(mock_assistant):
+    client = httpx.AsyncClient()
+    async with JobScraper(assistant=mock_assistant, client=client) as scraper:
+        assert scraper.client is client
+    
+    assert not client.is_closed
+    await client.aclose()
+
+@pytest.mark.asyncio
+async def test_scraper_connection_reuse(mock_assistant):
+    """Requests to the same host share one pooled client"""
+    seen = []
+    
+    def handler(request):
+        seen.append(request.url.host)
+        return httpx.Response(200, text="<html><body>Job</body></html>")
+    
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    scraper = JobScraper(assistant=mock_assistant, client=client)
+    
+    await scraper.scrape_job_description("https://example.com/job/1")
+    await scraper.scrape_job_description("https://example.com/job/2")
+    
+    assert seen == ["example.com", "example.com"]
+    assert mock_assistant.parse_jd.call_count == 2
+    await client.aclose()
+
+@pytest.mark.asyncio
+async def test_scrape_many_yields_results_and_errors(mock_assistant, 
+                                                     mock_job_description):
+    def handler(request):
+        if request.url.path == "/broken":
+            raise httpx.ConnectError("boom", request=request)
+        return httpx.Response(200, text="<html><body>Job</body></html>")
+    
+    mock_assistant.parse_jd.return_value = mock_job_description
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    scraper = JobScraper(assistant=mock_assistant, client=client)
+    urls = [
+        "https://a.example.com/1",
+        "https://b.example.com/2",
+        "https://a.example.com/broken",
+    ]
+    
+    results = [
+        result async for result in scraper.scrape_many(
+            urls, concurrency=2, per_host_limit=100
+        )
+    ]
+    
+    assert sorted(r.url for r in results) == sorted(urls)
+    failed = [r for r in results if not r.ok]
+    assert len(failed) == 1
+    assert failed[0].url == "https://a.example.com/broken"
+    assert "Failed to fetch job description" in str(failed[0].error)
+    assert all(r.job_description == mock_job_description for r in results if r.ok)
+    await client.aclose()
+
+@pytest.mark.asyncio
+async def test_scrape_many_bounds_concurrency(mock_assistant):
+    in_flight = 0
+    peak = 0
+    
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, text="<html><body>Job</body></html>")
+    
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    scraper = JobScraper(assistant=mock_assistant, client=client)
+    urls = [f"https://host{i}.example.com/job" for i in range(10)]
+    
+    results = [
+        r async for r in scraper.scrape_many(urls, concurrency=3)
+    ]
+    
+    assert len(results) == 10
+    assert peak <= 3
+    await client.aclose()
+
+@pytest.mark.asyncio
+async def test_scrape_many_throttled_host_does_not_hold_slots(mock_assistant):
+    def handler(request):
+        return httpx.Response(200, text="<html><body>Job</body></html>")
+    
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    scraper = JobScraper(assistant=mock_assistant, client=client)
+    urls = [f"https://slow.example.com/job/{i}" for i in range(3)]
+    urls.append("https://fast.example.com/job")
+    
+    results = [
+        r async for r in scraper.scrape_many(
+            urls, concurrency=2, per_host_limit=20, per_host_burst=1
+        )
+    ]
+    
+    # The fast host gets the free slot while the slow host waits for tokens
+    assert [r.url for r in results[:2]].count("https://fast.example.com/job") == 1
+    await client.aclose()
+
+@pytest.mark.asyncio
+async def test_scrape_many_waits_for_cancelled_workers(mock_assistant):
+    finished = []
+    
+    async def handler(request):
+        try:
+            await asyncio.sleep(10)
+        finally:
+            finished.append(request.url.path)
+        return httpx.Response(200, text="<html><body>Job</body></html>")
+    
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    scraper = JobScraper(assistant=mock_assistant, client=client)
+    urls = [f"https://host{i}.example.com/job" for i in range(3)]
+    
+    results = scraper.scrape_many(urls, concurrency=3)
+    pending = asyncio.ensure_future(results.__anext__())
+    await asyncio.sleep(0.01)
+    pending.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await pending
+    await results.aclose()
+    
+    assert len(finished) == 3
+    await client.aclose()
+
+@pytest.mark.asyncio
+async def test_fetch_page_revalidates_with_cache(mock_assistant, tmp_path):
+    requests = []
+    
+    def handler(request):
+        requests.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(
+            200, text="<html><body>Job v1</body></html>", headers={"ETag": '"v1"'}
+        )
+    
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    scraper = JobScraper(assistant=mock_assistant, client=client, cache=tmp_path)
+    
+    first = await scraper.fetch_page("https://example.com/job")
+    second = await scraper.fetch_page("https://example.com/job")
+    
+    assert not first.not_modified
+    assert second.not_modified
+    assert second.html == first.html
+    assert "If-None-Match" not in requests[0].headers
+    assert requests[1].headers["If-None-Match"] == '"v1"'
+    await client.aclose()
+
+@pytest.mark.asyncio
+async def test_revalidate_job_description(mock_assistant, mock_job_description,
+                                          tmp_path):
+    etag = '"v1"'
+    
+    def handler(request):
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304)
+        return httpx.Response(
+            200, text="<html><body>Job</body></html>", headers={"ETag": etag}
+        )
+    
+    mock_assistant.parse_jd.side_effect = \
+        lambda *args: mock_job_description.model_copy()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    scraper = JobScraper(assistant=mock_assistant, client=client, cache=tmp_path)
+    stored = await scraper.scrape_job_description("https://example.com/job")
+    
+    assert await scraper.revalidate_job_description(
+        "https://example.com/job", stored
+    ) is stored
+    etag = '"v2"'
+    assert await scraper.revalidate_job_description(
+        "https://example.com/job", stored
+    ) is not stored
+    assert mock_assistant.parse_jd.call_count == 2
+    await client.aclose()
+
+@pytest.mark.asyncio
+async def test_revalidate_job_description_uses_ats_adapter(mock_assistant,
+                                                           mock_job_description):
+    fixture = Path(__file__).parent / "fixtures" / "ats" / "greenhouse_job.json"
+    requested = []
+    
+    def handler(request):
+        requested.append(str(request.url))
+        return httpx.Response(200, text=fixture.read_text())
+    
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    scraper = JobScraper(assistant=mock_assistant, client=client)
+    
+    result = await scraper.revalidate_job_description(
+        "https://boards.greenhouse.io/acmecorp/jobs/4012345", mock_job_description
+    )
+    
+    assert result.role == "Senior Data Engineer"
+    assert len(requested) == 1
+    assert requested[0].startswith("https://boards-api.greenhouse.io/")
+    await client.aclose()
+
+@pytest.mark.asyncio
+async def test_revalidate_job_page_requires_cache(mock_assistant, mock_job_description):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(
+        lambda request: httpx.Response(200, text="<html></html>")
+    ))
+    scraper = JobScraper(assistant=mock_assistant, client=client)
+    
+    with pytest.raises(ValueError, match="requires an HTTP cache"):
+        await scraper.revalidate_job_description(
+            "https://example.com/job", mock_job_description
+        )
+    await client.aclose()
+
+@pytest.mark.asyncio
+async def test_fetch_page_does_not_cache_errors(mock_assistant, tmp_path):
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(404))
+    )
+    scraper = JobScraper(assistant=mock_assistant, client=client, cache=tmp_path)
+    
+    await scraper.fetch_page("https://example.com/gone")
+    
+    assert scraper.cache.get("https://example.com/gone") is None
+    await client.aclose()
+
+def json_ld_page(posting):
+    return f"""<html><head><script type="application/ld+json">
+        {json.dumps(posting)}
+        </script></head><body><main>Ignored body</main></body></html>"""
+
+@pytest.mark.asyncio
+async def test_parse_page_uses_complete_json_ld(mock_assistant):
+    scraper = JobScraper(assistant=mock_assistant)
+    posting = {
+        "@type": "JobPosting",
+        "title": "Data Engineer",
+        "hiringOrganization": {"name": "TestCo"},
+        "jobLocation": {"address": {"addressLocality": "Austin"}},
+        "responsibilities": "Build pipelines",
+        "skills": "Python",
+        "description": "<p>Build pipelines</p>"
+    }
+    page = FetchedPage(url="https://example.com/job", html=json_ld_page(posting))
+    
+    result = await scraper.parse_page(page)
+    
+    assert result.role == "Data Engineer"
+    assert result.location == "Austin"
+    assert result.requirements.skills == ["Python"]
+    assert not mock_assistant.parse_jd.called
+
+@pytest.mark.asyncio
+async def test_parse_page_fills_missing_json_ld_fields(mock_assistant, 
+                                                 mock_job_description):
+    mock_assistant.parse_jd.return_value = mock_job_description
+    scraper = JobScraper(assistant=mock_assistant)
+    posting = {
+        "@type": "JobPosting",
+        "title": "Data Engineer",
+        "hiringOrganization": "TestCo",
+        "description": "<p>Build pipelines with Python</p>"
+    }
+    page = FetchedPage(url="https://example.com/job", html=json_ld_page(posting))
+    
+    result = await scraper.parse_page(page)
+    
+    assert result.role == "Data Engineer"
+    assert result.responsibilities == mock_job_description.responsibilities
+    text = mock_assistant.parse_jd.call_args[0][0]
+    assert text.startswith("Title: Data Engineer")
+    assert "Build pipelines with Python" in text
+    assert "Ignored body" not in text
+
+@pytest.mark.asyncio
+async def test_parse_page_falls_back_on_bad_json_ld(mock_assistant,
+                                                    mock_job_description):
+    mock_assistant.parse_jd.return_value = mock_job_description
+    scraper = JobScraper(assistant=mock_assistant)
+    posting = {"@type": "JobPosting", "title": "Data Engineer"}
+    page = FetchedPage(url="https://example.com/job", html=json_ld_page(posting))
+    
+    with patch("yaart.scraper.jsonld.map_job_posting",
+               side_effect=TypeError("bad block")):
+        result = await scraper.parse_page(page)
+    
+    assert result == mock_job_description
+    assert "Ignored body" in mock_assistant.parse_jd.call_args[0][0]
+
+@pytest.mark.asyncio
+async def test_scrape_job_description_uses_ats_adapter(mock_assistant):
+    fixture = Path(__file__).parent / "fixtures" / "ats" / "greenhouse_job.json"
+    requested = []
+    
+    def handler(request):
+        requested.append(str(request.url))
+        return httpx.Response(200, text=fixture.read_text())
+    
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    scraper = JobScraper(assistant=mock_assistant, client=client)
+    
+    result = await scraper.scrape_job_description(
+        "https://boards.greenhouse.io/acmecorp/jobs/4012345"
+    )
+    
+    assert result.role == "Senior Data Engineer"
+    assert result.url == "https://boards.greenhouse.io/acmecorp/jobs/4012345"
+    assert requested[0].startswith("https://boards-api.greenhouse.io/")
+    assert not mock_assistant.parse_jd.called
+    await client.aclose()
+
+@pytest.mark.asyncio
+async def test_scrape_job_description_adapter_falls_back_to_html(mock_assistant, 
+                                                                 mock_job_description):
+    def handler(request):
+        if request.url.host == "api.lever.co":
+            return httpx.Response(404)
+        return httpx.Response(200, text="<html><body>Job page</body></html>")
+    
+    mock_assistant.parse_jd.return_value = mock_job_description
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    scraper = JobScraper(assistant=mock_assistant, client=client)
+    
+    result = await scraper.scrape_job_description("https://jobs.lever.co/globex/123")
+    
+    assert result == mock_job_description
+    assert "Job page" in mock_assistant.parse_jd.call_args[0][0]
+    await client.aclose()
+
+@pytest.mark.asyncio
+async def test_scrape_emits_scrape_and_extract_spans(mock_assistant, 
+                                                     mock_job_description):
+    sink = MemorySink()
+    mock_assistant.parse_jd.return_value = mock_job_description
+    client = httpx.AsyncClient(transport=httpx.MockTransport(
+        lambda request: httpx.Response(200, text="<html><body>Job page</body></html>")
+    ))
+    scraper = JobScraper(assistant=mock_assistant, client=client,
+                         instrumentation=Instrumentation([sink]))
+    
+    await scraper.scrape_job_description("https://example.com/job")
+    
+    assert [e.name for e in sink.events] == ["extract", "scrape"]
+    assert sink.named("scrape")[0].attributes["source"] == "page"
+    assert sink.named("extract")[0].attributes["input_chars"] > 0
+    await client.aclose()
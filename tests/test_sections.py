@@ -0,0 +1,79 @@
+from pathlib import Path
+from yaart.models import Experience, Skill, TailoredResume
+from yaart.sections import (
+    ADDITIONAL_SKILLS_CATEGORY,
+    reconcile_skills,
+    resume_skills,
+    skill_mentioned,
+    split_roles,
+)
+
+SAMPLE_RESUME = Path(__file__).parent.parent / "Markdown" / "sample.md"
+
+def experience(*bullets):
+    return Experience(title="Engineer", company="Tech Corp", location="Remote",
+                      dates="06/2019 - Present", bullets=list(bullets))
+
+def test_split_roles_sample_layout():
+    roles = split_roles(SAMPLE_RESUME.read_text())
+
+    assert len(roles) == 4
+    assert roles[0].startswith("### Director of Machine Learning\n**HealthTech AI**")
+    assert roles[0].endswith("medical documentation and patient communication")
+    assert roles[3].startswith("### Machine Learning Research Engineer")
+    assert "## Education" not in roles[3]
+
+def test_split_roles_rendered_layout():
+    resume = TailoredResume(
+        name="John Doe", title="Engineer", location="Remote", phone="1234567890",
+        email="john@example.com", github="johndoe", linkedin="johndoe",
+        summary="Summary", education=[], skills=[],
+        experience=[experience("Built APIs", "Cut costs"), experience("Wrote tests")]
+    )
+
+    roles = split_roles(resume.to_markdown())
+
+    assert len(roles) == 2
+    assert roles[0].startswith("**Engineer**  \n**Tech Corp**")
+    assert roles[1].endswith("- Wrote tests")
+
+def test_split_roles_without_experience_section():
+    assert split_roles("## Summary\nText\n\n### Not a role") == []
+
+def test_resume_skills():
+    skills = resume_skills(SAMPLE_RESUME.read_text())
+
+    assert skills[:3] == ["Python", "SQL", "Java"]
+    assert "Budget Management" in skills
+
+def test_skill_mentioned_boundaries():
+    assert skill_mentioned("C++", "Rewrote the engine in C++.")
+    assert skill_mentioned("node.js", "Built Node.js services")
+    assert not skill_mentioned("Go", "Good outcomes")
+    assert not skill_mentioned("C", "Wrote C++ and C# code")
+    assert skill_mentioned("Go", "Rewrote the billing service in Go, cutting costs")
+    assert not skill_mentioned("Go", "Owned the go-to-market plan")
+    assert not skill_mentioned("Go", "Go-to-market launch for three products")
+    assert not skill_mentioned("R", "Led R&D for the platform")
+    assert skill_mentioned("R", "Modelled churn in R and Python")
+    assert skill_mentioned("python", "Built Python services")
+
+def test_reconcile_skills_adds_missing_bullet_skills():
+    skills = [Skill(category="Languages", skills=["Python"])]
+    roles = [experience("Deployed Python services on AWS with Kubernetes")]
+
+    reconciled = reconcile_skills(
+        skills, roles, ["python", "AWS", "Kubernetes", "Terraform",
+                        "5+ years of AWS experience", "aws"]
+    )
+
+    assert reconciled[0].skills == ["Python"]
+    assert reconciled[1] == Skill(
+        category=ADDITIONAL_SKILLS_CATEGORY, skills=["AWS", "Kubernetes"]
+    )
+    assert skills == [Skill(category="Languages", skills=["Python"])]
+
+def test_reconcile_skills_unchanged_when_consistent():
+    skills = [Skill(category="Languages", skills=["Python"])]
+
+    assert reconcile_skills(skills, [experience("Wrote Python")], ["Python"]) is skills
@@ -0,0 +1,9 @@
+from yaart.skills import canonical_skill
+
+def test_canonical_skill():
+    assert canonical_skill("Python") == "python"
+    assert canonical_skill("  Machine   Learning, ") == "machine learning"
+    assert canonical_skill("Postgres") == canonical_skill("PostgreSQL.") == "postgresql"
+    assert canonical_skill("k8s") == "kubernetes"
+    assert canonical_skill(".NET") == ".net"
+    assert canonical_skill("C++") == "c++"
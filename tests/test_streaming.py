@@ -0,0 +1,149 @@
+import json
+import pytest
+from yaart.models import TailoredResume
+from yaart.streaming import JSONObjectScanner, ResumeSectionStream
+
+@pytest.fixture
+def resume_dict():
+    return {
+        "name": "John Doe",
+        "title": "Software Engineer",
+        "location": "San Francisco, CA",
+        "phone": "1234567890",
+        "email": "john@example.com",
+        "github": "github.com/johndoe",
+        "linkedin": "linkedin.com/in/johndoe",
+        "summary": "Engineer who writes \"clean\" code {and} tests, [mostly]",
+        "education": [{
+            "degree": "BS Computer Science",
+            "institution": "Test University",
+            "dates": "08/2015 - 05/2019"
+        }],
+        "skills": [{"category": "Languages", "skills": ["Python", "Go"]}],
+        "experience": [
+            {
+                "title": "Senior Engineer",
+                "company": "Tech Corp",
+                "company_description": "Leading AI Startup",
+                "location": "Remote",
+                "dates": "06/2021 - Present",
+                "bullets": ["Built {streaming} APIs", "Cut latency by 40%"]
+            },
+            {
+                "title": "Engineer",
+                "company": "Old Corp",
+                "location": "San Francisco, CA",
+                "dates": "06/2019 - 06/2021",
+                "bullets": ["Developed Python applications"]
+            }
+        ],
+        "open_source": [{"name": "yaart", "description": "Resume tailoring"}]
+    }
+
+def feed_in_chunks(stream, text, size=7):
+    sections = []
+    for start in range(0, len(text), size):
+        sections.extend(stream.feed(text[start:start + size]))
+    return sections
+
+def test_scanner_reports_members_and_items():
+    scanner = JSONObjectScanner(array_keys=("items",))
+    text = (
+        '```json\n{"a": "x, \\"y\\" }", '
+        '"items": [{"n": 1}, {"n": [2]}], "b": {"c": 3}}\n```'
+    )
+
+    events = []
+    for char in text:
+        events.extend(scanner.feed(char))
+
+    assert events == [
+        ("member", "a", 'x, "y" }'),
+        ("item", "items", {"n": 1}),
+        ("item", "items", {"n": [2]}),
+        ("member", "items", [{"n": 1}, {"n": [2]}]),
+        ("member", "b", {"c": 3}),
+    ]
+    assert scanner.done
+
+def test_scanner_waits_for_complete_values():
+    scanner = JSONObjectScanner()
+
+    assert scanner.feed('{"summary": "Half a sent') == []
+    assert scanner.feed('ence", "next"') == [("member", "summary", "Half a sentence")]
+
+def test_sections_join_to_full_markdown(resume_dict):
+    stream = ResumeSectionStream()
+    text = json.dumps(resume_dict, indent=2)
+    resume = TailoredResume.model_validate(resume_dict)
+
+    sections = feed_in_chunks(stream, text)
+    sections += stream.finish(resume)
+
+    assert [(s.name, s.index) for s in sections] == [
+        ("header", None), ("summary", None), ("education", None),
+        ("skills", None), ("experience", None), ("experience", 0),
+        ("experience", 1), ("open_source", None),
+    ]
+    assert "".join(s.markdown for s in sections).strip() == resume.to_markdown()
+
+def test_sections_are_released_before_the_document_ends(resume_dict):
+    stream = ResumeSectionStream()
+    text = json.dumps(resume_dict)
+    cutoff = text.index('"title": "Engineer"')
+
+    sections = feed_in_chunks(stream, text[:cutoff])
+
+    assert [(s.name, s.index) for s in sections][-2:] == [
+        ("experience", None), ("experience", 0)
+    ]
+    assert "Cut latency by 40%" in sections[-1].markdown
+
+def test_sections_keep_document_order(resume_dict):
+    stream = ResumeSectionStream()
+    reordered = {"summary": resume_dict.pop("summary"), **resume_dict}
+
+    sections = stream.feed(json.dumps(reordered))
+
+    assert sections[0].name == "header"
+    assert sections[1].name == "summary"
+    # Optional sections are only known to be absent once the stream ends
+    assert "publications" not in [s.name for s in sections]
+
+def test_invalid_value_holds_back_later_sections(resume_dict):
+    stream = ResumeSectionStream()
+    text = json.dumps(resume_dict)
+    text = text.replace('"dates": "06/2019 - 06/2021", ', "")
+
+    sections = feed_in_chunks(stream, text)
+    # Stands in for the resume after the missing field was repaired
+    sections += stream.finish(TailoredResume.model_validate(resume_dict))
+
+    assert [(s.name, s.index) for s in sections][-3:] == [
+        ("experience", 0), ("experience", 1), ("open_source", None)
+    ]
+    expected = TailoredResume.model_validate(resume_dict).to_markdown()
+    assert "".join(s.markdown for s in sections).strip() == expected
+
+def test_raw_newlines_in_strings_are_accepted(resume_dict):
+    stream = ResumeSectionStream()
+    resume_dict["summary"] = "Engineer\nwho ships"
+    # Models often emit literal newlines inside strings, which strict JSON rejects
+    text = json.dumps(resume_dict).replace("\\n", "\n")
+
+    sections = feed_in_chunks(stream, text)
+    sections += stream.finish(TailoredResume.model_validate(resume_dict))
+
+    assert [s.name for s in sections][:2] == ["header", "summary"]
+    assert "Engineer\nwho ships" in sections[1].markdown
+
+def test_malformed_json_holds_sections_for_finish(resume_dict):
+    stream = ResumeSectionStream()
+    text = json.dumps(resume_dict)
+    text = text.replace('"title": "Engineer"', '"title": Engineer', 1)
+
+    sections = feed_in_chunks(stream, text)
+    sections += stream.finish(TailoredResume.model_validate(resume_dict))
+
+    expected = TailoredResume.model_validate(resume_dict).to_markdown()
+    assert "".join(s.markdown for s in sections).strip() == expected
@@ -0,0 +1,104 @@
+import json
+import pytest
+from langchain_core.exceptions import OutputParserException
+from langchain_core.messages import AIMessage
+from pydantic import ValidationError
+from yaart.models import TailoredResume
+from yaart.structured import (
+    ToolCallOutputParser,
+    apply_repairs,
+    describe_invalid_fields,
+    field_schema,
+    invalid_fields,
+    load_payload,
+)
+
+@pytest.fixture
+def resume_data():
+    return {
+        "name": "John Doe", "title": "Engineer", "location": "Remote",
+        "phone": "1234567890", "email": "john@example.com",
+        "github": "johndoe", "linkedin": "johndoe", "summary": "Summary",
+        "education": [],
+        "skills": [{"category": "Languages", "skills": ["Python", 3]}],
+        "experience": [{
+            "title": "Engineer", "company": "Tech Corp", "location": "Remote",
+            "bullets": ["Built things"]
+        }],
+    }
+
+def validation_error(data):
+    with pytest.raises(ValidationError) as exc_info:
+        TailoredResume.model_validate(data)
+    return exc_info.value
+
+def test_load_payload():
+    assert load_payload('```json\n{"a": 1}\n```') == {"a": 1}
+    assert load_payload('{"a": [1, 2') == {"a": [1, 2]}
+    assert load_payload("no json here") is None
+    assert load_payload("[1, 2]") is None
+
+def test_invalid_fields_targets_smallest_fields(resume_data):
+    error = validation_error(resume_data)
+
+    assert invalid_fields(error) == {
+        "skills.0.skills": ("skills", 0, "skills"),
+        "experience.0.dates": ("experience", 0, "dates"),
+    }
+
+def test_invalid_fields_drops_nested_paths():
+    data = {"experience": "not a list"}
+    fields = invalid_fields(validation_error(data))
+
+    assert "experience" in fields
+    assert "name" in fields
+
+def test_field_schema_follows_nested_models():
+    schema = field_schema(TailoredResume, ("experience", 0, "dates"))
+
+    assert schema["type"] == "string"
+    assert "MM/YYYY" in schema["description"]
+    assert field_schema(TailoredResume, ("unknown",)) is None
+
+def test_describe_invalid_fields(resume_data):
+    error = validation_error(resume_data)
+    fields = invalid_fields(error)
+
+    description = describe_invalid_fields(TailoredResume, resume_data, fields, error)
+
+    assert "- path: experience.0.dates" in description
+    assert "current value: null" in description
+    assert '"company": "Tech Corp"' in description
+    assert "Field required" in description
+
+def test_apply_repairs_only_touches_requested_fields(resume_data):
+    fields = invalid_fields(validation_error(resume_data))
+
+    repaired = apply_repairs(resume_data, fields, {
+        "experience.0.dates": "06/2019 - Present",
+        "skills.0.skills": ["Python", "Go"],
+        "name": "Someone Else",
+    })
+
+    assert TailoredResume.model_validate(repaired).name == "John Doe"
+    assert repaired["experience"][0]["dates"] == "06/2019 - Present"
+    assert "dates" not in resume_data["experience"][0]
+
+def test_tool_call_parser_reads_tool_calls_and_content(resume_data):
+    parser = ToolCallOutputParser(pydantic_object=TailoredResume)
+    resume_data["skills"][0]["skills"] = ["Python"]
+    resume_data["experience"][0]["dates"] = "06/2019 - Present"
+    tool_message = AIMessage(content="", tool_calls=[
+        {"name": "TailoredResume", "args": resume_data, "id": "call_1"}
+    ])
+
+    assert parser.invoke(tool_message).name == "John Doe"
+    assert parser.invoke(AIMessage(content=json.dumps(resume_data))).name == "John Doe"
+
+def test_tool_call_parser_raises_repairable_error(resume_data):
+    parser = ToolCallOutputParser(pydantic_object=TailoredResume)
+
+    with pytest.raises(OutputParserException) as exc_info:
+        parser.invoke(AIMessage(content=json.dumps(resume_data)))
+
+    assert json.loads(exc_info.value.llm_output) == resume_data
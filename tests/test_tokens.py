@@ -0,0 +1,126 @@
+import sys
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+from yaart.tokens import (
+    TokenCounter,
+    TokenUsage,
+    TokenUsageHandler,
+    TokenUsageTracker,
+    approximate_tokens,
+    compress_text,
+    dedupe_lines,
+)
+
+class WordEncoding:
+    """Stand-in tiktoken encoding with one token per word"""
+    def encode(self, text, disallowed_special=()):
+        return text.split(" ")
+
+    def decode(self, tokens):
+        return " ".join(tokens)
+
+def test_approximate_tokens():
+    assert approximate_tokens("") == 0
+    assert approximate_tokens("abcd") == 1
+    assert approximate_tokens("abcde") == 2
+
+def test_counter_falls_back_without_encoding():
+    counter = TokenCounter("no-such-model")
+
+    assert counter.count("abcdefgh") == 2
+    assert counter.truncate("abcdefgh", 1) == "abcd"
+
+@pytest.mark.asyncio
+async def test_counter_resolves_encoding_off_the_event_loop():
+    counter = TokenCounter("gpt-4o")
+    threads = []
+
+    def encoding_for_model(model):
+        threads.append(threading.current_thread())
+        return WordEncoding()
+
+    fake_tiktoken = SimpleNamespace(encoding_for_model=encoding_for_model)
+    with patch.dict(sys.modules, {"tiktoken": fake_tiktoken}):
+        await counter.aresolve()
+        await counter.aresolve()
+
+    assert len(threads) == 1
+    assert threads[0] is not threading.main_thread()
+    assert counter.count("two words") == 2
+
+def test_counter_uses_encoding():
+    counter = TokenCounter(encoding=WordEncoding())
+
+    assert counter.count("one two three") == 3
+    assert counter.truncate("one two three", 2) == "one two"
+
+def test_counter_for_llm_reads_model_name():
+    assert TokenCounter.for_llm(SimpleNamespace(model_name="gpt-4o")).model == "gpt-4o"
+    assert TokenCounter.for_llm(SimpleNamespace(model="claude")).model == "claude"
+    assert TokenCounter.for_llm(MagicMock()).model is None
+
+def test_dedupe_lines():
+    text = "Apply now\nPython\n\n\n  apply   NOW \nPython\nGo"
+
+    assert dedupe_lines(text) == "Apply now\nPython\n\nGo"
+
+def test_compress_text_keeps_high_value_paragraphs_in_order():
+    counter = TokenCounter(encoding=WordEncoding())
+    paragraphs = [
+        "Senior Engineer at Acme",
+        "We use cookies to improve your experience, see our privacy policy",
+        "Responsibilities: build services",
+        "Our story began in a garage many many years ago with a dream",
+        "Requirements: 5+ years of Python experience",
+        "Acme is an equal opportunity employer",
+    ]
+    text = "\n".join(paragraphs)
+
+    compressed = compress_text(text, 16, counter)
+
+    assert compressed == "\n".join([paragraphs[0], paragraphs[2], paragraphs[4]])
+    assert compress_text(text, 16, counter) == compressed
+
+def test_compress_text_truncates_single_long_paragraph():
+    counter = TokenCounter(encoding=WordEncoding())
+
+    assert compress_text("a b c d e f", 3, counter) == "a b c"
+
+def test_compress_text_leaves_small_text_alone():
+    counter = TokenCounter()
+
+    assert compress_text("Role: Engineer", 100, counter) == "Role: Engineer"
+
+def test_tracker_totals_and_listeners():
+    tracker = TokenUsageTracker(history=1)
+    seen = []
+    tracker.listeners.append(seen.append)
+
+    tracker.record(TokenUsage("parse_jd", 10, 2, 30, compressed=True, llm_calls=1))
+    tracker.record(TokenUsage("parse_jd", 5, 1, 5, llm_calls=1,
+                              cached_input_tokens=4))
+
+    assert tracker.totals() == {"parse_jd": {
+        "calls": 2, "input_tokens": 15, "output_tokens": 3,
+        "original_input_tokens": 35, "cached_input_tokens": 4,
+    }}
+    assert len(tracker.records) == 1
+    assert len(seen) == 2
+
+def test_handler_reports_prompt_cache_tokens():
+    handler = TokenUsageHandler(TokenCounter())
+    message = AIMessage(content="{}", usage_metadata={
+        "input_tokens": 1200, "output_tokens": 40, "total_tokens": 1240,
+        "input_token_details": {"cache_read": 1000, "cache_creation": 150},
+    })
+
+    handler.on_llm_end(LLMResult(generations=[[ChatGeneration(message=message)]]))
+    usage = handler.usage("tailor_resume", 1100)
+
+    assert (usage.input_tokens, usage.output_tokens) == (1200, 40)
+    assert usage.cached_input_tokens == 1000
+    assert usage.cache_creation_input_tokens == 150
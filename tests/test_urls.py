@@ -0,0 +1,31 @@
+import pytest
+from yaart.urls import URLCanonicalizer, canonicalize_url
+
+@pytest.mark.parametrize("url,expected", [
+    ("https://Example.com/careers/123/?utm_source=linkedin&utm_medium=social",
+     "https://example.com/careers/123"),
+    ("https://example.com:443/job?b=2&a=1#apply",
+     "https://example.com/job?a=1&b=2"),
+    ("https://example.com/?gh_jid=42&gh_src=abc",
+     "https://example.com/?gh_jid=42"),
+    ("https://job-boards.greenhouse.io/acme/jobs/42?gh_jid=42",
+     "https://boards.greenhouse.io/acme/jobs/42"),
+    ("https://jobs.lever.co/globex/5ac2/apply?lever-source=LinkedIn",
+     "https://jobs.lever.co/globex/5ac2"),
+    ("http://example.com:8080/job", "http://example.com:8080/job"),
+    ("https://example.com/jobs?ref=42&source=careers&utm_source=x",
+     "https://example.com/jobs?ref=42&source=careers"),
+])
+def test_canonicalize_url(url, expected):
+    assert canonicalize_url(url) == expected
+
+def test_canonicalizer_is_configurable():
+    canonicalizer = URLCanonicalizer(
+        drop_params=["session*"],
+        rules=[lambda parts: parts._replace(netloc="www." + parts.netloc)],
+        strip_trailing_slash=False,
+        force_https=True,
+    )
+    
+    assert canonicalizer("http://example.com/job/?sessionid=1&utm_source=x") == \
+        "https://www.example.com/job/?utm_source=x"
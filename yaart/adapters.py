@@ -0,0 +1,275 @@
+import re
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from yaart.extract import FastTextExtractor
+from yaart.jsonld import fill_from_sections, unescape_html
+
+_text_extractor = FastTextExtractor(detect_main=False)
+
+
+def _slug_to_name(slug: str) -> str:
+    return " ".join(part.capitalize() for part in re.split(r"[-_]+", slug) if part)
+
+
+def _html_to_text(html: Optional[str]) -> str:
+    html = unescape_html(html)
+    return _text_extractor.extract(html).text if html else ""
+
+
+def _empty_fields(url: str) -> Dict[str, Any]:
+    return {
+        "url": url,
+        "role": "",
+        "company": "",
+        "location": "",
+        "responsibilities": [],
+        "requirements": {"skills": [], "experience": [], "education": []},
+        "salary": None,
+        "benefits": [],
+        "other_information": {},
+        "description": "",
+    }
+
+
+def _salary_range(
+    low: Any,
+    high: Any,
+    currency: Optional[str],
+    interval: Optional[str] = None
+) -> Optional[str]:
+    if low is None and high is None:
+        return None
+    amounts = [f"{value:,}" if isinstance(value, (int, float)) else str(value)
+               for value in (low, high) if value is not None]
+    text = f"{currency or ''} {'-'.join(dict.fromkeys(amounts))}".strip()
+    return f"{text} {interval}" if interval else text
+
+
+class ATSAdapter(ABC):
+    """
+    Fetches a posting from an applicant tracking system's public JSON API.
+
+    Subclasses implement `api_url` to recognise their posting URLs and
+    `to_fields` to map the API payload onto JobDescription fields (the same
+    field mapping used for JSON-LD, see `yaart.jsonld`).
+    """
+    name = ""
+
+    @abstractmethod
+    def api_url(self, url: str) -> Optional[str]:
+        """Return the JSON endpoint for a posting URL, or None if not handled"""
+
+    @abstractmethod
+    def to_fields(self, data: Any, url: str) -> Dict[str, Any]:
+        """Map the API payload onto JobDescription fields"""
+
+
+class GreenhouseAdapter(ATSAdapter):
+    name = "greenhouse"
+    URL_PATTERN = re.compile(
+        r"^(?:job-)?boards(?:\.eu)?\.greenhouse\.io$"
+    )
+
+    def api_url(self, url: str) -> Optional[str]:
+        parts = urlsplit(url)
+        if not self.URL_PATTERN.match(parts.hostname or ""):
+            return None
+        segments = [s for s in parts.path.split("/") if s]
+        job_id = parse_qs(parts.query).get("gh_jid", [None])[0]
+        if len(segments) >= 3 and segments[1] == "jobs":
+            board, job_id = segments[0], segments[2]
+        elif segments and job_id:
+            board = segments[0]
+        else:
+            return None
+        return f"https://boards-api.greenhouse.io/v1/boards/{board}/jobs/" \
+            f"{job_id}?pay_transparency=true"
+
+    def to_fields(self, data: Any, url: str) -> Dict[str, Any]:
+        fields = _empty_fields(url)
+        board = [s for s in urlsplit(url).path.split("/") if s][0]
+        content = unescape_html(data.get("content"))
+        fields["role"] = data.get("title") or ""
+        fields["company"] = data.get("company_name") or _slug_to_name(board)
+        fields["location"] = (data.get("location") or {}).get("name") or ""
+        pay_ranges = data.get("pay_input_ranges") or []
+        if pay_ranges:
+            pay = pay_ranges[0]
+            low, high = pay.get("min_cents"), pay.get("max_cents")
+            fields["salary"] = _salary_range(
+                low // 100 if isinstance(low, int) else low,
+                high // 100 if isinstance(high, int) else high,
+                pay.get("currency_type")
+            )
+        departments = [d.get("name") for d in data.get("departments") or []
+                       if d.get("name")]
+        if departments:
+            fields["other_information"]["department"] = ", ".join(departments)
+        if data.get("updated_at"):
+            fields["other_information"]["updated_at"] = data["updated_at"]
+        fields["description"] = _html_to_text(content)
+        return fill_from_sections(fields, content)
+
+
+class LeverAdapter(ATSAdapter):
+    name = "lever"
+
+    def api_url(self, url: str) -> Optional[str]:
+        parts = urlsplit(url)
+        if parts.hostname not in ("jobs.lever.co", "jobs.eu.lever.co"):
+            return None
+        segments = [s for s in parts.path.split("/") if s]
+        if len(segments) < 2:
+            return None
+        api_host = "api.eu.lever.co" if ".eu." in parts.hostname else "api.lever.co"
+        return f"https://{api_host}/v0/postings/{segments[0]}/{segments[1]}"
+
+    def to_fields(self, data: Any, url: str) -> Dict[str, Any]:
+        fields = _empty_fields(url)
+        company = [s for s in urlsplit(url).path.split("/") if s][0]
+        categories = data.get("categories") or {}
+        fields["role"] = data.get("text") or ""
+        fields["company"] = _slug_to_name(company)
+        locations = categories.get("allLocations") or [categories.get("location")]
+        location = "; ".join(loc for loc in locations if loc)
+        if data.get("workplaceType") == "remote" and "remote" not in location.lower():
+            location = f"Remote; {location}" if location else "Remote"
+        fields["location"] = location
+        salary = data.get("salaryRange") or {}
+        fields["salary"] = _salary_range(
+            salary.get("min"),
+            salary.get("max"),
+            salary.get("currency"),
+            (salary.get("interval") or "").replace("-", " ") or None
+        )
+        for key in ("team", "department", "commitment"):
+            if categories.get(key):
+                fields["other_information"][key] = categories[key]
+        # Lever splits postings into titled lists, which map onto sections
+        lists_html = "".join(
+            f"<h3>{item.get('text', '')}</h3><ul>{item.get('content', '')}</ul>"
+            for item in data.get("lists") or []
+        )
+        html = f"{data.get('description') or ''}{lists_html}" \
+            f"{data.get('additional') or ''}"
+        fields["description"] = _html_to_text(html)
+        return fill_from_sections(fields, html)
+
+
+class AshbyAdapter(ATSAdapter):
+    name = "ashby"
+
+    def api_url(self, url: str) -> Optional[str]:
+        parts = urlsplit(url)
+        if parts.hostname != "jobs.ashbyhq.com":
+            return None
+        segments = [s for s in parts.path.split("/") if s]
+        if len(segments) < 2:
+            return None
+        return "https://api.ashbyhq.com/posting-api/job-board/" \
+            f"{segments[0]}?includeCompensation=true"
+
+    def to_fields(self, data: Any, url: str) -> Dict[str, Any]:
+        organization, job_id = [s for s in urlsplit(url).path.split("/") if s][:2]
+        # The board endpoint lists every open job; pick the requested one
+        job = next(
+            (job for job in data.get("jobs") or []
+             if job.get("id") == job_id or (job.get("jobUrl") or "").rstrip("/")
+             .endswith(job_id)),
+            None
+        )
+        if job is None:
+            raise ValueError(f"Job {job_id} not found on Ashby board {organization}")
+        fields = _empty_fields(url)
+        fields["role"] = job.get("title") or ""
+        fields["company"] = _slug_to_name(organization)
+        locations = [job.get("location")] + [
+            loc.get("location") for loc in job.get("secondaryLocations") or []
+        ]
+        location = "; ".join(loc for loc in locations if loc)
+        if job.get("isRemote") and "remote" not in location.lower():
+            location = f"Remote; {location}" if location else "Remote"
+        fields["location"] = location
+        compensation = job.get("compensation") or {}
+        fields["salary"] = compensation.get("scrapeableCompensationSalarySummary") \
+            or compensation.get("compensationTierSummary")
+        for key, field in (("employment_type", "employmentType"),
+                           ("department", "department"),
+                           ("team", "team")):
+            if job.get(field):
+                fields["other_information"][key] = job[field]
+        html = job.get("descriptionHtml") or ""
+        fields["description"] = _html_to_text(html) or job.get("descriptionPlain", "")
+        return fill_from_sections(fields, html)
+
+
+class WorkdayAdapter(ATSAdapter):
+    name = "workday"
+    HOST_PATTERN = re.compile(r"^(?P<tenant>[\w-]+)\.wd\d+\.myworkdayjobs\.com$")
+    LOCALE_PATTERN = re.compile(r"^[a-z]{2}-[A-Z]{2}$")
+
+    def api_url(self, url: str) -> Optional[str]:
+        parts = urlsplit(url)
+        match = self.HOST_PATTERN.match(parts.hostname or "")
+        if not match:
+            return None
+        segments = [s for s in parts.path.split("/") if s]
+        if segments and self.LOCALE_PATTERN.match(segments[0]):
+            segments = segments[1:]
+        if len(segments) < 3 or "job" not in segments:
+            return None
+        site = segments[0]
+        job_path = "/".join(segments[segments.index("job"):])
+        return f"https://{parts.hostname}/wday/cxs/{match.group('tenant')}/" \
+            f"{site}/{job_path}"
+
+    def to_fields(self, data: Any, url: str) -> Dict[str, Any]:
+        info = data.get("jobPostingInfo") or {}
+        organization = data.get("hiringOrganization") or {}
+        tenant = self.HOST_PATTERN.match(urlsplit(url).hostname or "")
+        fields = _empty_fields(url)
+        fields["role"] = info.get("title") or ""
+        fields["company"] = organization.get("name") or (
+            _slug_to_name(tenant.group("tenant")) if tenant else ""
+        )
+        locations: List[str] = [info.get("location")] + list(
+            info.get("additionalLocations") or []
+        )
+        location = "; ".join(loc for loc in locations if loc)
+        if info.get("remoteType") and "remote" in info["remoteType"].lower():
+            location = f"{info['remoteType']}; {location}" if location \
+                else info["remoteType"]
+        fields["location"] = location
+        for key, field in (("employment_type", "timeType"),
+                           ("posted", "postedOn"),
+                           ("requisition_id", "jobReqId")):
+            if info.get(field):
+                fields["other_information"][key] = info[field]
+        html = info.get("jobDescription") or ""
+        fields["description"] = _html_to_text(html)
+        return fill_from_sections(fields, html)
+
+
+DEFAULT_ADAPTERS = (GreenhouseAdapter, LeverAdapter, AshbyAdapter, WorkdayAdapter)
+
+
+class AdapterRegistry:
+    """Matches posting URLs to the ATS adapter able to fetch them as JSON"""
+
+    def __init__(self, adapters: Optional[List[ATSAdapter]] = None):
+        if adapters is None:
+            adapters = [adapter() for adapter in DEFAULT_ADAPTERS]
+        self.adapters = list(adapters)
+
+    def register(self, adapter: ATSAdapter) -> None:
+        """Add an adapter; later registrations take precedence"""
+        self.adapters.insert(0, adapter)
+
+    def resolve(self, url: str) -> Optional[Tuple[ATSAdapter, str]]:
+        """Return the adapter and JSON endpoint for a URL, if any adapter matches"""
+        for adapter in self.adapters:
+            api_url = adapter.api_url(url)
+            if api_url:
+                return adapter, api_url
+        return None
@@ -0,0 +1,92 @@
+import hashlib
+import os
+from pathlib import Path
+from typing import List, Optional, Union
+from pydantic import ValidationError
+from yaart.models import Experience, TailoredResume
+
+
+def resume_hash(content: Union[str, bytes]) -> str:
+    """Hash of a base resume file's contents"""
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return hashlib.sha256(content).hexdigest()
+
+
+class BaseResumeCache:
+    """
+    On-disk cache of parsed base resumes, one JSON file per resume hash.
+
+    Editing the resume changes its hash, so stale entries are never read;
+    they are simply left behind.
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Optional[TailoredResume]:
+        """Return the parsed resume stored for a hash, if any"""
+        path = self._path(key)
+        try:
+            return TailoredResume.model_validate_json(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (ValueError, ValidationError):
+            # Corrupt entry or one written for an older schema; treat as a miss
+            path.unlink(missing_ok=True)
+            return None
+
+    def set(self, key: str, resume: TailoredResume) -> None:
+        """Store a parsed resume, replacing any previous version atomically"""
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(resume.model_dump_json(exclude_none=True), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+
+def compact_role(exp: Experience) -> str:
+    """One experience entry as plain text: a details line, then bullets"""
+    company = exp.company
+    if exp.company_description:
+        company += f" ({exp.company_description})"
+    lines = [f"{exp.title} | {company} | {exp.location} | {exp.dates}"]
+    lines.extend(f"- {bullet}" for bullet in exp.bullets)
+    return "\n".join(lines)
+
+
+def compact_resume(resume: TailoredResume) -> str:
+    """
+    Plain-text rendering of a parsed resume for prompts.
+
+    Carries every field without the HTML and markdown of the source file,
+    so tailoring prompts are smaller than with the raw base_resume.md.
+    """
+    contact = " | ".join(
+        (resume.location, resume.phone, resume.email, resume.github, resume.linkedin)
+    )
+    sections: List[str] = [
+        f"Name: {resume.name}\nTitle: {resume.title}\nContact: {contact}",
+        f"Summary:\n{resume.summary}",
+        "Experience:\n" + "\n\n".join(compact_role(exp) for exp in resume.experience),
+        "Skills:\n" + "\n".join(
+            f"- {group.category}: {', '.join(group.skills)}" for group in resume.skills
+        ),
+        "Education:\n" + "\n".join(
+            "- " + " | ".join(filter(None, (edu.degree, edu.institution, edu.dates,
+                                            edu.location)))
+            for edu in resume.education
+        ),
+    ]
+    if resume.publications:
+        sections.append("Publications:\n" + "\n".join(
+            f"- {pub.journal} | {pub.title} | {pub.date}" for pub in resume.publications
+        ))
+    if resume.open_source:
+        sections.append("Open-Source Contributions:\n" + "\n".join(
+            f"- {project.name}: {project.description}" for project in resume.open_source
+        ))
+    return "\n\n".join(sections)
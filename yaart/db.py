@@ -1,27 +1,151 @@
+import asyncio
+import queue
 import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import contextmanager
-from typing import Optional
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 import json
 from yaart.models import JobDescription
+from yaart.skills import canonical_skill
+
+DEFAULT_DB_PATH = "jobs.db"
+
+# Applied to every connection. WAL lets readers run alongside the writer,
+# and with it synchronous=NORMAL only fsyncs at checkpoints.
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA mmap_size=268435456",  # 256 MiB
+    "PRAGMA cache_size=-65536",  # 64 MiB
+    "PRAGMA temp_store=MEMORY",
+)
+
+# Most saves committed together by AsyncJobDatabase's writer thread
+MAX_WRITE_BATCH = 256
+
+# Text indexed for search, as SQL over a descriptions row aliased {row}.
+# JSON arrays and objects are flattened to their string values so field
+# names and punctuation are not indexed.
+FTS_COLUMNS = {
+    "role": "{row}.role",
+    "company": "{row}.company",
+    "location": "{row}.location",
+    "responsibilities":
+        "(SELECT group_concat(value, ' ') FROM json_each({row}.responsibilities))",
+    "requirements": "(SELECT group_concat(value, ' ') FROM "
+                    "json_tree({row}.skills_requirements) WHERE type = 'text')",
+    "benefits": "(SELECT group_concat(value, ' ') FROM json_each({row}.benefits))",
+    "other_information": "(SELECT group_concat(value, ' ') FROM "
+                         "json_tree({row}.other_information) WHERE type = 'text')",
+}
+# BM25 weight of a match in each FTS_COLUMNS column
+FTS_WEIGHTS = (5.0, 3.0, 1.0, 1.0, 2.0, 0.5, 0.5)
+
+# Clears a posting's requirement rows when it is changed or deleted. Only
+# built-in SQL is used, so any SQLite client can write to descriptions.
+REQUIREMENT_DELETES = (
+    "DELETE FROM job_skills WHERE description_id = old.id",
+    "DELETE FROM job_requirements WHERE description_id = old.id",
+)
+
+
+def _fts_values(row: str) -> str:
+    return ", ".join(expr.format(row=row) for expr in FTS_COLUMNS.values())
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """Open a connection to the job database with the tuned pragmas applied"""
+    conn = sqlite3.connect(path, uri=path.startswith("file:"), check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    return conn
 
-@contextmanager 
-def get_db_connection():
-    conn = sqlite3.connect('jobs.db')
-    try:
-        conn.row_factory = sqlite3.Row
-        yield conn
-    finally:
-        conn.close()
 
 class JobDatabase:
-    def __init__(self):
-        self._init_db()
+    """
+    Stores parsed job descriptions in SQLite, keyed by posting URL.
+
+    Each thread keeps one long-lived connection, so queries skip the
+    connection setup cost and concurrent readers never wait on a writer.
+    `":memory:"` gives a private in-memory database shared by all threads.
+    """
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_DB_PATH):
+        path = str(path)
+        if path == ":memory:":
+            # Plain :memory: would give every connection its own database
+            path = f"file:yaart-{uuid.uuid4().hex}?mode=memory&cache=shared"
+        self.path = path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+        self._connections: Dict[threading.Thread, sqlite3.Connection] = {}
+        # Opening the creating thread's connection creates the schema, and
+        # keeps a shared in-memory database alive until close()
+        self.connection
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """
+        The calling thread's connection, opened on first use.
+
+        The first connection after construction or close() also creates the
+        schema, so a closed database can be used again.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = connect(self.path)
+            self._local.conn = conn
+            with self._lock:
+                self._connections[threading.current_thread()] = conn
+            with self._init_lock:
+                if not self._initialized:
+                    self._init_db()
+                    self._initialized = True
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Commit the enclosed statements together, or roll them all back"""
+        conn = self.connection
+        with conn:
+            yield conn
+
+    def close(self) -> None:
+        """Close the connections opened by every thread"""
+        with self._lock:
+            connections, self._connections = self._connections, {}
+            self._initialized = False
+        for conn in connections.values():
+            conn.close()
+        self._local = threading.local()
+
+    def close_finished(self) -> None:
+        """Close the connections of threads that have exited"""
+        with self._lock:
+            finished = [
+                self._connections.pop(thread) for thread in list(self._connections)
+                if not thread.is_alive()
+            ]
+        for conn in finished:
+            conn.close()
+
+    def __enter__(self) -> "JobDatabase":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
     def _init_db(self):
         """Initialize the database schema if it doesn't exist"""
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
+        with self.transaction() as conn:
+            conn.execute('''
                 CREATE TABLE IF NOT EXISTS descriptions (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     url TEXT UNIQUE,
@@ -32,54 +156,512 @@ class JobDatabase:
                     skills_requirements TEXT,
                     salary TEXT,
                     benefits TEXT,
-                    other_information TEXT
+                    other_information TEXT,
+                    saved_at REAL
                 )
             ''')
-            conn.commit()
+            columns = {
+                row['name']
+                for row in conn.execute("PRAGMA table_info(descriptions)")
+            }
+            if "saved_at" not in columns:
+                conn.execute("ALTER TABLE descriptions ADD COLUMN saved_at REAL")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_descriptions_saved_at "
+                "ON descriptions (saved_at)"
+            )
+            self._init_search(conn)
+            self._init_requirements(conn)
+
+    def _init_search(self, conn: sqlite3.Connection) -> None:
+        """Create the full-text index and the triggers keeping it in sync"""
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'descriptions_fts'"
+        ).fetchone()
+        columns = ", ".join(FTS_COLUMNS)
+        conn.execute(f'''
+            CREATE VIRTUAL TABLE IF NOT EXISTS descriptions_fts USING fts5(
+                {columns}, tokenize = 'porter unicode61'
+            )
+        ''')
+
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS descriptions_fts_insert
+            AFTER INSERT ON descriptions BEGIN
+                INSERT INTO descriptions_fts (rowid, {columns})
+                VALUES (new.id, {_fts_values("new")});
+            END
+        ''')
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS descriptions_fts_update
+            AFTER UPDATE ON descriptions BEGIN
+                DELETE FROM descriptions_fts WHERE rowid = old.id;
+                INSERT INTO descriptions_fts (rowid, {columns})
+                VALUES (new.id, {_fts_values("new")});
+            END
+        ''')
+        conn.execute('''
+            CREATE TRIGGER IF NOT EXISTS descriptions_fts_delete
+            AFTER DELETE ON descriptions BEGIN
+                DELETE FROM descriptions_fts WHERE rowid = old.id;
+            END
+        ''')
+        if not exists:
+            # Index rows stored before search was added
+            conn.execute(f'''
+                INSERT INTO descriptions_fts (rowid, {columns})
+                SELECT d.id, {_fts_values("d")} FROM descriptions d
+            ''')
+
+    def _init_requirements(self, conn: sqlite3.Connection) -> None:
+        """
+        Create the skill and requirement child tables.
+
+        job_skills holds one row per posting and canonical skill name, so
+        analytics across postings are indexed SQL aggregates rather than
+        JSON decoding. save_job_descriptions fills both tables; triggers
+        only clear a posting's rows when it is changed or deleted.
+        """
+        existing = {
+            row['name'] for row in conn.execute(
+                "SELECT name FROM sqlite_master "
+                "WHERE name IN ('job_skills', 'job_requirements')"
+            )
+        }
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS job_skills (
+                description_id INTEGER NOT NULL,
+                skill TEXT NOT NULL,
+                PRIMARY KEY (skill, description_id)
+            ) WITHOUT ROWID
+        ''')
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_job_skills_description
+            ON job_skills (description_id, skill)
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS job_requirements (
+                description_id INTEGER NOT NULL,
+                kind TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                text TEXT NOT NULL,
+                PRIMARY KEY (description_id, kind, position)
+            ) WITHOUT ROWID
+        ''')
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_job_requirements_kind
+            ON job_requirements (kind, text)
+        ''')
+
+        deletes = "".join(f"{sql};\n" for sql in REQUIREMENT_DELETES)
+        # Earlier versions filled the tables from triggers calling a
+        # Python function that other SQLite clients lack
+        conn.execute("DROP TRIGGER IF EXISTS job_requirements_insert")
+        conn.execute("DROP TRIGGER IF EXISTS job_requirements_update")
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS job_requirements_clear
+            AFTER UPDATE OF skills_requirements ON descriptions BEGIN
+                {deletes}
+            END
+        ''')
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS job_requirements_delete
+            AFTER DELETE ON descriptions BEGIN
+                {deletes}
+            END
+        ''')
+        # Normalize rows stored before these tables were added
+        if "job_requirements" not in existing:
+            conn.execute('''
+                INSERT INTO job_requirements (description_id, kind, position, text)
+                SELECT d.id, 'experience', item.key, item.value
+                FROM descriptions d,
+                     json_each(d.skills_requirements, '$.experience') AS item
+                UNION ALL
+                SELECT d.id, 'education', item.key, item.value
+                FROM descriptions d,
+                     json_each(d.skills_requirements, '$.education') AS item
+            ''')
+        if "job_skills" not in existing:
+            rows = conn.execute("SELECT id, skills_requirements FROM descriptions")
+            conn.executemany(
+                "INSERT INTO job_skills (description_id, skill) VALUES (?, ?)",
+                [
+                    (row['id'], skill)
+                    for row in rows
+                    for skill in _canonical_skills(
+                        json.loads(row['skills_requirements']).get("skills", [])
+                    )
+                ]
+            )
 
     def save_job_description(self, job_description: JobDescription):
         """Save job description to database"""
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT OR REPLACE INTO descriptions (
+        self.save_job_descriptions([job_description])
+
+    def save_job_descriptions(self, job_descriptions: Iterable[JobDescription]) -> None:
+        """
+        Save many job descriptions in a single transaction.
+
+        Each posting's skills (canonicalized) and experience and education
+        items are written to the job_skills and job_requirements tables in
+        the same transaction.
+        """
+        # The last version of a URL wins, as with sequential saves
+        by_url = {jd.url: jd for jd in job_descriptions}
+        now = time.time()
+        with self.transaction() as conn:
+            conn.executemany('''
+                INSERT INTO descriptions (
                     url, role, company, location, responsibilities,
-                    skills_requirements, salary, benefits, other_information
+                    skills_requirements, salary, benefits, other_information,
+                    saved_at
                 )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                job_description.url,
-                job_description.role,
-                job_description.company,
-                job_description.location,
-                json.dumps(job_description.responsibilities),
-                json.dumps(job_description.requirements.model_dump()),
-                job_description.salary,
-                json.dumps(job_description.benefits),
-                json.dumps(job_description.other_information)
-            ))
-            conn.commit()
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (url) DO UPDATE SET
+                    role = excluded.role,
+                    company = excluded.company,
+                    location = excluded.location,
+                    responsibilities = excluded.responsibilities,
+                    skills_requirements = excluded.skills_requirements,
+                    salary = excluded.salary,
+                    benefits = excluded.benefits,
+                    other_information = excluded.other_information,
+                    saved_at = excluded.saved_at
+            ''', (_row_values(jd) + (now,) for jd in by_url.values()))
+            # Updated rows had their requirement rows cleared by a trigger
+            ids = {
+                row['url']: row['id'] for row in conn.execute(
+                    '''SELECT id, url FROM descriptions
+                       WHERE url IN (SELECT value FROM json_each(?))''',
+                    (json.dumps(list(by_url)),)
+                )
+            }
+            conn.executemany(
+                "INSERT INTO job_skills (description_id, skill) VALUES (?, ?)",
+                [
+                    (ids[url], skill) for url, jd in by_url.items()
+                    for skill in _canonical_skills(jd.requirements.skills)
+                ]
+            )
+            conn.executemany(
+                '''INSERT INTO job_requirements (description_id, kind, position, text)
+                   VALUES (?, ?, ?, ?)''',
+                [
+                    (ids[url], kind, position, text) for url, jd in by_url.items()
+                    for kind, items in (("experience", jd.requirements.experience),
+                                        ("education", jd.requirements.education))
+                    for position, text in enumerate(items)
+                ]
+            )
 
     def get_job_description(self, url: str) -> Optional[JobDescription]:
         """Retrieve job description from database"""
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                '''SELECT * FROM descriptions WHERE url = ?''',
-                (url,)
-            )
-            row = cursor.fetchone()
-            
-            if row:
-                return JobDescription(
-                    url=row['url'],
-                    role=row['role'],
-                    company=row['company'], 
-                    location=row['location'],
-                    responsibilities=json.loads(row['responsibilities']),
-                    requirements=json.loads(row['skills_requirements']),
-                    salary=row['salary'],
-                    benefits=json.loads(row['benefits']),
-                    other_information=json.loads(row['other_information'])
+        row = self.connection.execute(
+            '''SELECT * FROM descriptions WHERE url = ?''',
+            (url,)
+        ).fetchone()
+        return _from_row(row) if row else None
+
+    def get_job_descriptions(self, urls: Iterable[str]) -> Dict[str, JobDescription]:
+        """
+        Retrieve the stored job descriptions for many URLs in one query.
+
+        The URLs are bound as a single JSON array, so there is no limit on
+        how many can be looked up at once. URLs with no stored job
+        description are left out of the result.
+        """
+        rows = self.connection.execute(
+            '''SELECT * FROM descriptions
+               WHERE url IN (SELECT value FROM json_each(?))''',
+            (json.dumps(list(urls)),)
+        ).fetchall()
+        return {row['url']: _from_row(row) for row in rows}
+
+    def search(self, query: str, limit: int = 20,
+               offset: int = 0) -> List[JobDescription]:
+        """
+        Full-text search over stored job descriptions, best matches first.
+
+        `query` uses SQLite FTS5 syntax: bare words must all match (with
+        stemming), and quoted phrases, OR, NOT, prefix* and column filters
+        such as `role: engineer` are supported. Results are ranked by BM25,
+        with matches in the role and company weighted highest.
+        """
+        weights = ", ".join(str(weight) for weight in FTS_WEIGHTS)
+        try:
+            rows = self.connection.execute(f'''
+                SELECT d.* FROM descriptions_fts
+                JOIN descriptions d ON d.id = descriptions_fts.rowid
+                WHERE descriptions_fts MATCH ?
+                ORDER BY bm25(descriptions_fts, {weights})
+                LIMIT ? OFFSET ?
+            ''', (query, limit, offset)).fetchall()
+        except sqlite3.OperationalError as e:
+            raise ValueError(f"Invalid search query {query!r}: {e}")
+        return [_from_row(row) for row in rows]
+
+    def skill_frequency(self, role: Optional[str] = None, since: Optional[float] = None,
+                        limit: int = 20) -> List[Tuple[str, int]]:
+        """
+        Most requested skills as (canonical skill, number of postings).
+
+        `role` keeps postings whose role contains it (case-insensitive) and
+        `since` those saved at or after a Unix timestamp.
+        """
+        where, params = _posting_filters(role, since)
+        rows = self.connection.execute(f'''
+            SELECT s.skill, COUNT(*) AS postings FROM job_skills s
+            JOIN descriptions d ON d.id = s.description_id
+            WHERE {where}
+            GROUP BY s.skill
+            ORDER BY postings DESC, s.skill
+            LIMIT ?
+        ''', (*params, limit)).fetchall()
+        return [(row['skill'], row['postings']) for row in rows]
+
+    def skill_cooccurrence(self, skill: str, role: Optional[str] = None,
+                           since: Optional[float] = None,
+                           limit: int = 20) -> List[Tuple[str, int]]:
+        """
+        Skills most often requested alongside `skill`, as (canonical skill,
+        number of postings asking for both). Filters as in skill_frequency.
+        """
+        where, params = _posting_filters(role, since)
+        rows = self.connection.execute(f'''
+            SELECT other.skill, COUNT(*) AS postings FROM job_skills s
+            JOIN job_skills other
+                ON other.description_id = s.description_id AND other.skill != s.skill
+            JOIN descriptions d ON d.id = s.description_id
+            WHERE s.skill = ? AND {where}
+            GROUP BY other.skill
+            ORDER BY postings DESC, other.skill
+            LIMIT ?
+        ''', (canonical_skill(skill), *params, limit)).fetchall()
+        return [(row['skill'], row['postings']) for row in rows]
+
+    def find_by_skills(self, skills: Iterable[str], match_all: bool = True,
+                       limit: int = 20, offset: int = 0) -> List[JobDescription]:
+        """
+        Postings requiring every one of `skills`, or with `match_all=False`
+        any of them. Postings matching more of the skills come first, then
+        the most recently saved.
+        """
+        wanted = sorted({canonical_skill(skill) for skill in skills} - {""})
+        if not wanted:
+            return []
+        rows = self.connection.execute('''
+            SELECT d.* FROM descriptions d
+            JOIN (
+                SELECT description_id, COUNT(*) AS matched FROM job_skills
+                WHERE skill IN (SELECT value FROM json_each(?))
+                GROUP BY description_id
+                HAVING matched >= ?
+            ) m ON m.description_id = d.id
+            ORDER BY m.matched DESC, d.saved_at DESC, d.id DESC
+            LIMIT ? OFFSET ?
+        ''', (json.dumps(wanted), len(wanted) if match_all else 1, limit, offset)
+        ).fetchall()
+        return [_from_row(row) for row in rows]
+
+
+def _canonical_skills(skills: Iterable[str]) -> List[str]:
+    """Distinct, non-empty canonical names of a posting's skills"""
+    return list(dict.fromkeys(filter(None, map(canonical_skill, skills))))
+
+
+def _posting_filters(role: Optional[str], since: Optional[float]) -> Tuple[str, Tuple]:
+    """SQL conditions on descriptions aliased d, with their parameters"""
+    conditions: List[str] = ["1"]
+    params: List[Any] = []
+    if role:
+        conditions.append("d.role LIKE ? ESCAPE '\\'")
+        escaped = role.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        params.append(f"%{escaped}%")
+    if since is not None:
+        conditions.append("d.saved_at >= ?")
+        params.append(since)
+    return " AND ".join(conditions), tuple(params)
+
+
+def _row_values(job_description: JobDescription) -> Tuple:
+    return (
+        job_description.url,
+        job_description.role,
+        job_description.company,
+        job_description.location,
+        json.dumps(job_description.responsibilities),
+        json.dumps(job_description.requirements.model_dump()),
+        job_description.salary,
+        json.dumps(job_description.benefits),
+        json.dumps(job_description.other_information)
+    )
+
+
+def _from_row(row: sqlite3.Row) -> JobDescription:
+    return JobDescription(
+        url=row['url'],
+        role=row['role'],
+        company=row['company'],
+        location=row['location'],
+        responsibilities=json.loads(row['responsibilities']),
+        requirements=json.loads(row['skills_requirements']),
+        salary=row['salary'],
+        benefits=json.loads(row['benefits']),
+        other_information=json.loads(row['other_information'])
+    )
+
+
+# A queued save: the job descriptions and the future resolved on commit
+_Write = Tuple[List[JobDescription], Future]
+
+
+class AsyncJobDatabase:
+    """
+    Non-blocking access to a JobDatabase from an event loop.
+
+    Reads run on a small thread pool, each thread with its own connection.
+    Saves are queued to a single writer thread that commits everything
+    queued so far in one transaction, so under load many saves share one
+    commit and its fsync. Lookups by URL see saves still awaiting their
+    commit; search and the analytics queries see only committed rows.
+
+    An instance is single-use: once aclose starts, further saves and reads
+    are refused. aclose closes the JobDatabase only when it was created
+    from a path; a JobDatabase passed in just loses the worker threads'
+    connections and can be wrapped in a new instance.
+    """
+
+    def __init__(self, db: Union[JobDatabase, str, Path] = DEFAULT_DB_PATH,
+                 max_batch: int = MAX_WRITE_BATCH, readers: int = 2):
+        self._owns_db = isinstance(db, (str, Path))
+        self.db = JobDatabase(db) if isinstance(db, (str, Path)) else db
+        self.max_batch = max_batch
+        self._readers = ThreadPoolExecutor(readers, thread_name_prefix="yaart-db-read")
+        self._queue: "queue.Queue[Optional[_Write]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._closed = False
+        self._lock = threading.Lock()
+        # Latest queued, uncommitted version of each posting by URL
+        self._pending: Dict[str, JobDescription] = {}
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking call, such as a JobDatabase query, on a reader thread"""
+        return await asyncio.get_running_loop().run_in_executor(
+            self._readers, func, *args
+        )
+
+    async def get_job_description(self, url: str) -> Optional[JobDescription]:
+        with self._lock:
+            pending = self._pending.get(url)
+        if pending is not None:
+            return pending
+        return await self.run(self.db.get_job_description, url)
+
+    async def get_job_descriptions(
+        self, urls: Iterable[str]
+    ) -> Dict[str, JobDescription]:
+        urls = list(urls)
+        with self._lock:
+            pending = {url: self._pending[url] for url in urls if url in self._pending}
+        stored = await self.run(
+            self.db.get_job_descriptions, [url for url in urls if url not in pending]
+        )
+        return {**stored, **pending}
+
+    async def search(self, query: str, limit: int = 20,
+                     offset: int = 0) -> List[JobDescription]:
+        return await self.run(self.db.search, query, limit, offset)
+
+    async def save_job_description(self, job_description: JobDescription) -> None:
+        await self.save_job_descriptions([job_description])
+
+    async def save_job_descriptions(
+        self, job_descriptions: Iterable[JobDescription]
+    ) -> None:
+        """
+        Queue job descriptions for the writer and wait for their commit.
+
+        A cancelled caller stops waiting, but its save is still committed.
+        """
+        await asyncio.shield(asyncio.wrap_future(self._enqueue(list(job_descriptions))))
+
+    async def flush(self) -> None:
+        """Wait until every save queued so far is committed"""
+        await asyncio.shield(asyncio.wrap_future(self._enqueue([])))
+
+    async def aclose(self) -> None:
+        """Commit queued saves, stop the worker threads and close the database"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            writer = self._writer
+        loop = asyncio.get_running_loop()
+        if writer is not None:
+            # Saves are refused from here on, so the sentinel is queued last
+            self._queue.put(None)
+            await loop.run_in_executor(None, writer.join)
+            self._writer = None
+        await loop.run_in_executor(None, self._readers.shutdown)
+        if self._owns_db:
+            self.db.close()
+        else:
+            self.db.close_finished()
+
+    def _enqueue(self, job_descriptions: List[JobDescription]) -> Future:
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("AsyncJobDatabase is closed")
+            for job_description in job_descriptions:
+                self._pending[job_description.url] = job_description
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._write_loop, name="yaart-db-write", daemon=True
                 )
-            return None
\ No newline at end of file
+                self._writer.start()
+            self._queue.put((job_descriptions, future))
+        return future
+
+    def _write_loop(self) -> None:
+        stopping = False
+        while not stopping:
+            write = self._queue.get()
+            if write is None:
+                break
+            batch = [write]
+            while len(batch) < self.max_batch:
+                try:
+                    write = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if write is None:
+                    stopping = True
+                    break
+                batch.append(write)
+            self._commit(batch)
+
+    def _commit(self, batch: List[_Write]) -> None:
+        try:
+            self.db.save_job_descriptions(jd for jds, _ in batch for jd in jds)
+            errors: List[Optional[BaseException]] = [None] * len(batch)
+        except Exception:
+            # Retry one caller at a time so a bad row only fails its own save
+            errors = []
+            for jds, _ in batch:
+                try:
+                    self.db.save_job_descriptions(jds)
+                    errors.append(None)
+                except Exception as e:
+                    errors.append(e)
+        with self._lock:
+            for jds, _ in batch:
+                for jd in jds:
+                    if self._pending.get(jd.url) is jd:
+                        del self._pending[jd.url]
+        for (_, future), error in zip(batch, errors):
+            if error is None:
+                future.set_result(None)
+            else:
+                future.set_exception(error)
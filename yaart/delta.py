@@ -0,0 +1,85 @@
+import re
+from typing import List, Optional
+from yaart.models import Experience, ResumePatch, TailoredResume
+
+BULLET_ID_PATTERN = re.compile(r"^e(\d+)\.b(\d+)$")
+
+
+def role_id(index: int) -> str:
+    return f"e{index}"
+
+
+def bullet_id(role_index: int, index: int) -> str:
+    return f"{role_id(role_index)}.b{index}"
+
+
+def bullet_index(role_index: int, patch_id: str) -> Optional[int]:
+    """Position of a bullet within role `role_index`, or None if the ID
+    is malformed or belongs to another role"""
+    match = BULLET_ID_PATTERN.match(patch_id.strip())
+    if match is None or int(match.group(1)) != role_index:
+        return None
+    return int(match.group(2))
+
+
+def resume_outline(resume: TailoredResume) -> str:
+    """
+    Compact view of a base resume for delta tailoring.
+
+    Experience entries and bullets carry stable IDs derived from their
+    position, which the model's patch refers back to. Contact details,
+    publications and open-source work are left out since they are copied
+    unchanged.
+    """
+    lines = [f"Title: {resume.title}", f"Summary: {resume.summary}", "", "Experience:"]
+    for i, exp in enumerate(resume.experience):
+        lines.append(f"[{role_id(i)}] {exp.title} | {exp.company} | {exp.dates}")
+        lines.extend(
+            f"  [{bullet_id(i, j)}] {bullet}" for j, bullet in enumerate(exp.bullets)
+        )
+    lines += ["", "Skills:"]
+    lines.extend(
+        f"- {group.category}: {', '.join(group.skills)}" for group in resume.skills
+    )
+    lines += ["", "Education:"]
+    lines.extend(
+        f"- {edu.degree} | {edu.institution} | {edu.dates}" for edu in resume.education
+    )
+    return "\n".join(lines)
+
+
+def _patch_bullets(role_index: int, exp: Experience, patch: ResumePatch) -> List[str]:
+    role = next(
+        (role for role in patch.roles if role.id.strip() == role_id(role_index)), None
+    )
+    if role is None:
+        return list(exp.bullets)
+    bullets, seen = [], set()
+    for edit in role.bullets:
+        index = bullet_index(role_index, edit.id)
+        if index is None or index >= len(exp.bullets) or index in seen:
+            continue
+        seen.add(index)
+        bullets.append(edit.text or exp.bullets[index])
+    # A patch that keeps nothing usable leaves the entry as it was
+    return bullets or list(exp.bullets)
+
+
+def apply_patch(base: TailoredResume, patch: ResumePatch) -> TailoredResume:
+    """
+    Assemble a tailored resume from the base resume and the model's patch.
+
+    Header fields, education, publications and open-source work come from
+    the base unchanged, as do entry titles, companies and dates. Edits that
+    refer to unknown IDs are ignored.
+    """
+    experience = [
+        exp.model_copy(update={"bullets": _patch_bullets(i, exp, patch)})
+        for i, exp in enumerate(base.experience)
+    ]
+    return base.model_copy(update={
+        "title": patch.title or base.title,
+        "summary": patch.summary or base.summary,
+        "skills": patch.skills or base.skills,
+        "experience": experience,
+    })
@@ -0,0 +1,323 @@
+import re
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Protocol, Tuple
+from bs4 import BeautifulSoup
+
+DEFAULT_MAX_CHARS = 30_000
+DEFAULT_MAX_INPUT_CHARS = 2_000_000
+# Below this many characters a detected main region is assumed to be a false
+# positive (e.g. an empty <main> shell) and the whole page is used instead
+MIN_MAIN_CHARS = 200
+FEED_CHUNK_SIZE = 64 * 1024
+
+# Elements whose content is never part of a job posting
+SKIP_TAGS = frozenset({
+    "script", "style", "noscript", "template", "svg", "canvas", "iframe",
+    "nav", "footer", "aside", "form", "button", "select", "option", "head",
+})
+VOID_TAGS = frozenset({
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+    "param", "source", "track", "wbr",
+})
+BLOCK_TAGS = frozenset({
+    "address", "article", "blockquote", "br", "dd", "div", "dl", "dt",
+    "fieldset", "figcaption", "figure", "h1", "h2", "h3", "h4", "h5", "h6",
+    "header", "hr", "li", "main", "ol", "p", "pre", "section", "table", "td",
+    "th", "tr", "ul",
+})
+MAIN_TAGS = frozenset({"main", "article"})
+# Elements kept even outside the main region since they usually hold the title
+TITLE_TAGS = frozenset({"title", "h1"})
+
+# Elements dropped when their class or id carries a boilerplate marker.
+# Generic containers are left alone: wrapper classes such as "has-navbar"
+# often enclose the whole page.
+MARKER_SKIP_TAGS = frozenset({"nav", "aside", "footer", "header", "dialog"})
+# Whole class/id tokens marking boilerplate, compared case-insensitively
+BOILERPLATE_MARKERS = frozenset({
+    "cookie-banner", "cookie-consent", "cookies", "consent", "gdpr", "onetrust",
+    "navbar", "navigation", "nav", "menu", "site-header", "global-header",
+    "masthead", "footer", "site-footer", "breadcrumb", "breadcrumbs",
+    "social-share", "share", "newsletter", "subscribe", "sidebar", "skip-link",
+    "modal", "popup",
+})
+# ARIA roles equivalent to the skipped nav, footer, aside and dialog elements
+SKIP_ROLES = frozenset({
+    "navigation", "contentinfo", "complementary", "dialog", "alertdialog",
+})
+MAIN_PATTERN = re.compile(
+    r"job|posting|vacanc|description|(^|[-_ ])content([-_ ]|$)",
+    re.IGNORECASE,
+)
+WHITESPACE = re.compile(r"\s+")
+
+
+@dataclass
+class Extraction:
+    """Text extracted from a page along with size accounting"""
+    text: str
+    input_chars: int
+    output_chars: int
+    truncated: bool = False
+    main_content: bool = False
+
+    @property
+    def reduction(self) -> float:
+        """Fraction of the input removed by extraction"""
+        if not self.input_chars:
+            return 0.0
+        return 1 - self.output_chars / self.input_chars
+
+
+class TextExtractor(Protocol):
+    """Turns raw HTML into the text handed to the job description parser"""
+
+    def extract(self, html: str) -> Extraction:
+        ...
+
+
+class _BlockCollector(HTMLParser):
+    """Streaming parser collecting text blocks tagged with their region"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        # (tag, skip, main, title) for every open element
+        self.stack: List[Tuple[str, bool, bool, bool]] = []
+        self.skip_depth = 0
+        self.main_depth = 0
+        self.title_depth = 0
+        # (text, in_main, is_title) per block
+        self.blocks: List[Tuple[str, bool, bool]] = []
+        self.main_chars = 0
+        self._parts: List[str] = []
+        self._bullet = False
+
+    def _flush(self) -> None:
+        if not self._parts:
+            return
+        text = WHITESPACE.sub(" ", "".join(self._parts)).strip()
+        self._parts = []
+        if text:
+            if self._bullet:
+                text = f"- {text}"
+            in_main = self.main_depth > 0
+            self.blocks.append((text, in_main, self.title_depth > 0))
+            if in_main:
+                self.main_chars += len(text)
+        self._bullet = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag in BLOCK_TAGS:
+            self._flush()
+        if tag in VOID_TAGS:
+            return
+        markers = " ".join(
+            value for name, value in attrs if name in ("id", "class") and value
+        )
+        role = next((value for name, value in attrs if name == "role" and value), "")
+        tokens = set(markers.lower().split())
+        landmark = tag in MAIN_TAGS or role == "main"
+        skip = not landmark and (
+            tag in SKIP_TAGS or role in SKIP_ROLES or
+            (tag in MARKER_SKIP_TAGS and not tokens.isdisjoint(BOILERPLATE_MARKERS))
+        )
+        main = landmark or bool(markers and MAIN_PATTERN.search(markers))
+        title = tag in TITLE_TAGS
+        if landmark and self.skip_depth:
+            # A main region is never dropped with a skipped ancestor, such as
+            # a <form> wrapping the whole page; stop skipping from here on
+            self.stack = [(name, False, inner, heading)
+                          for name, _, inner, heading in self.stack]
+            self.skip_depth = 0
+        self.stack.append((tag, skip, main, title))
+        self.skip_depth += skip
+        self.main_depth += main
+        self.title_depth += title
+        if tag == "li":
+            self._bullet = True
+
+    def handle_endtag(self, tag):
+        if tag in BLOCK_TAGS or tag in TITLE_TAGS:
+            self._flush()
+        # Tolerate unclosed elements by popping up to the matching tag
+        for index in range(len(self.stack) - 1, -1, -1):
+            if self.stack[index][0] == tag:
+                for _, skip, main, title in self.stack[index:]:
+                    self.skip_depth -= skip
+                    self.main_depth -= main
+                    self.title_depth -= title
+                del self.stack[index:]
+                return
+
+    def handle_data(self, data):
+        if self.skip_depth and not self.title_depth:
+            return
+        self._parts.append(data)
+
+    def close(self):
+        super().close()
+        self._flush()
+
+
+class FastTextExtractor:
+    """
+    Streaming extractor built on the standard library HTML tokenizer.
+
+    Drops structural boilerplate (navigation, footers, forms, cookie banners),
+    prefers the main job content region when one can be identified, and stops
+    parsing once the input or output caps are reached.
+    """
+
+    def __init__(
+        self,
+        max_chars: int = DEFAULT_MAX_CHARS,
+        max_input_chars: int = DEFAULT_MAX_INPUT_CHARS,
+        detect_main: bool = True
+    ):
+        self.max_chars = max_chars
+        self.max_input_chars = max_input_chars
+        self.detect_main = detect_main
+
+    def extract(self, html: str) -> Extraction:
+        collector = _BlockCollector()
+        truncated = len(html) > self.max_input_chars
+        end = min(len(html), self.max_input_chars)
+        for start in range(0, end, FEED_CHUNK_SIZE):
+            collector.feed(html[start:min(start + FEED_CHUNK_SIZE, end)])
+            # Enough main content collected; the rest of the page is not needed
+            if collector.main_chars >= self.max_chars:
+                truncated = truncated or start + FEED_CHUNK_SIZE < end
+                break
+        collector.close()
+
+        blocks = collector.blocks
+        use_main = self.detect_main and collector.main_chars >= MIN_MAIN_CHARS
+        if use_main:
+            blocks = [block for block in blocks if block[1] or block[2]]
+        lines = _dedupe_adjacent(text for text, _, _ in blocks)
+        text = "\n".join(lines)
+        if len(text) > self.max_chars:
+            text = text[:self.max_chars].rsplit(" ", 1)[0]
+            truncated = True
+        return Extraction(
+            text=text,
+            input_chars=len(html),
+            output_chars=len(text),
+            truncated=truncated,
+            main_content=use_main
+        )
+
+
+class SoupTextExtractor:
+    """Whole-page text via BeautifulSoup, matching the original scraper output"""
+
+    def __init__(self, max_chars: Optional[int] = None):
+        self.max_chars = max_chars
+
+    def extract(self, html: str) -> Extraction:
+        soup = BeautifulSoup(html, 'html.parser')
+        for script in soup(["script", "style"]):
+            script.decompose()
+        lines = (line.strip() for line in soup.get_text().splitlines())
+        chunks = (phrase.strip() for line in lines for phrase in line.split("  ")) # noqa: E501
+        text = ' '.join(chunk for chunk in chunks if chunk)
+        truncated = self.max_chars is not None and len(text) > self.max_chars
+        if truncated:
+            text = text[:self.max_chars]
+        return Extraction(
+            text=text,
+            input_chars=len(html),
+            output_chars=len(text),
+            truncated=truncated
+        )
+
+
+def _dedupe_adjacent(lines):
+    previous = None
+    for line in lines:
+        if line != previous:
+            yield line
+        previous = line
+
+
+HEADING_TAGS = frozenset({"h1", "h2", "h3", "h4", "h5", "h6", "strong", "b"})
+SECTION_KEYWORDS = (
+    ("benefits", re.compile(
+        r"benefit|perk|what we offer|why join|we offer", re.IGNORECASE)),
+    ("education", re.compile(r"education|degree", re.IGNORECASE)),
+    ("skills", re.compile(r"skill|tech stack|technolog|tools", re.IGNORECASE)),
+    ("experience", re.compile(
+        r"requirement|qualification|what you bring|looking for|about you|"
+        r"you have|you bring|must have|nice to have|bonus|preferred|experience",
+        re.IGNORECASE)),
+    ("responsibilities", re.compile(
+        r"responsib|what you('|’)?ll do|what you will do|the role|your role|"
+        r"day to day|day-to-day|you will|duties|impact|mission",
+        re.IGNORECASE)),
+)
+
+
+class _SectionCollector(HTMLParser):
+    """Collects list items grouped under the most recent heading"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.sections: List[Tuple[str, List[str]]] = []
+        self._heading: List[str] = []
+        self._item: List[str] = []
+        self._in_heading = 0
+        self._in_item = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in HEADING_TAGS and not self._in_item:
+            if not self._in_heading:
+                self._heading = []
+            self._in_heading += 1
+        elif tag == "li":
+            self._in_item += 1
+            self._item = []
+
+    def handle_endtag(self, tag):
+        if tag in HEADING_TAGS and self._in_heading:
+            self._in_heading -= 1
+            heading = WHITESPACE.sub(" ", "".join(self._heading)).strip()
+            if not self._in_heading and heading:
+                self.sections.append((heading.rstrip(":"), []))
+        elif tag == "li" and self._in_item:
+            self._in_item -= 1
+            item = WHITESPACE.sub(" ", "".join(self._item)).strip()
+            if item:
+                if not self.sections:
+                    self.sections.append(("", []))
+                self.sections[-1][1].append(item)
+
+    def handle_data(self, data):
+        if self._in_heading:
+            self._heading.append(data)
+        if self._in_item:
+            self._item.append(data)
+
+
+def classify_heading(heading: str) -> Optional[str]:
+    """Map a section heading onto a JobDescription field name, if recognised"""
+    for field, pattern in SECTION_KEYWORDS:
+        if pattern.search(heading):
+            return field
+    return None
+
+
+def extract_sections(html: str) -> Dict[str, List[str]]:
+    """
+    Group the bulleted lists of a job description by the field their heading
+    describes (responsibilities, skills, experience, education, benefits).
+    """
+    collector = _SectionCollector()
+    collector.feed(html)
+    collector.close()
+    sections: Dict[str, List[str]] = {}
+    for heading, items in collector.sections:
+        field = classify_heading(heading)
+        if field and items:
+            sections.setdefault(field, []).extend(items)
+    return sections
@@ -0,0 +1,276 @@
+"""
+Deterministic stand-in for a chat model, for offline tests and load tests.
+
+FakeChatModel answers every prompt with a payload that validates against
+the JSON schema the prompt asks for (the parser's format instructions, or
+the bound tool in structured-output mode), so the whole pipeline runs
+without network access or API spend. Latency, generation speed and
+failures are simulated from seeded distributions.
+"""
+import asyncio
+import json
+import math
+import random
+import re
+import threading
+import time
+from typing import (
+    Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Sequence
+)
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import Runnable
+from pydantic import BaseModel, PrivateAttr
+from yaart.tokens import CHARS_PER_TOKEN, approximate_tokens
+
+# Seconds to wait for a call, drawn from the call's random generator
+LatencyDistribution = Callable[[random.Random], float]
+
+SCHEMA_BLOCK_PATTERN = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.DOTALL)
+WORDS = (
+    "built", "scaled", "designed", "led", "migrated", "automated", "optimized",
+    "platform", "pipeline", "service", "team", "latency", "reliability", "Python",
+    "Kubernetes", "AWS", "data", "models", "customers", "revenue", "by", "40%",
+    "across", "distributed", "real-time", "analytics", "infrastructure", "APIs",
+)
+# Characters per streamed chunk
+STREAM_CHUNK_CHARS = 4 * CHARS_PER_TOKEN
+
+
+def constant(seconds: float) -> LatencyDistribution:
+    return lambda rng: seconds
+
+
+def uniform(low: float, high: float) -> LatencyDistribution:
+    return lambda rng: rng.uniform(low, high)
+
+
+def lognormal(median: float, sigma: float = 0.5) -> LatencyDistribution:
+    """Right-skewed latency, as observed from hosted model APIs"""
+    return lambda rng: rng.lognormvariate(math.log(median), sigma)
+
+
+class FakeLLMError(RuntimeError):
+    """Injected provider failure"""
+
+
+class FakeRateLimitError(FakeLLMError):
+    """Injected rate-limit (HTTP 429) response"""
+    status_code = 429
+
+
+def schema_payload(schema: Dict[str, Any], rng: random.Random,
+                   defs: Optional[Dict[str, Any]] = None, name: str = "value") -> Any:
+    """Random value that validates against a JSON schema"""
+    defs = schema.get("$defs", defs or {})
+    if "$ref" in schema:
+        return schema_payload(defs[schema["$ref"].split("/")[-1]], rng, defs, name)
+    for combinator in ("anyOf", "oneOf", "allOf"):
+        if combinator in schema:
+            options = [s for s in schema[combinator] if s.get("type") != "null"]
+            return schema_payload(options[0] if options else {}, rng, defs, name)
+    kind = schema.get("type", "object" if "properties" in schema else "string")
+    if kind == "object":
+        properties = schema.get("properties")
+        if properties:
+            return {
+                key: schema_payload(sub, rng, defs, key)
+                for key, sub in properties.items()
+            }
+        values = schema.get("additionalProperties")
+        if isinstance(values, dict):
+            return {f"{name}_{i}": schema_payload(values, rng, defs, name)
+                    for i in range(rng.randint(1, 3))}
+        return {}
+    if kind == "array":
+        return [schema_payload(schema.get("items", {}), rng, defs, name)
+                for _ in range(rng.randint(2, 5))]
+    if kind == "integer":
+        return rng.randint(1, 100)
+    if kind == "number":
+        return round(rng.uniform(1, 100), 2)
+    if kind == "boolean":
+        return rng.random() < 0.5
+    if kind == "null":
+        return None
+    words = [rng.choice(WORDS) for _ in range(rng.randint(3, 14))]
+    return " ".join(words).capitalize()
+
+
+def prompt_schema(text: str) -> Optional[Dict[str, Any]]:
+    """The last JSON schema embedded in a prompt's format instructions"""
+    for block in reversed(SCHEMA_BLOCK_PATTERN.findall(text)):
+        try:
+            schema = json.loads(block)
+        except ValueError:
+            continue
+        if isinstance(schema, dict) and "properties" in schema:
+            return schema
+    return None
+
+
+def _prompt_text(messages: Sequence[BaseMessage]) -> str:
+    parts = []
+    for message in messages:
+        content = message.content
+        if isinstance(content, list):
+            content = "".join(
+                part if isinstance(part, str) else part.get("text", "")
+                for part in content
+            )
+        parts.append(content)
+    return "\n".join(parts)
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Chat model returning schema-valid payloads with simulated timing.
+
+    The payload depends only on `seed` and the prompt, so runs are
+    reproducible regardless of concurrency. Each call waits `latency`
+    (time to first token) plus the output tokens at `tokens_per_second`,
+    and fails with probability `rate_limit_rate` (FakeRateLimitError) or
+    `error_rate` (FakeLLMError); a retried prompt draws again.
+    """
+    seed: int = 0
+    latency: LatencyDistribution = constant(0.0)
+    tokens_per_second: Optional[float] = None
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+
+    _attempts: Dict[str, int] = PrivateAttr(default_factory=dict)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    @property
+    def _llm_type(self) -> str:
+        return "yaart-fake"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"seed": self.seed}
+
+    def bind_tools(self, tools: Sequence[Any], *, tool_choice: Optional[str] = None,
+                   **kwargs: Any) -> Runnable:
+        return self.bind(tools=list(tools), tool_choice=tool_choice, **kwargs)
+
+    def _plan(self, messages: List[BaseMessage],
+              tools: Optional[List[Any]]) -> "_Call":
+        """Decide the reply, timing and outcome of one call"""
+        text = _prompt_text(messages)
+        with self._lock:
+            attempt = self._attempts.get(text, 0)
+            self._attempts[text] = attempt + 1
+        rng = random.Random(f"{self.seed}:{text}")
+        call_rng = random.Random(f"{self.seed}:{text}:{attempt}")
+        tool = tools[0] if tools else None
+        if isinstance(tool, type) and issubclass(tool, BaseModel):
+            args = schema_payload(tool.model_json_schema(), rng)
+            message = AIMessage(content="", tool_calls=[{
+                "name": tool.__name__, "args": args, "id": f"call_{attempt}",
+            }])
+            output = json.dumps(args)
+        else:
+            schema = prompt_schema(text)
+            output = json.dumps(schema_payload(schema, rng) if schema else {})
+            message = AIMessage(content=output)
+        input_tokens = approximate_tokens(text)
+        output_tokens = approximate_tokens(output)
+        message.usage_metadata = {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        }
+        draw = call_rng.random()
+        error: Optional[FakeLLMError] = None
+        if draw < self.rate_limit_rate:
+            error = FakeRateLimitError("Rate limit exceeded (injected)")
+        elif draw < self.rate_limit_rate + self.error_rate:
+            error = FakeLLMError("Provider error (injected)")
+        generation = 0.0
+        if self.tokens_per_second:
+            generation = output_tokens / self.tokens_per_second
+        first_token = max(self.latency(call_rng), 0.0)
+        return _Call(message, output, first_token, generation, error)
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Optional[CallbackManagerForLLMRun] = None,
+                  **kwargs: Any) -> ChatResult:
+        call = self._plan(messages, kwargs.get("tools"))
+        time.sleep(call.first_token)
+        if call.error is not None:
+            raise call.error
+        time.sleep(call.generation)
+        return ChatResult(generations=[ChatGeneration(message=call.message)])
+
+    async def _agenerate(self, messages: List[BaseMessage],
+                         stop: Optional[List[str]] = None,
+                         run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+                         **kwargs: Any) -> ChatResult:
+        call = self._plan(messages, kwargs.get("tools"))
+        await asyncio.sleep(call.first_token)
+        if call.error is not None:
+            raise call.error
+        await asyncio.sleep(call.generation)
+        return ChatResult(generations=[ChatGeneration(message=call.message)])
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager: Optional[CallbackManagerForLLMRun] = None,
+                **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        call = self._plan(messages, kwargs.get("tools"))
+        time.sleep(call.first_token)
+        if call.error is not None:
+            raise call.error
+        for chunk, delay in call.chunks():
+            time.sleep(delay)
+            yield chunk
+
+    async def _astream(self, messages: List[BaseMessage],
+                       stop: Optional[List[str]] = None,
+                       run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+                       **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        call = self._plan(messages, kwargs.get("tools"))
+        await asyncio.sleep(call.first_token)
+        if call.error is not None:
+            raise call.error
+        for chunk, delay in call.chunks():
+            await asyncio.sleep(delay)
+            yield chunk
+
+
+class _Call:
+    """The precomputed outcome of one fake model call"""
+
+    def __init__(self, message: AIMessage, output: str, first_token: float,
+                 generation: float, error: Optional[FakeLLMError]):
+        self.message = message
+        self.output = output
+        self.first_token = first_token
+        self.generation = generation
+        self.error = error
+
+    def chunks(self) -> Iterator[Any]:
+        """(chunk, delay before it) pairs spreading generation over the output"""
+        pieces = [
+            self.output[i:i + STREAM_CHUNK_CHARS]
+            for i in range(0, len(self.output), STREAM_CHUNK_CHARS)
+        ] or [""]
+        delay = self.generation / len(pieces)
+        tool_calls = self.message.tool_calls
+        for index, piece in enumerate(pieces):
+            if tool_calls:
+                chunk = AIMessageChunk(content="", tool_call_chunks=[{
+                    "name": tool_calls[0]["name"] if index == 0 else None,
+                    "args": piece,
+                    "id": tool_calls[0]["id"] if index == 0 else None,
+                    "index": 0,
+                }])
+            else:
+                chunk = AIMessageChunk(content=piece)
+            if index == len(pieces) - 1:
+                chunk.usage_metadata = self.message.usage_metadata
+            yield ChatGenerationChunk(message=chunk), delay
@@ -0,0 +1,87 @@
+import hashlib
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, Optional, Union
+
+import httpx
+from yaart.urls import canonicalize_url
+
+
+@dataclass
+class CachedResponse:
+    """A stored page body along with the validators needed to revalidate it"""
+    url: str
+    body: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fetched_at: float = 0.0
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers for a conditional GET against this entry"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def cache_key(url: str, canonicalize: Callable[[str], str] = canonicalize_url) -> str:
+    """Hash of the canonical form of a URL"""
+    return hashlib.sha256(canonicalize(url).encode("utf-8")).hexdigest()
+
+
+class HTTPCache:
+    """
+    On-disk cache of fetched pages, one JSON file per URL.
+
+    Entries are keyed by `canonicalize`, which should match the one used for
+    the job database so both agree on which URLs are the same page.
+    """
+
+    def __init__(self, directory: Union[str, Path],
+                 canonicalize: Callable[[str], str] = canonicalize_url):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.canonicalize = canonicalize
+
+    def _path(self, url: str) -> Path:
+        return self.directory / f"{cache_key(url, self.canonicalize)}.json"
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """Return the cached entry for a URL, if any"""
+        path = self._path(url)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            return CachedResponse(**data)
+        except FileNotFoundError:
+            return None
+        except (ValueError, TypeError):
+            # Corrupt or outdated entry; treat as a miss
+            path.unlink(missing_ok=True)
+            return None
+
+    def set(self, entry: CachedResponse) -> None:
+        """Store an entry, replacing any previous version atomically"""
+        path = self._path(entry.url)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(asdict(entry)), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def store_response(self, url: str, response: httpx.Response) -> CachedResponse:
+        """Cache a successful response together with its validators"""
+        entry = CachedResponse(
+            url=url,
+            body=response.text,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            fetched_at=time.time()
+        )
+        self.set(entry)
+        return entry
+
+    def delete(self, url: str) -> None:
+        self._path(url).unlink(missing_ok=True)
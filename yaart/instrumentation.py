@@ -0,0 +1,177 @@
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Protocol
+
+logger = logging.getLogger("yaart")
+
+# Pipeline stages reported as spans
+STAGES = (
+    "scrape", "extract", "parse_jd", "parse_resume", "tailor", "repair",
+    "render_markdown", "render_pdf",
+)
+# "status" attribute of spans whose block was cancelled or closed early
+CANCELLED = "cancelled"
+
+
+@dataclass
+class Event:
+    """
+    A structured instrumentation record.
+
+    Spans (one per pipeline stage run) carry a `duration` in seconds and the
+    `error` raised inside them, if any. A span whose block was cancelled or
+    closed early is not an error; it gets a "status" attribute of
+    "cancelled" instead. Point events such as "token_usage" and "cache" have
+    no duration.
+    """
+    name: str
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    timestamp: float = 0.0
+    duration: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def is_span(self) -> bool:
+        return self.duration is not None
+
+
+class EventSink(Protocol):
+    def emit(self, event: Event) -> None:
+        ...
+
+
+class Instrumentation:
+    """
+    Fans events out to pluggable sinks.
+
+    With no sinks attached every call is a cheap no-op, so components can
+    be instrumented unconditionally.
+    """
+
+    def __init__(self, sinks: Optional[Iterable[EventSink]] = None):
+        self.sinks: List[EventSink] = list(sinks or [])
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.sinks)
+
+    def add_sink(self, sink: EventSink) -> None:
+        self.sinks.append(sink)
+
+    def emit(self, name: str, **attributes: Any) -> None:
+        """Emit a point event"""
+        if self.sinks:
+            self._dispatch(Event(name, attributes, time.time()))
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Dict[str, Any]]:
+        """
+        Time the enclosed block and emit it as a span.
+
+        Yields the span's attribute dict so the block can add details, such
+        as which path produced a result, before the span is emitted.
+        """
+        if not self.sinks:
+            yield attributes
+            return
+        timestamp = time.time()
+        start = time.perf_counter()
+        error = None
+        try:
+            yield attributes
+        except (asyncio.CancelledError, GeneratorExit):
+            attributes["status"] = CANCELLED
+            raise
+        except BaseException as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            self._dispatch(Event(
+                name, attributes, timestamp, time.perf_counter() - start, error
+            ))
+
+    def _dispatch(self, event: Event) -> None:
+        for sink in self.sinks:
+            try:
+                sink.emit(event)
+            except Exception:
+                # A broken sink must never fail the pipeline
+                logger.exception("Instrumentation sink %r failed", sink)
+
+
+class MemorySink:
+    """Keeps events in a list; useful in tests and notebooks"""
+
+    def __init__(self):
+        self.events: List[Event] = []
+
+    def emit(self, event: Event) -> None:
+        self.events.append(event)
+
+    def named(self, name: str) -> List[Event]:
+        return [event for event in self.events if event.name == name]
+
+    def clear(self) -> None:
+        self.events.clear()
+
+
+class LoggingSink:
+    """Writes one log record per event, with the event attached as `event`"""
+
+    def __init__(self, logger: logging.Logger = logger, level: int = logging.INFO):
+        self.logger = logger
+        self.level = level
+
+    def emit(self, event: Event) -> None:
+        if not self.logger.isEnabledFor(self.level):
+            return
+        details = " ".join(f"{key}={value}" for key, value in event.attributes.items())
+        if event.duration is not None:
+            self.logger.log(
+                self.level, "%s took %.1fms%s %s", event.name,
+                event.duration * 1000, f" ({event.error})" if event.error else "",
+                details, extra={"event": event}
+            )
+        else:
+            self.logger.log(self.level, "%s %s", event.name, details,
+                            extra={"event": event})
+
+
+class OpenTelemetrySink:
+    """
+    Exports spans and events through OpenTelemetry.
+
+    Needs the optional `opentelemetry-api` package. Spans are recorded with
+    their measured start and end times; point events become zero-length
+    spans.
+    """
+
+    def __init__(self, tracer: Any = None):
+        if tracer is None:
+            try:
+                from opentelemetry import trace  # type: ignore[import-not-found]
+            except ImportError:
+                raise ImportError(
+                    "OpenTelemetrySink requires `pip install opentelemetry-api`"
+                )
+            tracer = trace.get_tracer("yaart")
+        self.tracer = tracer
+
+    def emit(self, event: Event) -> None:
+        start = int(event.timestamp * 1e9)
+        end = start + int((event.duration or 0) * 1e9)
+        span = self.tracer.start_span(
+            f"yaart.{event.name}",
+            start_time=start,
+            attributes={
+                key: value if isinstance(value, (bool, int, float, str)) else str(value)
+                for key, value in event.attributes.items()
+                if value is not None
+            }
+        )
+        if event.error:
+            span.set_attribute("error", event.error)
+        span.end(end_time=end)
@@ -0,0 +1,243 @@
+import html as html_lib
+import json
+import re
+from typing import Any, Dict, Iterator, List, Optional
+from yaart.extract import FastTextExtractor, extract_sections
+from yaart.models import JobDescription, JobRequirements
+
+JSON_LD_PATTERN = re.compile(
+    r"<script[^>]*type\s*=\s*[\"']?application/ld\+json[\"']?[^>]*>(.*?)</script>",
+    re.IGNORECASE | re.DOTALL,
+)
+# A posting with all of these can be used without asking the LLM; any one of
+# skills, experience or education satisfies "requirements"
+REQUIRED_FIELDS = ("role", "company", "location", "responsibilities", "requirements")
+
+_description_extractor = FastTextExtractor(detect_main=False)
+
+
+def _iter_nodes(data: Any) -> Iterator[Dict[str, Any]]:
+    """Walk JSON-LD documents, including lists and @graph containers"""
+    if isinstance(data, list):
+        for item in data:
+            yield from _iter_nodes(item)
+    elif isinstance(data, dict):
+        yield data
+        if "@graph" in data:
+            yield from _iter_nodes(data["@graph"])
+
+
+def _is_job_posting(node: Dict[str, Any]) -> bool:
+    types = node.get("@type")
+    if isinstance(types, str):
+        types = [types]
+    return isinstance(types, list) and "JobPosting" in types
+
+
+def find_job_posting(page_html: str) -> Optional[Dict[str, Any]]:
+    """Return the first schema.org JobPosting embedded as JSON-LD, if any"""
+    for match in JSON_LD_PATTERN.finditer(page_html):
+        try:
+            data = json.loads(match.group(1).strip(), strict=False)
+        except ValueError:
+            continue
+        for node in _iter_nodes(data):
+            if _is_job_posting(node):
+                return node
+    return None
+
+
+def unescape_html(value: Any) -> str:
+    """Raw HTML from a value that may be entity-escaped"""
+    value = "" if value is None else str(value)
+    return html_lib.unescape(value) if "&lt;" in value else value
+
+
+def _text(value: Any) -> str:
+    """Plain text from a JSON-LD value that may contain (escaped) HTML"""
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        # e.g. employmentType: ["FULL_TIME", "CONTRACTOR"]
+        return ", ".join(filter(None, map(_text, value)))
+    if isinstance(value, dict):
+        value = value.get("name") or value.get("value") or ""
+    value = unescape_html(value)
+    if "<" in value:
+        return _description_extractor.extract(value).text
+    return html_lib.unescape(value).strip()
+
+
+def _lines(value: Any) -> List[str]:
+    """Split a JSON-LD text or list value into individual items"""
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [line for item in value for line in _lines(item)]
+    if isinstance(value, dict):
+        if "monthsOfExperience" in value:
+            months = value["monthsOfExperience"]
+            return [f"{months} months of experience"]
+        value = value.get("credentialCategory") or value.get("name") \
+            or value.get("description")
+    return [
+        line.lstrip("-*• ").strip()
+        for line in _text(value).splitlines()
+        if line.lstrip("-*• ").strip()
+    ]
+
+
+def _location(posting: Dict[str, Any]) -> str:
+    locations = []
+    places = posting.get("jobLocation") or []
+    for place in places if isinstance(places, list) else [places]:
+        if isinstance(place, str):
+            locations.append(place)
+            continue
+        address = place.get("address") if isinstance(place, dict) else None
+        if isinstance(address, str):
+            locations.append(address)
+        elif isinstance(address, dict):
+            country = address.get("addressCountry")
+            if isinstance(country, dict):
+                country = country.get("name")
+            parts = [
+                address.get("addressLocality"),
+                address.get("addressRegion"),
+                country,
+            ]
+            text = ", ".join(str(part) for part in parts if part)
+            if text:
+                locations.append(text)
+    location_types = posting.get("jobLocationType")
+    if isinstance(location_types, str):
+        location_types = [location_types]
+    if isinstance(location_types, list) and "TELECOMMUTE" in location_types:
+        locations.insert(0, "Remote")
+    return "; ".join(dict.fromkeys(locations))
+
+
+def _salary(posting: Dict[str, Any]) -> Optional[str]:
+    salary = posting.get("baseSalary") or posting.get("estimatedSalary")
+    if isinstance(salary, list):
+        salary = salary[0] if salary else None
+    if salary is None:
+        return None
+    if not isinstance(salary, dict):
+        return str(salary)
+    currency = salary.get("currency", "")
+    value = salary.get("value")
+    if not isinstance(value, dict):
+        return f"{currency} {value}".strip() if value is not None else None
+    low = value.get("minValue", value.get("value"))
+    high = value.get("maxValue")
+    amount = f"{low:,}" if isinstance(low, (int, float)) else str(low or "")
+    if high is not None and high != low:
+        upper = f"{high:,}" if isinstance(high, (int, float)) else str(high)
+        amount = f"{amount}-{upper}" if amount else upper
+    unit = value.get("unitText")
+    text = f"{currency} {amount}".strip()
+    return f"{text} per {str(unit).lower()}" if unit else text or None
+
+
+def map_job_posting(posting: Dict[str, Any], url: str) -> Dict[str, Any]:
+    """
+    Map a schema.org JobPosting onto JobDescription fields.
+
+    Returns the fields that could be filled; `description` holds the posting
+    body as text for any fields that still need the LLM.
+    """
+    organization = posting.get("hiringOrganization")
+    description = unescape_html(posting.get("description"))
+    other_information = {
+        key: _text(posting[field])
+        for key, field in (
+            ("employment_type", "employmentType"),
+            ("date_posted", "datePosted"),
+            ("valid_through", "validThrough"),
+            ("industry", "industry"),
+        )
+        if posting.get(field)
+    }
+    fields = {
+        "url": url,
+        "role": _text(posting.get("title")),
+        "company": _text(organization),
+        "location": _location(posting),
+        "responsibilities": _lines(posting.get("responsibilities")),
+        "requirements": {
+            "skills": _lines(posting.get("skills")),
+            "experience": _lines(posting.get("experienceRequirements"))
+            + _lines(posting.get("qualifications")),
+            "education": _lines(posting.get("educationRequirements")),
+        },
+        "salary": _salary(posting),
+        "benefits": _lines(posting.get("jobBenefits")),
+        "other_information": other_information,
+        "description": _text(description),
+    }
+    return fill_from_sections(fields, description)
+
+
+def fill_from_sections(fields: Dict[str, Any], description: str) -> Dict[str, Any]:
+    """Fill empty list fields from headed bullet lists in the description HTML"""
+    if not description:
+        return fields
+    sections = extract_sections(description)
+    for name in ("responsibilities", "benefits"):
+        if not fields[name]:
+            fields[name] = sections.get(name, [])
+    for name in ("skills", "experience", "education"):
+        if not fields["requirements"][name]:
+            fields["requirements"][name] = sections.get(name, [])
+    return fields
+
+
+def missing_fields(fields: Dict[str, Any]) -> List[str]:
+    """Required JobDescription fields the structured data did not provide"""
+    values = dict(fields, requirements=any(fields["requirements"].values()))
+    return [name for name in REQUIRED_FIELDS if not values.get(name)]
+
+
+def to_job_description(fields: Dict[str, Any]) -> JobDescription:
+    """Build a JobDescription directly from complete structured fields"""
+    data = {key: value for key, value in fields.items() if key != "description"}
+    return JobDescription(**data)
+
+
+def describe_for_llm(fields: Dict[str, Any]) -> str:
+    """Compact text for the LLM: known header fields plus the posting body"""
+    header = [
+        f"{label}: {fields[key]}"
+        for label, key in (
+            ("Title", "role"),
+            ("Company", "company"),
+            ("Location", "location"),
+            ("Salary", "salary"),
+        )
+        if fields.get(key)
+    ]
+    return "\n".join(header + ["", fields.get("description", "")]).strip()
+
+
+def merge_job_description(
+    fields: Dict[str, Any],
+    parsed: JobDescription
+) -> JobDescription:
+    """Fill gaps in the structured fields with values parsed by the LLM"""
+    requirements = {
+        name: fields["requirements"][name] or getattr(parsed.requirements, name)
+        for name in ("skills", "experience", "education")
+    }
+    return JobDescription(
+        url=fields["url"],
+        role=fields["role"] or parsed.role,
+        company=fields["company"] or parsed.company,
+        location=fields["location"] or parsed.location,
+        responsibilities=fields["responsibilities"] or parsed.responsibilities,
+        requirements=JobRequirements(**requirements),
+        salary=fields["salary"] or parsed.salary,
+        benefits=fields["benefits"] or parsed.benefits,
+        other_information={**parsed.other_information,
+                           **fields["other_information"]},
+    )
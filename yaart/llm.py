@@ -1,82 +1,1143 @@
-from typing import Optional
+import asyncio
+import json
+from dataclasses import asdict
+from pathlib import Path
+from typing import (
+    Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple, Type, Union
+)
 from langchain.output_parsers import PydanticOutputParser
 from langchain.prompts import PromptTemplate
+from langchain_anthropic import ChatAnthropic
 from langchain_openai import ChatOpenAI
 from langchain.base_language import BaseLanguageModel
-from pydantic import SecretStr
-from yaart.models import JobDescription, TailoredResume
-from yaart.prompts import PARSE_JD_PROMPT, TAILOR_RESUME_PROMPT
-import json
+from langchain_core.exceptions import OutputParserException
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import SystemMessage
+from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.prompts import ChatPromptTemplate, HumanMessagePromptTemplate
+from langchain_core.runnables import (
+    Runnable, RunnableConfig, RunnableLambda, RunnableParallel
+)
+from pydantic import BaseModel, SecretStr, ValidationError
+from yaart.models import (
+    Experience, JobDescription, ResumePatch, ResumeProfile, SkillsSection,
+    TailoredResume
+)
+from yaart.prompts import (
+    PARSE_JD_PROMPT,
+    PARSE_RESUME_PROMPT,
+    REPAIR_FIELDS_PROMPT,
+    STRUCTURED_OUTPUT_INSTRUCTIONS,
+    TAILOR_EXPERIENCE_PROMPT,
+    TAILOR_PATCH_PROMPT,
+    TAILOR_PROFILE_PROMPT,
+    TAILOR_RESUME_INSTRUCTIONS,
+    TAILOR_RESUME_LAYERS,
+    TAILOR_SKILLS_PROMPT,
+)
+from yaart.base_resume import BaseResumeCache, compact_resume, compact_role, resume_hash
+from yaart.delta import apply_patch, resume_outline
+from yaart.instrumentation import Instrumentation
+from yaart.llm_cache import BYPASS_CACHE, CachedLLM, LLMCache
+from yaart.sections import reconcile_skills, resume_skills, split_roles
+from yaart.streaming import ResumeSection, ResumeSectionStream
+from yaart.structured import (
+    ToolCallOutputParser,
+    apply_repairs,
+    describe_invalid_fields,
+    invalid_fields,
+    load_payload,
+)
+from yaart.tokens import (
+    TokenCounter, TokenUsage, TokenUsageHandler, TokenUsageTracker, compress_text
+)
+
+# Parsers are stateless, so every assistant shares the same instances
+JD_PARSER = PydanticOutputParser(pydantic_object=JobDescription)
+RESUME_PARSER = PydanticOutputParser(pydantic_object=TailoredResume)
+PROFILE_PARSER = PydanticOutputParser(pydantic_object=ResumeProfile)
+SKILLS_PARSER = PydanticOutputParser(pydantic_object=SkillsSection)
+EXPERIENCE_PARSER = PydanticOutputParser(pydantic_object=Experience)
+PATCH_PARSER = PydanticOutputParser(pydantic_object=ResumePatch)
+
+# Upper bound on the rendered parse_jd prompt; longer postings are compressed
+DEFAULT_MAX_INPUT_TOKENS = 12_000
+# Parsed base resumes kept in memory, by hash of the markdown
+MAX_PARSED_RESUMES = 8
+
+# Base resume markdown, or a resume already extracted with parse_resume, which
+# is sent in its smaller compact form
+ResumeInput = Union[str, TailoredResume]
+
+# Compiled prompts keyed by (template, id(parser)); the parser is kept in the
+# value so a recycled id can never match a different parser
+_PROMPT_CACHE: Dict[Tuple[str, int], Tuple[Any, PromptTemplate]] = {}
+_LAYERED_PROMPT_CACHE: Dict[
+    Tuple[str, Tuple[str, ...], int, bool], Tuple[Any, ChatPromptTemplate]
+] = {}
+
+# Anthropic caches the prompt prefix up to each block carrying this marker
+CACHE_CONTROL = {"type": "ephemeral"}
+
+
+def compile_prompt(template: str, input_variables: list, parser: Any) -> PromptTemplate:
+    """
+    Build a prompt with the parser's format instructions baked in.
+
+    Rendering the format instructions serializes the whole Pydantic JSON
+    schema, so compiled prompts are cached and shared between assistants.
+    """
+    key = (template, id(parser))
+    cached = _PROMPT_CACHE.get(key)
+    if cached is not None and cached[0] is parser:
+        return cached[1]
+    prompt = PromptTemplate(
+        template=template,
+        input_variables=input_variables,
+        partial_variables={
+            "format_instructions": parser.get_format_instructions()
+            }
+    )
+    _PROMPT_CACHE[key] = (parser, prompt)
+    return prompt
+
+
+def layered_prompt(instructions: str, layers: Sequence[str],
+                   format_instructions: str,
+                   cache_control: bool = False) -> ChatPromptTemplate:
+    """
+    Chat prompt laid out for provider prompt-prefix caching.
+
+    The instructions and output schema form the system message and each
+    layer becomes a content block of the user message, so layers should go
+    from least to most frequently changing. With `cache_control`, cache
+    breakpoints close the system message and every layer but the last.
+    """
+    marker = {"cache_control": CACHE_CONTROL} if cache_control else {}
+    system = SystemMessage(content=[{
+        "type": "text",
+        "text": instructions.format(format_instructions=format_instructions),
+        **marker,
+    }])
+    blocks: List[Any] = [
+        {"type": "text", "text": layer, **(marker if i < len(layers) - 1 else {})}
+        for i, layer in enumerate(layers)
+    ]
+    return ChatPromptTemplate.from_messages([
+        system, HumanMessagePromptTemplate.from_template(blocks)
+    ])
+
+
+def compile_layered_prompt(instructions: str, layers: Sequence[str], parser: Any,
+                           cache_control: bool = False) -> ChatPromptTemplate:
+    """layered_prompt with the parser's format instructions, cached like
+    compile_prompt"""
+    key = (instructions, tuple(layers), id(parser), cache_control)
+    cached = _LAYERED_PROMPT_CACHE.get(key)
+    if cached is not None and cached[0] is parser:
+        return cached[1]
+    prompt = layered_prompt(
+        instructions, layers, parser.get_format_instructions(), cache_control
+    )
+    _LAYERED_PROMPT_CACHE[key] = (parser, prompt)
+    return prompt
+
+
+def supports_cache_control(llm: Any) -> bool:
+    """Whether the provider honours cache_control markers; others (e.g.
+    OpenAI) cache common prefixes automatically"""
+    return isinstance(llm, ChatAnthropic)
+
+
+def output_text(result: Any) -> str:
+    """Text of an LLM result, whether a chat message, a dict or a string"""
+    if isinstance(result, str):
+        return result
+    content = getattr(result, "content", None)
+    if not content:
+        # Native structured output arrives as tool call arguments
+        tool_call_chunks = getattr(result, "tool_call_chunks", None)
+        if tool_call_chunks:
+            return "".join(chunk.get("args") or "" for chunk in tool_call_chunks)
+        tool_calls = getattr(result, "tool_calls", None)
+        if tool_calls:
+            return json.dumps(tool_calls[0]["args"])
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(
+            part if isinstance(part, str) else part.get("text", "")
+            for part in content
+        )
+    if isinstance(result, dict):
+        return result.get("text", "{}")
+    raise ValueError(f"Unsupported LLM output type: {type(result).__name__}")
+
+
+def _role_inputs(inputs: Dict[str, Any]) -> List[Dict[str, str]]:
+    return [
+        {"role": role, "job_description": inputs["job_description"]}
+        for role in inputs["roles"]
+    ]
+
 
 class ResumeAssistant:
-    def __init__(self, llm: Optional[BaseLanguageModel] = None, 
-                 api_key: Optional[SecretStr] = None):
+    def __init__(self, llm: Optional[BaseLanguageModel] = None,
+                 api_key: Optional[SecretStr] = None,
+                 cache: Optional[Union[LLMCache, str, Path]] = None,
+                 max_input_tokens: Optional[int] = DEFAULT_MAX_INPUT_TOKENS,
+                 instrumentation: Optional[Instrumentation] = None,
+                 structured_output: bool = False,
+                 max_repairs: int = 1,
+                 parallel_sections: bool = False,
+                 delta_tailoring: bool = False,
+                 resume_cache: Optional[Union[BaseResumeCache, str, Path]] = None):
+        self._chains: Dict[str, Runnable] = {}
+        self._prompt_sizes: Dict[str, int] = {}
+        self._structured_output = structured_output
+        self.max_repairs = max_repairs
+        self.parallel_sections = parallel_sections
+        self.delta_tailoring = delta_tailoring
+        self.max_input_tokens = max_input_tokens
+        self.instrumentation = instrumentation or Instrumentation()
+        self.token_usage = TokenUsageTracker()
+        self.token_usage.listeners.append(self._emit_token_usage)
+        if cache is not None and not isinstance(cache, LLMCache):
+            cache = LLMCache(cache)
+        self._cache = cache
+        if resume_cache is not None and not isinstance(resume_cache, BaseResumeCache):
+            resume_cache = BaseResumeCache(resume_cache)
+        self.resume_cache = resume_cache
+        self._parsed_resumes: Dict[str, TailoredResume] = {}
         if llm:
             self.llm = llm
         elif api_key:
             self.llm = ChatOpenAI(temperature=0.2, model="gpt-4o", api_key=api_key)
         else:
             raise ValueError("Either llm or api_key must be provided")
-        self.jd_parser = PydanticOutputParser(pydantic_object=JobDescription)
-        self.resume_parser = PydanticOutputParser(pydantic_object=TailoredResume)
+        self.jd_parser = JD_PARSER
+        self.resume_parser = RESUME_PARSER
 
-    def parse_jd(self, text: str, url: str) -> JobDescription:
-        """Parse job description text into structured format"""
-        prompt = PromptTemplate(
-            template=PARSE_JD_PROMPT,
-            input_variables=["text"],
+    # Chains are compiled on first use and rebuilt only when a component changes
+    @property
+    def llm(self) -> BaseLanguageModel:
+        return self._llm
+
+    @llm.setter
+    def llm(self, llm: BaseLanguageModel) -> None:
+        self._llm = llm
+        self._chains.clear()
+        self._prompt_sizes.clear()
+        self.token_counter = TokenCounter.for_llm(llm)
+
+    @property
+    def cache(self) -> Optional[LLMCache]:
+        return self._cache
+
+    @cache.setter
+    def cache(self, cache: Optional[LLMCache]) -> None:
+        self._cache = cache
+        self._chains.clear()
+
+    @property
+    def structured_output(self) -> bool:
+        return self._structured_output
+
+    @structured_output.setter
+    def structured_output(self, enabled: bool) -> None:
+        self._structured_output = enabled
+        self._chains.clear()
+
+    @property
+    def cached_llm(self) -> Runnable:
+        """The model, wrapped with the response cache when one is configured"""
+        return self._cached(self.llm)
+
+    def _cached(self, model: Runnable) -> Runnable:
+        if self.cache is None:
+            return model
+        return CachedLLM(model, self.cache, self.instrumentation)
+
+    def _structured_model(self, schema: Type[BaseModel]) -> Optional[Runnable]:
+        """
+        The model bound to a tool whose arguments follow `schema`, or None
+        when structured output is off or the provider has no tool calling.
+        """
+        if not self.structured_output or not isinstance(self.llm, BaseChatModel):
+            return None
+        try:
+            return self.llm.bind_tools([schema], tool_choice=schema.__name__)
+        except NotImplementedError:
+            return None
+
+    def _structured_prompt(self, template: str, input_variables: list,
+                           schema: Type[BaseModel]) -> PromptTemplate:
+        return PromptTemplate(
+            template=template,
+            input_variables=input_variables,
             partial_variables={
-                "format_instructions": self.jd_parser.get_format_instructions()
-                }
+                "format_instructions":
+                    STRUCTURED_OUTPUT_INSTRUCTIONS.format(tool=schema.__name__)
+            }
         )
 
+    def _emit_token_usage(self, usage: TokenUsage) -> None:
+        self.instrumentation.emit("token_usage", **asdict(usage))
+
+    def _run_config(self, use_cache: bool,
+                    handler: Optional[TokenUsageHandler] = None,
+                    max_concurrency: Optional[int] = None) -> RunnableConfig:
+        config = RunnableConfig()
+        if not use_cache:
+            config["configurable"] = {BYPASS_CACHE: True}
+        if handler is not None:
+            config["callbacks"] = [handler]
+        if max_concurrency is not None:
+            config["max_concurrency"] = max_concurrency
+        return config
+
+    @property
+    def jd_parser(self) -> PydanticOutputParser:
+        return self._jd_parser
+
+    @jd_parser.setter
+    def jd_parser(self, parser: PydanticOutputParser) -> None:
+        self._jd_parser = parser
+        self._chains.pop("parse_jd", None)
+        self._prompt_sizes.pop("parse_jd", None)
+
+    @property
+    def resume_parser(self) -> PydanticOutputParser:
+        return self._resume_parser
+
+    @resume_parser.setter
+    def resume_parser(self, parser: PydanticOutputParser) -> None:
+        self._resume_parser = parser
+        self._chains.pop("tailor_resume", None)
+        self._prompt_sizes.pop("tailor_resume", None)
+
+    @property
+    def parse_jd_chain(self) -> Runnable:
+        """prompt | llm | parser chain for job descriptions"""
+        if "parse_jd" not in self._chains:
+            model = self._structured_model(JobDescription)
+            if model is None:
+                prompt = compile_prompt(PARSE_JD_PROMPT, ["text"], self.jd_parser)
+                chain = prompt | self.cached_llm | self.jd_parser
+            else:
+                prompt = self._structured_prompt(
+                    PARSE_JD_PROMPT, ["text"], JobDescription
+                )
+                chain = prompt | self._cached(model) | ToolCallOutputParser(
+                    pydantic_object=JobDescription
+                )
+            self._chains["parse_jd"] = chain
+        return self._chains["parse_jd"]
+
+    def _schema_chain(self, template: str, input_variables: list, parser: Any,
+                      schema: Type[BaseModel]) -> Runnable:
+        """prompt | llm chain whose output follows schema; parsed separately"""
+        model = self._structured_model(schema)
+        if model is None:
+            prompt = compile_prompt(template, input_variables, parser)
+            return prompt | self.cached_llm
+        prompt = self._structured_prompt(template, input_variables, schema)
+        return prompt | self._cached(model)
+
+    @property
+    def tailor_resume_chain(self) -> Runnable:
+        """
+        prompt | llm chain for resume tailoring; output is parsed separately.
+
+        The prompt is layered as instructions and schema, then resume, then
+        job description, so tailoring one resume against many jobs re-reads
+        everything up to the job description from the provider's cache.
+        """
+        if "tailor_resume" not in self._chains:
+            model = self._structured_model(TailoredResume)
+            cache_control = supports_cache_control(self.llm)
+            if model is None:
+                prompt = compile_layered_prompt(
+                    TAILOR_RESUME_INSTRUCTIONS, TAILOR_RESUME_LAYERS,
+                    self.resume_parser, cache_control
+                )
+                chain = prompt | self.cached_llm
+            else:
+                prompt = layered_prompt(
+                    TAILOR_RESUME_INSTRUCTIONS, TAILOR_RESUME_LAYERS,
+                    STRUCTURED_OUTPUT_INSTRUCTIONS.format(tool="TailoredResume"),
+                    cache_control
+                )
+                chain = prompt | self._cached(model)
+            self._chains["tailor_resume"] = chain
+        return self._chains["tailor_resume"]
+
+    @property
+    def tailor_sections_chain(self) -> Runnable:
+        """
+        Concurrent prompt | llm chains for the profile, the skills and each
+        experience entry (`roles`); outputs are parsed separately.
+        """
+        if "tailor_sections" not in self._chains:
+            variables = ["resume", "job_description"]
+            experience = self._schema_chain(
+                TAILOR_EXPERIENCE_PROMPT, ["role", "job_description"],
+                EXPERIENCE_PARSER, Experience
+            )
+            self._chains["tailor_sections"] = RunnableParallel(
+                profile=self._schema_chain(
+                    TAILOR_PROFILE_PROMPT, variables, PROFILE_PARSER, ResumeProfile
+                ),
+                skills=self._schema_chain(
+                    TAILOR_SKILLS_PROMPT, variables, SKILLS_PARSER, SkillsSection
+                ),
+                experience=RunnableLambda(_role_inputs) | experience.map(),
+            )
+        return self._chains["tailor_sections"]
+
+    @property
+    def parse_resume_chain(self) -> Runnable:
+        """prompt | llm chain that extracts a base resume; parsed separately"""
+        if "parse_resume" not in self._chains:
+            self._chains["parse_resume"] = self._schema_chain(
+                PARSE_RESUME_PROMPT, ["resume"], RESUME_PARSER, TailoredResume
+            )
+        return self._chains["parse_resume"]
+
+    @property
+    def tailor_patch_chain(self) -> Runnable:
+        """prompt | llm chain returning a ResumePatch; parsed separately"""
+        if "tailor_patch" not in self._chains:
+            self._chains["tailor_patch"] = self._schema_chain(
+                TAILOR_PATCH_PROMPT, ["resume", "job_description"],
+                PATCH_PARSER, ResumePatch
+            )
+        return self._chains["tailor_patch"]
+
+    @property
+    def repair_chain(self) -> Runnable:
+        """prompt | llm | JSON chain that re-requests only invalid fields"""
+        if "repair" not in self._chains:
+            prompt = PromptTemplate(
+                template=REPAIR_FIELDS_PROMPT,
+                input_variables=["model_name", "source", "fields"]
+            )
+            self._chains["repair"] = prompt | self.cached_llm | JsonOutputParser()
+        return self._chains["repair"]
+
+    def _prompt_spec(
+        self, name: str
+    ) -> Tuple[Sequence[str], List[str], Any, Type[BaseModel]]:
+        """The templates a chain sends, its inputs, parser and output schema"""
+        resume_inputs = ["resume", "job_description"]
+        return {
+            "parse_jd": ((PARSE_JD_PROMPT,), ["text"], self.jd_parser, JobDescription),
+            "tailor_resume": (
+                (TAILOR_RESUME_INSTRUCTIONS, *TAILOR_RESUME_LAYERS), resume_inputs,
+                self.resume_parser, TailoredResume
+            ),
+            "tailor_profile": (
+                (TAILOR_PROFILE_PROMPT,), resume_inputs, PROFILE_PARSER, ResumeProfile
+            ),
+            "tailor_skills": (
+                (TAILOR_SKILLS_PROMPT,), resume_inputs, SKILLS_PARSER, SkillsSection
+            ),
+            "tailor_experience": (
+                (TAILOR_EXPERIENCE_PROMPT,), ["role", "job_description"],
+                EXPERIENCE_PARSER, Experience
+            ),
+            "parse_resume": (
+                (PARSE_RESUME_PROMPT,), ["resume"], RESUME_PARSER, TailoredResume
+            ),
+            "tailor_patch": (
+                (TAILOR_PATCH_PROMPT,), resume_inputs, PATCH_PARSER, ResumePatch
+            ),
+        }[name]
+
+    def _prompt_tokens(self, name: str) -> int:
+        """Tokens in a chain's prompt with every input left empty"""
+        if name not in self._prompt_sizes:
+            templates, input_variables, parser, schema = self._prompt_spec(name)
+            if self._structured_model(schema) is None:
+                format_instructions = parser.get_format_instructions()
+            else:
+                format_instructions = \
+                    STRUCTURED_OUTPUT_INSTRUCTIONS.format(tool=schema.__name__)
+            values = {variable: "" for variable in input_variables}
+            self._prompt_sizes[name] = sum(
+                self.token_counter.count(
+                    template.format(format_instructions=format_instructions, **values)
+                )
+                for template in templates
+            )
+        return self._prompt_sizes[name]
+
+    def fit_jd_text(self, text: str,
+                    max_input_tokens: Optional[int] = None) -> Tuple[str, int, int]:
+        """
+        Compress job description text so the parse_jd prompt fits the budget.
+
+        Returns the text to send with the prompt's token count after and
+        before compression. `max_input_tokens` overrides the assistant's
+        budget for this call.
+        """
+        if max_input_tokens is None:
+            max_input_tokens = self.max_input_tokens
+        overhead = self._prompt_tokens("parse_jd")
+        original = overhead + self.token_counter.count(text)
+        if max_input_tokens is None or original <= max_input_tokens:
+            return text, original, original
+        text = compress_text(text, max(max_input_tokens - overhead, 0),
+                             self.token_counter)
+        return text, overhead + self.token_counter.count(text), original
+
+    def _to_job_description(self, result: Any, url: str) -> JobDescription:
+        if isinstance(result, dict) and "text" in result:
+            result = self.jd_parser.invoke(result["text"])
+        if not isinstance(result, JobDescription):
+            raise ValueError("Parser did not return a JobDescription object")
+        result.url = url
+        return result
+
+    def _repair_payload(self, error: OutputParserException,
+                        defaults: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        payload = load_payload(error.llm_output)
+        if payload is None:
+            raise error
+        return {**(defaults or {}), **payload}
+
+    def _repair_inputs(
+        self, schema: Type[BaseModel], data: Dict[str, Any],
+        error: ValidationError, source: str
+    ) -> Tuple[Dict[str, str], Dict]:
+        fields = invalid_fields(error)
+        if not fields or "" in fields:
+            # The document as a whole is unusable; nothing to patch
+            raise error
+        inputs = {
+            "model_name": schema.__name__,
+            "source": source,
+            "fields": describe_invalid_fields(schema, data, fields, error),
+        }
+        return inputs, fields
+
+    def _record_repair_usage(self, inputs: Dict[str, str],
+                             handler: TokenUsageHandler) -> None:
+        tokens = self.token_counter.count(REPAIR_FIELDS_PROMPT.format(**inputs))
+        self.token_usage.record(handler.usage("repair", tokens))
+
+    def _repair(self, schema: Type[BaseModel], error: OutputParserException,
+                source: str, use_cache: bool,
+                defaults: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Recover from output that failed validation by re-requesting only the
+        invalid fields, up to `max_repairs` times, instead of regenerating
+        the whole document.
+        """
+        data = self._repair_payload(error, defaults)
+        for attempt in range(self.max_repairs + 1):
+            try:
+                return schema.model_validate(data)
+            except ValidationError as e:
+                if attempt == self.max_repairs:
+                    raise
+                inputs, fields = self._repair_inputs(schema, data, e, source)
+            handler = TokenUsageHandler(self.token_counter)
+            with self.instrumentation.span(
+                "repair", model=schema.__name__, fields=", ".join(fields)
+            ):
+                repaired = self.repair_chain.invoke(
+                    inputs, self._run_config(use_cache, handler)
+                )
+            self._record_repair_usage(inputs, handler)
+            data = apply_repairs(data, fields, repaired)
+
+    async def _arepair(self, schema: Type[BaseModel], error: OutputParserException,
+                       source: str, use_cache: bool,
+                       defaults: Optional[Dict[str, Any]] = None) -> Any:
+        """Async version of _repair"""
+        data = self._repair_payload(error, defaults)
+        for attempt in range(self.max_repairs + 1):
+            try:
+                return schema.model_validate(data)
+            except ValidationError as e:
+                if attempt == self.max_repairs:
+                    raise
+                inputs, fields = self._repair_inputs(schema, data, e, source)
+            handler = TokenUsageHandler(self.token_counter)
+            with self.instrumentation.span(
+                "repair", model=schema.__name__, fields=", ".join(fields)
+            ):
+                repaired = await self.repair_chain.ainvoke(
+                    inputs, self._run_config(use_cache, handler)
+                )
+            self._record_repair_usage(inputs, handler)
+            data = apply_repairs(data, fields, repaired)
+
+    def _parse_resume(self, content: str, inputs: Dict[str, str],
+                      use_cache: bool) -> TailoredResume:
         try:
-            chain = prompt | self.llm | self.jd_parser
-            result = chain.invoke({"text": text})
-            if isinstance(result, dict) and "text" in result:
-                result = self.jd_parser.invoke(result["text"])
-            if not isinstance(result, JobDescription):
-                raise ValueError("Parser did not return a JobDescription object")
-            result.url = url
-            return result
+            return self.resume_parser.parse(content)
+        except OutputParserException as e:
+            return self._repair(TailoredResume, e, self._tailor_source(inputs),
+                                use_cache)
+
+    async def _aparse_resume(self, content: str, inputs: Dict[str, str],
+                             use_cache: bool) -> TailoredResume:
+        try:
+            return self.resume_parser.parse(content)
+        except OutputParserException as e:
+            return await self._arepair(TailoredResume, e,
+                                       self._tailor_source(inputs), use_cache)
+
+    def _tailor_source(self, inputs: Dict[str, str]) -> str:
+        return f"Resume:\n{inputs['resume']}\n\n" \
+            f"Job Description:\n{inputs['job_description']}"
+
+    def _to_markdown(self, resume: TailoredResume) -> str:
+        with self.instrumentation.span("render_markdown") as span:
+            markdown = resume.to_markdown()
+            span["output_chars"] = len(markdown)
+            return markdown
+
+    def _tailor_error(self, e: Exception) -> ValueError:
+        return ValueError(f"Failed to tailor resume: {str(e)}")
+
+    def parse_jd(self, text: str, url: str, use_cache: bool = True,
+                 max_input_tokens: Optional[int] = None) -> JobDescription:
+        """Parse job description text into structured format"""
+        try:
+            with self.instrumentation.span("parse_jd", url=url) as span:
+                text, tokens, original = self.fit_jd_text(text, max_input_tokens)
+                span["compressed"] = tokens < original
+                handler = TokenUsageHandler(self.token_counter)
+                try:
+                    result = self.parse_jd_chain.invoke(
+                        {"text": text}, self._run_config(use_cache, handler)
+                    )
+                except OutputParserException as e:
+                    result = e
+                self.token_usage.record(handler.usage("parse_jd", tokens, original))
+                if isinstance(result, OutputParserException):
+                    result = self._repair(
+                        JobDescription, result, text, use_cache, {"url": url}
+                    )
+                return self._to_job_description(result, url)
         except Exception as e:
             raise ValueError(f"Failed to parse job description: {str(e)}")
 
-    def tailor_resume(self, resume_content: str, 
-                      job_description: JobDescription) -> str:
-        """Tailor resume content to match job description"""
-        prompt = PromptTemplate(
-            template=TAILOR_RESUME_PROMPT,
-            input_variables=["resume", "job_description"],
-            partial_variables={
-                "format_instructions": self.resume_parser.get_format_instructions()
-                }
+    async def aparse_jd(self, text: str, url: str, use_cache: bool = True,
+                        max_input_tokens: Optional[int] = None) -> JobDescription:
+        """Parse job description text without blocking the event loop"""
+        await self.token_counter.aresolve()
+        try:
+            with self.instrumentation.span("parse_jd", url=url) as span:
+                text, tokens, original = self.fit_jd_text(text, max_input_tokens)
+                span["compressed"] = tokens < original
+                handler = TokenUsageHandler(self.token_counter)
+                try:
+                    result = await self.parse_jd_chain.ainvoke(
+                        {"text": text}, self._run_config(use_cache, handler)
+                    )
+                except OutputParserException as e:
+                    result = e
+                self.token_usage.record(handler.usage("parse_jd", tokens, original))
+                if isinstance(result, OutputParserException):
+                    result = await self._arepair(
+                        JobDescription, result, text, use_cache, {"url": url}
+                    )
+                return self._to_job_description(result, url)
+        except Exception as e:
+            raise ValueError(f"Failed to parse job description: {str(e)}")
+
+    def _batch_inputs(
+        self,
+        items: Sequence[Tuple[str, str]],
+        use_cache: bool,
+        max_concurrency: Optional[int],
+        max_input_tokens: Optional[int]
+    ) -> Tuple[List[Dict[str, str]], List[RunnableConfig],
+               List[Tuple[TokenUsageHandler, int, int]]]:
+        inputs: List[Dict[str, str]] = []
+        configs: List[RunnableConfig] = []
+        usages: List[Tuple[TokenUsageHandler, int, int]] = []
+        for text, _ in items:
+            text, tokens, original = self.fit_jd_text(text, max_input_tokens)
+            handler = TokenUsageHandler(self.token_counter)
+            inputs.append({"text": text})
+            configs.append(self._run_config(use_cache, handler, max_concurrency))
+            usages.append((handler, tokens, original))
+        return inputs, configs, usages
+
+    def _record_batch_usage(
+        self,
+        results: List[Any],
+        usages: List[Tuple[TokenUsageHandler, int, int]]
+    ) -> None:
+        for result, (handler, tokens, original) in zip(results, usages):
+            # Items that failed before producing output used no tokens
+            if not isinstance(result, Exception) or \
+                    isinstance(result, OutputParserException):
+                self.token_usage.record(handler.usage("parse_jd", tokens, original))
+
+    def _recover(self, result: Any, text: str, url: str, use_cache: bool) -> Any:
+        if not isinstance(result, OutputParserException):
+            return result
+        try:
+            return self._repair(JobDescription, result, text, use_cache, {"url": url})
+        except Exception as e:
+            return e
+
+    async def _arecover(self, result: Any, text: str, url: str,
+                        use_cache: bool) -> Any:
+        if not isinstance(result, OutputParserException):
+            return result
+        try:
+            return await self._arepair(
+                JobDescription, result, text, use_cache, {"url": url}
+            )
+        except Exception as e:
+            return e
+
+    def _batch_results(
+        self,
+        results: List[Any],
+        items: Sequence[Tuple[str, str]]
+    ) -> List[Union[JobDescription, Exception]]:
+        parsed: List[Union[JobDescription, Exception]] = []
+        for result, (_, url) in zip(results, items):
+            try:
+                if isinstance(result, Exception):
+                    raise result
+                parsed.append(self._to_job_description(result, url))
+            except Exception as e:
+                parsed.append(ValueError(f"Failed to parse job description: {str(e)}"))
+        return parsed
+
+    def parse_jds(
+        self,
+        items: Sequence[Tuple[str, str]],
+        max_concurrency: Optional[int] = None,
+        use_cache: bool = True,
+        max_input_tokens: Optional[int] = None
+    ) -> List[Union[JobDescription, Exception]]:
+        """
+        Parse many (text, url) job descriptions through the runnable batch
+        interface.
+
+        Returns one entry per item in input order: the parsed JobDescription,
+        or the ValueError describing why that item failed.
+        """
+        inputs, configs, usages = self._batch_inputs(
+            items, use_cache, max_concurrency, max_input_tokens
+        )
+        with self.instrumentation.span("parse_jd", batch_size=len(items)):
+            results = self.parse_jd_chain.batch(
+                inputs, configs, return_exceptions=True
+            )
+        self._record_batch_usage(results, usages)
+        results = [
+            self._recover(result, batch_input["text"], url, use_cache)
+            for result, batch_input, (_, url) in zip(results, inputs, items)
+        ]
+        return self._batch_results(results, items)
+
+    async def aparse_jds(
+        self,
+        items: Sequence[Tuple[str, str]],
+        max_concurrency: Optional[int] = None,
+        use_cache: bool = True,
+        max_input_tokens: Optional[int] = None
+    ) -> List[Union[JobDescription, Exception]]:
+        """Async version of parse_jds built on abatch"""
+        await self.token_counter.aresolve()
+        inputs, configs, usages = self._batch_inputs(
+            items, use_cache, max_concurrency, max_input_tokens
+        )
+        with self.instrumentation.span("parse_jd", batch_size=len(items)):
+            results = await self.parse_jd_chain.abatch(
+                inputs, configs, return_exceptions=True
+            )
+        self._record_batch_usage(results, usages)
+        results = await asyncio.gather(*(
+            self._arecover(result, batch_input["text"], url, use_cache)
+            for result, batch_input, (_, url) in zip(results, inputs, items)
+        ))
+        return self._batch_results(results, items)
+
+    def _tailor_inputs(self, resume_content: ResumeInput,
+                       job_description: JobDescription) -> Dict[str, str]:
+        if isinstance(resume_content, TailoredResume):
+            resume_content = compact_resume(resume_content)
+        return {
+            "resume": resume_content,
+            "job_description": job_description.model_dump_json(),
+        }
+
+    def _record_usage(self, operation: str, inputs: Dict[str, str],
+                      handler: TokenUsageHandler) -> None:
+        """Record a single-prompt call; the operation names its prompt"""
+        tokens = self._prompt_tokens(operation) + sum(
+            self.token_counter.count(value) for value in inputs.values()
+        )
+        self.token_usage.record(handler.usage(operation, tokens))
+
+    def _section_roles(self, resume_content: ResumeInput) -> List[str]:
+        """Experience entries to tailor separately; empty for a single call"""
+        if not self.parallel_sections:
+            return []
+        if isinstance(resume_content, TailoredResume):
+            return [compact_role(exp) for exp in resume_content.experience]
+        return split_roles(resume_content)
+
+    def _record_section_usage(self, inputs: Dict[str, Any],
+                              handler: TokenUsageHandler) -> None:
+        resume_tokens = self.token_counter.count(inputs["resume"])
+        jd_tokens = self.token_counter.count(inputs["job_description"])
+        tokens = self._prompt_tokens("tailor_profile") + \
+            self._prompt_tokens("tailor_skills") + 2 * (resume_tokens + jd_tokens)
+        tokens += sum(
+            self._prompt_tokens("tailor_experience") + jd_tokens +
+            self.token_counter.count(role)
+            for role in inputs["roles"]
+        )
+        self.token_usage.record(handler.usage("tailor_resume", tokens))
+
+    def _section_outputs(self, outputs: Dict[str, Any],
+                         inputs: Dict[str, Any]) -> List[Tuple[Any, str, str]]:
+        """(parser, completion, repair source) for each tailored section"""
+        source = self._tailor_source(inputs)
+        sections = [
+            (PROFILE_PARSER, output_text(outputs["profile"]), source),
+            (SKILLS_PARSER, output_text(outputs["skills"]), source),
+        ]
+        for role, output in zip(inputs["roles"], outputs["experience"]):
+            role_source = f"Experience entry:\n{role}\n\n" \
+                f"Job Description:\n{inputs['job_description']}"
+            sections.append((EXPERIENCE_PARSER, output_text(output), role_source))
+        return sections
+
+    def _parse_section(self, parser: PydanticOutputParser, content: str,
+                       source: str, use_cache: bool) -> Any:
+        try:
+            return parser.parse(content)
+        except OutputParserException as e:
+            return self._repair(parser.pydantic_object, e, source, use_cache)
+
+    async def _aparse_section(self, parser: PydanticOutputParser, content: str,
+                              source: str, use_cache: bool) -> Any:
+        try:
+            return parser.parse(content)
+        except OutputParserException as e:
+            return await self._arepair(parser.pydantic_object, e, source, use_cache)
+
+    def _skill_candidates(self, resume_content: ResumeInput,
+                          job_description: JobDescription) -> List[str]:
+        """Skills the merged resume should list if its bullets mention them"""
+        if isinstance(resume_content, TailoredResume):
+            base_skills = [
+                skill for group in resume_content.skills for skill in group.skills
+            ]
+        else:
+            base_skills = resume_skills(resume_content)
+        return job_description.requirements.skills + base_skills
+
+    def _merge_sections(self, parts: List[Any],
+                        candidates: List[str]) -> TailoredResume:
+        """
+        Assemble the tailored profile, skills and roles in base resume order,
+        then list any job or resume skill the tailored bullets mention but
+        the tailored skills section left out.
+        """
+        profile, skills, *experience = parts
+        return TailoredResume(
+            **dict(profile),
+            skills=reconcile_skills(skills.skills, experience, candidates),
+            experience=experience,
+        )
+
+    def _tailor_by_section(self, resume_content: ResumeInput, roles: List[str],
+                           job_description: JobDescription,
+                           use_cache: bool) -> TailoredResume:
+        inputs = {**self._tailor_inputs(resume_content, job_description),
+                  "roles": roles}
+        handler = TokenUsageHandler(self.token_counter)
+        outputs = self.tailor_sections_chain.invoke(
+            inputs, self._run_config(use_cache, handler)
+        )
+        self._record_section_usage(inputs, handler)
+        parts = [
+            self._parse_section(parser, content, source, use_cache)
+            for parser, content, source in self._section_outputs(outputs, inputs)
+        ]
+        return self._merge_sections(
+            parts, self._skill_candidates(resume_content, job_description)
+        )
+
+    async def _atailor_by_section(self, resume_content: ResumeInput, roles: List[str],
+                                  job_description: JobDescription,
+                                  use_cache: bool) -> TailoredResume:
+        inputs = {**self._tailor_inputs(resume_content, job_description),
+                  "roles": roles}
+        handler = TokenUsageHandler(self.token_counter)
+        outputs = await self.tailor_sections_chain.ainvoke(
+            inputs, self._run_config(use_cache, handler)
+        )
+        self._record_section_usage(inputs, handler)
+        parts = await asyncio.gather(*(
+            self._aparse_section(parser, content, source, use_cache)
+            for parser, content, source in self._section_outputs(outputs, inputs)
+        ))
+        return self._merge_sections(
+            parts, self._skill_candidates(resume_content, job_description)
+        )
+
+    def parse_resume(self, resume_content: str,
+                     use_cache: bool = True) -> TailoredResume:
+        """Extract a resume's text into a TailoredResume without rewording it"""
+        try:
+            with self.instrumentation.span("parse_resume") as span:
+                inputs = {"resume": resume_content}
+                handler = TokenUsageHandler(self.token_counter)
+                result = self.parse_resume_chain.invoke(
+                    inputs, self._run_config(use_cache, handler)
+                )
+                self._record_usage("parse_resume", inputs, handler)
+                resume = self._parse_section(
+                    RESUME_PARSER, output_text(result), resume_content, use_cache
+                )
+                span["roles"] = len(resume.experience)
+                return resume
+        except Exception as e:
+            raise ValueError(f"Failed to parse resume: {str(e)}")
+
+    async def aparse_resume(self, resume_content: str,
+                            use_cache: bool = True) -> TailoredResume:
+        """Async version of parse_resume"""
+        await self.token_counter.aresolve()
+        try:
+            with self.instrumentation.span("parse_resume") as span:
+                inputs = {"resume": resume_content}
+                handler = TokenUsageHandler(self.token_counter)
+                result = await self.parse_resume_chain.ainvoke(
+                    inputs, self._run_config(use_cache, handler)
+                )
+                self._record_usage("parse_resume", inputs, handler)
+                resume = await self._aparse_section(
+                    RESUME_PARSER, output_text(result), resume_content, use_cache
+                )
+                span["roles"] = len(resume.experience)
+                return resume
+        except Exception as e:
+            raise ValueError(f"Failed to parse resume: {str(e)}")
+
+    def _stored_resume(self, key: str) -> Optional[TailoredResume]:
+        resume = self._parsed_resumes.get(key)
+        if resume is None and self.resume_cache is not None:
+            resume = self.resume_cache.get(key)
+        self.instrumentation.emit("cache", cache="resume", hit=resume is not None)
+        return resume
+
+    def _store_resume(self, key: str, resume: TailoredResume, parsed: bool) -> None:
+        if key not in self._parsed_resumes and \
+                len(self._parsed_resumes) >= MAX_PARSED_RESUMES:
+            self._parsed_resumes.pop(next(iter(self._parsed_resumes)))
+        self._parsed_resumes[key] = resume
+        if parsed and self.resume_cache is not None:
+            self.resume_cache.set(key, resume)
+
+    def base_resume(self, resume_content: ResumeInput,
+                    use_cache: bool = True) -> TailoredResume:
+        """
+        The parsed form of a base resume, parsed at most once per version.
+
+        Parses are kept in memory and, with a `resume_cache`, on disk, both
+        keyed by a hash of the markdown.
+        """
+        if isinstance(resume_content, TailoredResume):
+            return resume_content
+        key = resume_hash(resume_content)
+        resume = self._stored_resume(key)
+        parsed = resume is None
+        if resume is None:
+            resume = self.parse_resume(resume_content, use_cache)
+        self._store_resume(key, resume, parsed)
+        return resume
+
+    async def abase_resume(self, resume_content: ResumeInput,
+                           use_cache: bool = True) -> TailoredResume:
+        """Async version of base_resume"""
+        if isinstance(resume_content, TailoredResume):
+            return resume_content
+        key = resume_hash(resume_content)
+        resume = self._stored_resume(key)
+        parsed = resume is None
+        if resume is None:
+            resume = await self.aparse_resume(resume_content, use_cache)
+        self._store_resume(key, resume, parsed)
+        return resume
+
+    def _patch_inputs(self, base: TailoredResume,
+                      job_description: JobDescription) -> Dict[str, str]:
+        return {
+            "resume": resume_outline(base),
+            "job_description": job_description.model_dump_json(),
+        }
+
+    def _tailor_delta(self, resume_content: ResumeInput,
+                      job_description: JobDescription,
+                      use_cache: bool) -> TailoredResume:
+        base = self.base_resume(resume_content, use_cache)
+        inputs = self._patch_inputs(base, job_description)
+        handler = TokenUsageHandler(self.token_counter)
+        result = self.tailor_patch_chain.invoke(
+            inputs, self._run_config(use_cache, handler)
+        )
+        self._record_usage("tailor_patch", inputs, handler)
+        patch = self._parse_section(
+            PATCH_PARSER, output_text(result), self._tailor_source(inputs), use_cache
+        )
+        return apply_patch(base, patch)
+
+    async def _atailor_delta(self, resume_content: ResumeInput,
+                             job_description: JobDescription,
+                             use_cache: bool) -> TailoredResume:
+        base = await self.abase_resume(resume_content, use_cache)
+        inputs = self._patch_inputs(base, job_description)
+        handler = TokenUsageHandler(self.token_counter)
+        result = await self.tailor_patch_chain.ainvoke(
+            inputs, self._run_config(use_cache, handler)
         )
+        self._record_usage("tailor_patch", inputs, handler)
+        patch = await self._aparse_section(
+            PATCH_PARSER, output_text(result), self._tailor_source(inputs), use_cache
+        )
+        return apply_patch(base, patch)
+
+    def tailor_resume(self, resume_content: ResumeInput,
+                      job_description: JobDescription,
+                      use_cache: bool = True) -> str:
+        """
+        Tailor resume content to match job description.
+
+        `resume_content` is base resume markdown or a resume already
+        extracted with parse_resume, which is sent in a compact plain-text
+        form. With `delta_tailoring`, markdown is parsed into a base
+        TailoredResume once per version (see base_resume) and the model
+        only returns a ResumePatch (summary, skills and bullet
+        edits by ID), which is applied locally. Otherwise, with
+        `parallel_sections`, the profile, the skills and each experience
+        entry are tailored by concurrent calls and merged locally, so latency
+        no longer grows with the number of roles. Resumes whose experience
+        section cannot be split are tailored in a single call.
+        """
+        try:
+            with self.instrumentation.span("tailor", role=job_description.role) as span:
+                roles = self._section_roles(resume_content)
+                if self.delta_tailoring:
+                    span["delta"] = True
+                    resume = self._tailor_delta(
+                        resume_content, job_description, use_cache
+                    )
+                elif roles:
+                    span["sections"] = len(roles) + 2
+                    resume = self._tailor_by_section(
+                        resume_content, roles, job_description, use_cache
+                    )
+                else:
+                    inputs = self._tailor_inputs(resume_content, job_description)
+                    handler = TokenUsageHandler(self.token_counter)
+                    result = self.tailor_resume_chain.invoke(
+                        inputs, self._run_config(use_cache, handler)
+                    )
+                    self._record_usage("tailor_resume", inputs, handler)
+                    resume = self._parse_resume(output_text(result), inputs, use_cache)
+            return self._to_markdown(resume)
+        except Exception as e:
+            raise self._tailor_error(e)
+
+    async def atailor_resume(self, resume_content: ResumeInput,
+                             job_description: JobDescription,
+                             use_cache: bool = True) -> str:
+        """Tailor resume content without blocking the event loop"""
+        await self.token_counter.aresolve()
+        try:
+            with self.instrumentation.span("tailor", role=job_description.role) as span:
+                roles = self._section_roles(resume_content)
+                if self.delta_tailoring:
+                    span["delta"] = True
+                    resume = await self._atailor_delta(
+                        resume_content, job_description, use_cache
+                    )
+                elif roles:
+                    span["sections"] = len(roles) + 2
+                    resume = await self._atailor_by_section(
+                        resume_content, roles, job_description, use_cache
+                    )
+                else:
+                    inputs = self._tailor_inputs(resume_content, job_description)
+                    handler = TokenUsageHandler(self.token_counter)
+                    result = await self.tailor_resume_chain.ainvoke(
+                        inputs, self._run_config(use_cache, handler)
+                    )
+                    self._record_usage("tailor_resume", inputs, handler)
+                    resume = await self._aparse_resume(
+                        output_text(result), inputs, use_cache
+                    )
+            return self._to_markdown(resume)
+        except Exception as e:
+            raise self._tailor_error(e)
+
+    def stream_tailor_resume(self, resume_content: ResumeInput,
+                             job_description: JobDescription,
+                             use_cache: bool = True) -> Iterator[ResumeSection]:
+        """
+        Tailor a resume, yielding markdown sections as the model writes them.
+
+        The header, summary, education and skills sections and each
+        experience entry are yielded as soon as their JSON is complete;
+        joining the fragments gives the same document as tailor_resume.
+        """
+        try:
+            with self.instrumentation.span(
+                "tailor", role=job_description.role, streamed=True
+            ):
+                sections = ResumeSectionStream()
+                inputs = self._tailor_inputs(resume_content, job_description)
+                handler = TokenUsageHandler(self.token_counter)
+                for chunk in self.tailor_resume_chain.stream(
+                    inputs, self._run_config(use_cache, handler)
+                ):
+                    yield from sections.feed(output_text(chunk))
+                self._record_usage("tailor_resume", inputs, handler)
+                resume = self._parse_resume(sections.text, inputs, use_cache)
+                yield from sections.finish(resume)
+        except Exception as e:
+            raise self._tailor_error(e)
 
+    async def astream_tailor_resume(
+        self,
+        resume_content: ResumeInput,
+        job_description: JobDescription,
+        use_cache: bool = True
+    ) -> AsyncIterator[ResumeSection]:
+        """Async version of stream_tailor_resume"""
+        await self.token_counter.aresolve()
         try:
-            chain = prompt | self.llm
-            result = chain.invoke({
-                "resume": resume_content,
-                "job_description": job_description.model_dump_json(),
-            })
-            
-            print("\n=== Debug: LLM Output ===")
-            content = result.get("text", "{}")
-            print(json.dumps(content, indent=2))
-            print("=======================\n")
-            
-            tailored_resume = self.resume_parser.parse(content)
-            
-            print("\n=== Debug: Parsed Resume Structure ===")
-            print(json.dumps(tailored_resume.model_dump(), indent=2))
-            print("================================\n")
-            
-            return tailored_resume.to_markdown()
+            with self.instrumentation.span(
+                "tailor", role=job_description.role, streamed=True
+            ):
+                sections = ResumeSectionStream()
+                inputs = self._tailor_inputs(resume_content, job_description)
+                handler = TokenUsageHandler(self.token_counter)
+                async for chunk in self.tailor_resume_chain.astream(
+                    inputs, self._run_config(use_cache, handler)
+                ):
+                    for section in sections.feed(output_text(chunk)):
+                        yield section
+                self._record_usage("tailor_resume", inputs, handler)
+                resume = await self._aparse_resume(sections.text, inputs, use_cache)
+                for section in sections.finish(resume):
+                    yield section
         except Exception as e:
-            print("\n=== Debug: Error Details ===")
-            print(f"Error type: {type(e)}")
-            print(f"Error message: {str(e)}")
-            if hasattr(e, '__cause__'):
-                print(f"Caused by: {e.__cause__}")
-            print("========================\n")
-            raise ValueError(f"Failed to tailor resume: {str(e)}")
\ No newline at end of file
+            raise self._tailor_error(e)
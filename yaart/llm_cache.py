@@ -0,0 +1,279 @@
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, Mapping, Optional, Union
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.runnables import Runnable, RunnableConfig
+from yaart.instrumentation import Instrumentation
+
+BYPASS_CACHE = "bypass_llm_cache"
+# Pending access-time updates written out together in one commit
+ACCESS_FLUSH_SIZE = 100
+
+
+def model_fingerprint(llm: Any) -> str:
+    """Model identifier plus sampling parameters, as a stable string"""
+    params = getattr(llm, "_identifying_params", None)
+    fingerprint: Dict[str, Any] = {"type": type(llm).__qualname__}
+    if isinstance(params, Mapping):
+        fingerprint.update(params)
+    return json.dumps(fingerprint, sort_keys=True, default=str)
+
+
+def prompt_text(prompt: Any) -> str:
+    """Rendered text of a prompt value, message list or string"""
+    if hasattr(prompt, "to_string"):
+        return prompt.to_string()
+    if isinstance(prompt, list):
+        return json.dumps(
+            [[getattr(m, "type", ""), getattr(m, "content", str(m))] for m in prompt],
+            default=str
+        )
+    return str(prompt)
+
+
+class LLMCache:
+    """
+    SQLite-backed cache of LLM completions keyed by a hash of the rendered
+    prompt, the model identifier and its sampling parameters.
+
+    Entries older than `ttl` seconds are treated as misses, and the least
+    recently used entries are evicted once `max_entries` or `max_bytes` is
+    exceeded.
+
+    Hits do not write to the database: access times are kept in memory and
+    written in one batch before the next store or eviction, once
+    ACCESS_FLUSH_SIZE are pending, or on flush() and close().
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = "llm_cache.db",
+        max_entries: Optional[int] = 10_000,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None
+    ):
+        self.path = str(path)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # Access times of hits not yet written, by key
+        self._accessed: Dict[str, float] = {}
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                model TEXT,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        ''')
+        self._conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed
+            ON llm_cache (accessed_at)
+        ''')
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(prompt: str, model: str) -> str:
+        return hashlib.sha256(
+            json.dumps([prompt, model]).encode("utf-8")
+        ).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached completion for a key, counting the hit or miss"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value, created_at FROM llm_cache WHERE key = ?', (key,)
+            ).fetchone()
+            if row is not None and self.ttl is not None and now - row[1] > self.ttl:
+                self._conn.execute('DELETE FROM llm_cache WHERE key = ?', (key,))
+                self._conn.commit()
+                self._accessed.pop(key, None)
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._accessed[key] = now
+            if len(self._accessed) >= ACCESS_FLUSH_SIZE:
+                self._flush_accessed()
+                self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, value: str, model: Optional[str] = None) -> None:
+        """Store a completion and evict least recently used entries over budget"""
+        now = time.time()
+        with self._lock:
+            # Eviction must see up-to-date access times
+            self._flush_accessed()
+            self._conn.execute('''
+                INSERT OR REPLACE INTO llm_cache
+                    (key, value, model, size, created_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (key, value, model, len(value.encode("utf-8")), now, now))
+            self._evict(now)
+            self._conn.commit()
+
+    def _flush_accessed(self) -> None:
+        """Write pending access times; the caller holds the lock and commits"""
+        if self._accessed:
+            self._conn.executemany(
+                'UPDATE llm_cache SET accessed_at = ? WHERE key = ?',
+                [(accessed_at, key) for key, accessed_at in self._accessed.items()]
+            )
+            self._accessed.clear()
+
+    def flush(self) -> None:
+        """Write access times of recent hits to the database"""
+        with self._lock:
+            self._flush_accessed()
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        if self.ttl is not None:
+            self._conn.execute(
+                'DELETE FROM llm_cache WHERE created_at < ?', (now - self.ttl,)
+            )
+        if self.max_entries is not None:
+            self._conn.execute('''
+                DELETE FROM llm_cache WHERE key IN (
+                    SELECT key FROM llm_cache ORDER BY accessed_at DESC
+                    LIMIT -1 OFFSET ?
+                )
+            ''', (self.max_entries,))
+        if self.max_bytes is not None:
+            # Keep the most recently used entries whose running size fits
+            self._conn.execute('''
+                DELETE FROM llm_cache WHERE key IN (
+                    SELECT key FROM (
+                        SELECT key, SUM(size) OVER (
+                            ORDER BY accessed_at DESC, key
+                        ) AS running_size
+                        FROM llm_cache
+                    ) WHERE running_size > ?
+                )
+            ''', (self.max_bytes,))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._accessed.clear()
+            self._conn.execute('DELETE FROM llm_cache')
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters for this process plus current cache size"""
+        with self._lock:
+            entries, size = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache'
+            ).fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": entries,
+            "bytes": size,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_accessed()
+            self._conn.commit()
+            self._conn.close()
+
+
+def _output_text(result: Any) -> str:
+    # Imported here to avoid a circular import with yaart.llm
+    from yaart.llm import output_text
+    return output_text(result)
+
+
+class CachedLLM(Runnable):
+    """
+    Wraps a language model so completions are served from an LLMCache.
+
+    Pass `{"configurable": {BYPASS_CACHE: True}}` as the run config to skip
+    the lookup for one call; the fresh completion still refreshes the cache.
+    """
+
+    def __init__(self, llm: Any, cache: LLMCache,
+                 instrumentation: Optional[Instrumentation] = None):
+        self.llm = llm
+        self.cache = cache
+        self.model = model_fingerprint(llm)
+        self.instrumentation = instrumentation or Instrumentation()
+
+    def _lookup(self, input: Any, config: Optional[RunnableConfig]):
+        key = self.cache.make_key(prompt_text(input), self.model)
+        if ((config or {}).get("configurable") or {}).get(BYPASS_CACHE):
+            return key, None
+        cached = self.cache.get(key)
+        self.instrumentation.emit("cache", cache="llm", hit=cached is not None)
+        return key, cached
+
+    async def _alookup(self, input: Any, config: Optional[RunnableConfig]):
+        """_lookup with the database read run off the event loop"""
+        key = self.cache.make_key(prompt_text(input), self.model)
+        if ((config or {}).get("configurable") or {}).get(BYPASS_CACHE):
+            return key, None
+        cached = await asyncio.to_thread(self.cache.get, key)
+        self.instrumentation.emit("cache", cache="llm", hit=cached is not None)
+        return key, cached
+
+    def _store(self, key: str, result: Any) -> None:
+        self.cache.set(key, _output_text(result), self.model)
+
+    async def _astore(self, key: str, text: str) -> None:
+        await asyncio.to_thread(self.cache.set, key, text, self.model)
+
+    def invoke(self, input: Any, config: Optional[RunnableConfig] = None,
+               **kwargs: Any) -> Any:
+        key, cached = self._lookup(input, config)
+        if cached is not None:
+            return AIMessage(content=cached)
+        result = self.llm.invoke(input, config, **kwargs)
+        self._store(key, result)
+        return result
+
+    async def ainvoke(self, input: Any, config: Optional[RunnableConfig] = None,
+                      **kwargs: Any) -> Any:
+        key, cached = await self._alookup(input, config)
+        if cached is not None:
+            return AIMessage(content=cached)
+        result = await self.llm.ainvoke(input, config, **kwargs)
+        await self._astore(key, _output_text(result))
+        return result
+
+    def stream(self, input: Any, config: Optional[RunnableConfig] = None,
+               **kwargs: Any) -> Iterator[Any]:
+        key, cached = self._lookup(input, config)
+        if cached is not None:
+            yield AIMessageChunk(content=cached)
+            return
+        parts = []
+        for chunk in self.llm.stream(input, config, **kwargs):
+            parts.append(_output_text(chunk))
+            yield chunk
+        # Only completions that were streamed to the end are cached
+        self.cache.set(key, "".join(parts), self.model)
+
+    async def astream(self, input: Any, config: Optional[RunnableConfig] = None,
+                      **kwargs: Any) -> AsyncIterator[Any]:
+        key, cached = await self._alookup(input, config)
+        if cached is not None:
+            yield AIMessageChunk(content=cached)
+            return
+        parts = []
+        async for chunk in self.llm.astream(input, config, **kwargs):
+            parts.append(_output_text(chunk))
+            yield chunk
+        await self._astore(key, "".join(parts))
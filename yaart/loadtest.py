@@ -0,0 +1,159 @@
+"""
+Load-test harness driving ResumeOptimizer.optimize_resume concurrently.
+
+Pair it with yaart.fake_llm.FakeChatModel to size deployments offline:
+the report gives throughput and per-stage latency percentiles taken from
+the optimizer's instrumentation spans.
+"""
+import asyncio
+import math
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+from yaart.instrumentation import CANCELLED, STAGES, MemorySink
+from yaart.optimizer import ResumeOptimizer
+
+# Span name under which whole optimize_resume calls are reported
+REQUEST_STAGE = "request"
+
+DEFAULT_JOB_TEXT = """Senior Backend Engineer
+
+We are hiring a backend engineer to build and scale our data platform.
+Responsibilities include designing APIs, running Kubernetes services on
+AWS and mentoring engineers. Requirements: 5+ years of Python, SQL and
+distributed systems experience. Benefits: remote work, equity, 401k.
+"""
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of `values`; 0.0 when empty"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = math.ceil(pct / 100 * len(ordered))
+    return ordered[min(max(rank, 1), len(ordered)) - 1]
+
+
+@dataclass
+class StageStats:
+    """Latency percentiles for one stage, in seconds"""
+    stage: str
+    count: int
+    errors: int
+    p50: float
+    p95: float
+    p99: float
+
+    @classmethod
+    def from_durations(cls, stage: str, durations: Sequence[float],
+                       errors: int = 0) -> "StageStats":
+        return cls(stage, len(durations), errors, percentile(durations, 50),
+                   percentile(durations, 95), percentile(durations, 99))
+
+
+@dataclass
+class LoadTestReport:
+    requests: int
+    concurrency: int
+    succeeded: int
+    elapsed: float
+    stages: List[StageStats] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def throughput(self) -> float:
+        """Successful requests per second"""
+        return self.succeeded / self.elapsed if self.elapsed else 0.0
+
+    def stage(self, name: str) -> Optional[StageStats]:
+        return next((stats for stats in self.stages if stats.stage == name), None)
+
+    def format(self) -> str:
+        lines = [
+            f"{self.succeeded}/{self.requests} requests succeeded at concurrency "
+            f"{self.concurrency} in {self.elapsed:.2f}s "
+            f"({self.throughput:.2f} req/s)",
+            "",
+            f"{'stage':<16}{'count':>7}{'errors':>8}"
+            f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}",
+        ]
+        for stats in self.stages:
+            lines.append(
+                f"{stats.stage:<16}{stats.count:>7}{stats.errors:>8}"
+                f"{stats.p50 * 1000:>10.1f}{stats.p95 * 1000:>10.1f}"
+                f"{stats.p99 * 1000:>10.1f}"
+            )
+        return "\n".join(lines)
+
+
+def _stage_order(name: str) -> int:
+    if name == REQUEST_STAGE:
+        return len(STAGES) + 1
+    return STAGES.index(name) if name in STAGES else len(STAGES)
+
+
+async def run_load_test(
+    optimizer: ResumeOptimizer,
+    base_resume_path: Path,
+    output_dir: Path,
+    requests: int = 20,
+    concurrency: int = 5,
+    job_text: str = DEFAULT_JOB_TEXT
+) -> LoadTestReport:
+    """
+    Run `requests` optimize_resume calls, at most `concurrency` at a time.
+
+    Each request gets its own company and posting URL so nothing is
+    deduplicated between them; the job description is passed as text so
+    no scraping happens. `output_dir` needs the Markdown/ and PDF/
+    subdirectories optimize_resume expects. Failed requests are counted,
+    not raised.
+    """
+    sink = MemorySink()
+    optimizer.instrumentation.add_sink(sink)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors: List[str] = []
+
+    async def one(index: int) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await optimizer.optimize_resume(
+                    company=f"loadtest_{index}",
+                    jd_url=f"https://loadtest.invalid/jobs/{index}",
+                    base_resume_path=base_resume_path,
+                    output_dir=output_dir,
+                    jd_string=job_text,
+                )
+            except Exception as e:
+                errors.append(f"{type(e).__name__}: {e}")
+            else:
+                latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(one(i) for i in range(requests)))
+    finally:
+        optimizer.instrumentation.sinks.remove(sink)
+    elapsed = time.perf_counter() - start
+
+    durations: Dict[str, List[float]] = {}
+    failures: Dict[str, int] = {}
+    for event in sink.events:
+        if event.duration is None or event.attributes.get("status") == CANCELLED:
+            continue
+        if event.error:
+            failures[event.name] = failures.get(event.name, 0) + 1
+        else:
+            durations.setdefault(event.name, []).append(event.duration)
+    durations[REQUEST_STAGE] = latencies
+    failures[REQUEST_STAGE] = len(errors)
+    stages = [
+        StageStats.from_durations(name, durations.get(name, []), failures.get(name, 0))
+        for name in sorted(set(durations) | set(failures), key=_stage_order)
+    ]
+    return LoadTestReport(
+        requests, concurrency, len(latencies), elapsed, stages, errors
+    )
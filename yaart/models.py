@@ -1,5 +1,5 @@
 from typing import List, Optional, Dict
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, create_model
 
 
 class JobRequirements(BaseModel):
@@ -145,48 +145,131 @@ class TailoredResume(BaseModel):
 
     def to_markdown(self) -> str:
         """Convert the resume to markdown format"""
-        md = f"""<h1 style="text-align:center;">{self.name}</h1>
+        md = header_markdown(
+            self.name, self.title, self.location, self.phone, self.email,
+            self.github, self.linkedin
+        )
+        md += summary_markdown(self.summary)
+        md += education_markdown(self.education)
+        md += skills_markdown(self.skills)
+        md += EXPERIENCE_HEADING
+        md += "".join(experience_markdown(exp) for exp in self.experience)
+        md += publications_markdown(self.publications)
+        md += open_source_markdown(self.open_source)
+        return md.strip()
+
+
+# Parts of a TailoredResume that can be tailored by independent calls. The
+# profile is every field except skills and experience, with the same
+# descriptions, so the merged result validates as a TailoredResume.
+PROFILE_FIELDS = tuple(
+    name for name in TailoredResume.model_fields
+    if name not in ("skills", "experience")
+)
+ResumeProfile = create_model(  # type: ignore[call-overload]
+    "ResumeProfile",
+    **{name: (TailoredResume.model_fields[name].annotation,
+              TailoredResume.model_fields[name])
+       for name in PROFILE_FIELDS}
+)
+
+
+class SkillsSection(BaseModel):
+    skills: List[Skill] = Field(
+        description=TailoredResume.model_fields["skills"].description
+    )
+
+
+
+# Delta tailoring: the model edits a base resume by ID instead of rewriting it
+class BulletPatch(BaseModel):
+    id: str = Field(description="ID of a bullet from the base resume, e.g. 'e0.b2'")
+    text: Optional[str] = Field(
+        description="Reworded bullet, or null to keep the original wording",
+        default=None,
+    )
+
+
+class RolePatch(BaseModel):
+    id: str = Field(description="ID of the experience entry, e.g. 'e0'")
+    bullets: List[BulletPatch] = Field(
+        description="Bullets of this entry to keep, most relevant first (maximum 8);" \
+        " bullets left out are dropped"
+    )
+
+
+class ResumePatch(BaseModel):
+    title: str = Field(description=TailoredResume.model_fields["title"].description)
+    summary: str = Field(description=TailoredResume.model_fields["summary"].description)
+    roles: List[RolePatch] = Field(
+        description="Edits for each experience entry; entries left out are kept as is"
+    )
+    skills: List[Skill] = Field(
+        description=TailoredResume.model_fields["skills"].description
+    )
+
+
+# Section renderers. Each returns a fragment ending in its own trailing
+# whitespace, so concatenating them in document order (and stripping the
+# result) gives TailoredResume.to_markdown().
+HEADER_FIELDS = ("name", "title", "location", "phone", "email", "github", "linkedin")
+EXPERIENCE_HEADING = "## Professional Experience\n"
+
 
-<p style="text-align:center;font-weight:bold;">{self.title}</p>
+def header_markdown(name: str, title: str, location: str, phone: str, email: str,
+                    github: str, linkedin: str) -> str:
+    return f"""<h1 style="text-align:center;">{name}</h1>
 
-<p style="text-align:center;">{self.location} | {self.phone} | {self.email} | {self.github} | {self.linkedin}</p>  
+<p style="text-align:center;font-weight:bold;">{title}</p>
 
-## Summary
-{self.summary}
+<p style="text-align:center;">{location} | {phone} | {email} | {github} | {linkedin}</p>  
 
-## Education
 """ # noqa: E501
-        # Education section
-        for edu in self.education:
-            md += f"**{edu.degree}**  \n_{edu.institution} | {edu.dates}_\n\n"
-
-        # Skills section
-        md += "## Skills\n"
-        for skill in self.skills:
-            md += f"**{skill.category}:** {', '.join(skill.skills)}\n\n"
-
-        # Experience section
-        md += "## Professional Experience\n"
-        for exp in self.experience:
-            company_desc = (
-                f" _{exp.company_description} |" if exp.company_description else ""
-            )
-            md += f"**{exp.title}**  \n"
-            md += f"**{exp.company}**{company_desc} {exp.location} | {exp.dates}_\n\n"
-            for bullet in exp.bullets:
-                md += f"- {bullet}\n"
-            md += "\n"
-
-        # Publications section (if any)
-        if self.publications:
-            md += "## Publications\n"
-            for pub in self.publications:
-                md += f"**{pub.journal}:** _{pub.title}_ ({pub.date})\n\n"
-
-        # Open Source section (if any)
-        if self.open_source:
-            md += "## Open-Source Contributions\n"
-            for project in self.open_source:
-                md += f"**{project.name}:** {project.description}\n\n"
 
-        return md.strip()
+
+def summary_markdown(summary: str) -> str:
+    return f"## Summary\n{summary}\n\n"
+
+
+def education_markdown(education: List[Education]) -> str:
+    md = "## Education\n"
+    for edu in education:
+        md += f"**{edu.degree}**  \n_{edu.institution} | {edu.dates}_\n\n"
+    return md
+
+
+def skills_markdown(skills: List[Skill]) -> str:
+    md = "## Skills\n"
+    for skill in skills:
+        md += f"**{skill.category}:** {', '.join(skill.skills)}\n\n"
+    return md
+
+
+def experience_markdown(exp: Experience) -> str:
+    """One role, without the section heading"""
+    company_desc = (
+        f" _{exp.company_description} |" if exp.company_description else ""
+    )
+    md = f"**{exp.title}**  \n"
+    md += f"**{exp.company}**{company_desc} {exp.location} | {exp.dates}_\n\n"
+    for bullet in exp.bullets:
+        md += f"- {bullet}\n"
+    return md + "\n"
+
+
+def publications_markdown(publications: Optional[List[Publication]]) -> str:
+    if not publications:
+        return ""
+    md = "## Publications\n"
+    for pub in publications:
+        md += f"**{pub.journal}:** _{pub.title}_ ({pub.date})\n\n"
+    return md
+
+
+def open_source_markdown(projects: Optional[List[OpenSourceProject]]) -> str:
+    if not projects:
+        return ""
+    md = "## Open-Source Contributions\n"
+    for project in projects:
+        md += f"**{project.name}:** {project.description}\n\n"
+    return md
@@ -1,19 +1,81 @@
+import asyncio
+import httpx
 from pathlib import Path
-from typing import Optional, Dict, Tuple
+from typing import Optional, Dict, Tuple, Union
 from md2pdf.core import md2pdf # type: ignore
-from yaart.llm import ResumeAssistant
+from yaart.base_resume import BaseResumeCache
+from yaart.llm import ResumeAssistant, ResumeInput
+from yaart.http_cache import HTTPCache
+from yaart.llm_cache import LLMCache
 from yaart.scraper import JobScraper
-from yaart.db import JobDatabase
+from yaart.db import DEFAULT_DB_PATH, AsyncJobDatabase, JobDatabase
+from yaart.instrumentation import Instrumentation
 from yaart.models import JobDescription
+from yaart.urls import URLCanonicalizer
 from langchain.base_language import BaseLanguageModel
 from pydantic import SecretStr
 
 class ResumeOptimizer:
     def __init__(self, llm: Optional[BaseLanguageModel] = None, 
-                 api_key: Optional[SecretStr] = None):
-        self.assistant = ResumeAssistant(llm=llm, api_key=api_key)
-        self.scraper = JobScraper(assistant=self.assistant)
-        self.db = JobDatabase()
+                 api_key: Optional[SecretStr] = None,
+                 http_client: Optional[httpx.AsyncClient] = None,
+                 cache_dir: Optional[Path] = None,
+                 canonicalizer: Optional[URLCanonicalizer] = None,
+                 llm_cache: Optional[Union[LLMCache, str, Path]] = None,
+                 instrumentation: Optional[Instrumentation] = None,
+                 resume_cache: Optional[Union[BaseResumeCache, str, Path]] = None,
+                 db_path: Union[str, Path] = DEFAULT_DB_PATH,
+                 structured_output: bool = False,
+                 parallel_sections: bool = False,
+                 delta_tailoring: bool = False):
+        self.instrumentation = instrumentation or Instrumentation()
+        self.assistant = ResumeAssistant(
+            llm=llm,
+            api_key=api_key,
+            cache=llm_cache,
+            instrumentation=self.instrumentation,
+            structured_output=structured_output,
+            parallel_sections=parallel_sections,
+            delta_tailoring=delta_tailoring,
+            resume_cache=resume_cache
+        )
+        self.resume_cache = self.assistant.resume_cache
+        # An LLM cache opened from a path is ours to flush on aclose
+        self._owns_llm_cache = isinstance(llm_cache, (str, Path))
+        self.canonicalizer = canonicalizer or URLCanonicalizer()
+        self.scraper = JobScraper(
+            assistant=self.assistant,
+            client=http_client,
+            # Key cached pages like the database so both agree on a URL
+            cache=HTTPCache(cache_dir, self.canonicalizer) if cache_dir else None,
+            instrumentation=self.instrumentation
+        )
+        self.db = JobDatabase(db_path)
+        # Used from the async paths so queries and commits stay off the loop
+        self.async_db = AsyncJobDatabase(self.db)
+        # In-flight job description loads, shared by concurrent callers
+        self._inflight: Dict[Tuple[str, bool], asyncio.Future] = {}
+
+    async def aclose(self) -> None:
+        """
+        Release network resources held by the scraper and the database.
+
+        The optimizer stays usable: the HTTP client and the database worker
+        threads are recreated on next use. The job database itself stays
+        open, so an in-memory database keeps its contents. An LLM cache the
+        optimizer opened from a path has its pending access times flushed.
+        """
+        await self.scraper.aclose()
+        if self._owns_llm_cache and self.assistant.cache is not None:
+            await asyncio.to_thread(self.assistant.cache.flush)
+        async_db, self.async_db = self.async_db, AsyncJobDatabase(self.db)
+        await async_db.aclose()
+
+    async def __aenter__(self) -> "ResumeOptimizer":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
 
     def validate_paths(
         self, 
@@ -35,33 +97,85 @@ class ResumeOptimizer:
             
         return markdown_dir, pdf_dir
 
+    async def load_base_resume(self, base_resume_path: Path) -> ResumeInput:
+        """
+        Read the base resume, parsed into a structured model when a resume
+        cache is configured or delta tailoring needs one.
+
+        The parse is stored under a hash of the file, so it only runs again
+        after the file changes. Otherwise the raw markdown is returned.
+        """
+        resume_content = base_resume_path.read_text()
+        if self.resume_cache is None and not self.assistant.delta_tailoring:
+            return resume_content
+        return await self.assistant.abase_resume(resume_content)
+
     async def get_job_description(
         self,
         jd_url: str,
-        jd_string: Optional[str] = None
+        jd_string: Optional[str] = None,
+        revalidate: bool = False
     ) -> JobDescription:
-        """Get job description from string, database, or by scraping"""
+        """
+        Get job description from string, database, or by scraping.
+
+        URLs are canonicalized first so tracking parameters and other variants
+        of the same posting share one database entry. Concurrent calls for the
+        same posting share a single scrape and parse.
+
+        With `revalidate`, a stored job description is scraped again through
+        the usual ATS adapter or page path. Pages are fetched with a
+        conditional GET against the HTTP cache, so `cache_dir` is required,
+        and the stored copy is reused when the page has not changed.
+        """
         try:
+            jd_url = self.canonicalizer(jd_url)
             if jd_string:
-                job_description = self.assistant.parse_jd(jd_string, jd_url)
-                self.db.save_job_description(job_description)
+                job_description = await self.assistant.aparse_jd(
+                    jd_string, jd_url
+                )
+                await self.async_db.save_job_description(job_description)
                 return job_description
 
-            # Try database first
-            job_description = self.db.get_job_description(jd_url) # type: ignore
-            if job_description is not None:
-                return job_description
+            key = (jd_url, revalidate)
+            load = self._inflight.get(key)
+            if load is None:
+                load = asyncio.ensure_future(
+                    self._load_job_description(jd_url, revalidate)
+                )
+                self._inflight[key] = load
+                load.add_done_callback(lambda _: self._inflight.pop(key, None))
+            # Shield so one caller being cancelled does not cancel the others
+            return await asyncio.shield(load)
 
+        except Exception as e:
+            raise ValueError(f"Failed to process job description: {str(e)}")
+
+    async def _load_job_description(
+        self,
+        jd_url: str,
+        revalidate: bool
+    ) -> JobDescription:
+        """Load a job description from the database or by scraping"""
+        # Try database first
+        job_description = await self.async_db.get_job_description(jd_url)
+        if job_description is not None:
+            if not revalidate:
+                return job_description
+            stored = job_description
+            job_description = await self.scraper.revalidate_job_description(
+                jd_url, stored
+            )
+            if job_description is stored:
+                return job_description
+        else:
             # Scrape if not in database
             job_description = await self.scraper.scrape_job_description(jd_url)
-            if not job_description:
-                raise ValueError("Failed to scrape job description")
-            
-            self.db.save_job_description(job_description)
-            return job_description
+        if not job_description:
+            raise ValueError("Failed to scrape job description")
 
-        except Exception as e:
-            raise ValueError(f"Failed to process job description: {str(e)}")
+        await self.async_db.save_job_description(job_description)
+        return job_description
 
     def generate_documents(
         self,
@@ -79,17 +193,18 @@ class ResumeOptimizer:
         # Generate PDF
         try:
             pdf_path = pdf_dir / f"Resume_{company}.pdf"
-            if css_path and css_path.exists():
-                md2pdf(
-                    str(pdf_path),
-                    md_content=tailored_resume,
-                    css_file_path=str(css_path),
-                )
-            else:
-                md2pdf(
-                    str(pdf_path),
-                    md_content=tailored_resume,
-                )
+            with self.instrumentation.span("render_pdf", company=company):
+                if css_path and css_path.exists():
+                    md2pdf(
+                        str(pdf_path),
+                        md_content=tailored_resume,
+                        css_file_path=str(css_path),
+                    )
+                else:
+                    md2pdf(
+                        str(pdf_path),
+                        md_content=tailored_resume,
+                    )
             return markdown_path, pdf_path
         except Exception as e:
             raise ValueError(f"Failed to generate PDF: {str(e)}")
@@ -101,7 +216,8 @@ class ResumeOptimizer:
         base_resume_path: Path,
         output_dir: Path = Path("."),
         jd_string: Optional[str] = None,
-        css_path: Optional[Path] = None
+        css_path: Optional[Path] = None,
+        revalidate: bool = False
     ) -> Dict:
         """
         Optimize resume for a specific job description.
@@ -113,6 +229,10 @@ class ResumeOptimizer:
             output_dir: Directory for output files
             jd_string: Optional raw job description text
             css_path: Optional path to CSS file for PDF styling
+            revalidate: Re-check a stored job posting for changes before reuse
+
+        With a `resume_cache`, the base resume is parsed once per version of
+        the file and tailoring receives its compact structured form.
         
         Returns:
             Dict containing optimization results
@@ -121,14 +241,16 @@ class ResumeOptimizer:
         markdown_dir, pdf_dir = self.validate_paths(base_resume_path, output_dir)
         
         # Read base resume
-        resume_content = base_resume_path.read_text()
+        resume_content = await self.load_base_resume(base_resume_path)
 
         # Get job description
-        job_description = await self.get_job_description(jd_url, jd_string)
+        job_description = await self.get_job_description(
+            jd_url, jd_string, revalidate=revalidate
+        )
 
         # Tailor resume
         try:
-            tailored_resume = self.assistant.tailor_resume(
+            tailored_resume = await self.assistant.atailor_resume(
                 resume_content,
                 job_description
             )
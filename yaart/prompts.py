@@ -17,7 +17,10 @@ Job Description:
 {format_instructions}
 """
 
-TAILOR_RESUME_PROMPT = """
+# Resume tailoring is sent in layers that change progressively more often: the
+# instructions and output schema (fixed), the resume (per candidate) and the
+# job description (per job), so providers can reuse the cached prefix
+TAILOR_RESUME_INSTRUCTIONS = """
 Analyze the provided resume and job description to create a tailored version of the resume.
 Follow these specific guidelines:
 
@@ -59,6 +62,62 @@ Important:
 3. You may prioritize and tailor the content, but do not omit entire jobs
 4. Maintain the original structure while tailoring content to the job requirements
 
+Remember to:
+- Keep all information truthful and accurate
+- Maintain chronological order
+- Ensure technical terms are used accurately and in context
+- Focus on accomplishments rather than just responsibilities
+- Demonstrate impact and results
+
+Return the tailored resume information in the specified JSON structure.
+
+{format_instructions}
+""" # noqa: E501
+
+TAILOR_RESUME_LAYERS = (
+    """Resume:
+{resume}
+
+""",
+    """Job Description:
+{job_description}
+""",
+)
+
+# Stands in for the parser's format instructions when the model is bound to a
+# tool carrying the JSON schema
+STRUCTURED_OUTPUT_INSTRUCTIONS = """
+Return the result by calling the `{tool}` tool, filling in every required field.
+"""
+
+REPAIR_FIELDS_PROMPT = """
+You produced a {model_name} from the source material below, but some of its fields
+failed validation. Provide corrected values for ONLY the fields listed; everything
+else is already correct and must not be repeated.
+
+Source material:
+{source}
+
+Fields to fix:
+{fields}
+
+Respond with only a JSON object that maps each field path listed above to its
+corrected value. Every value must match the JSON schema given for that field.
+"""
+
+# Per-section tailoring: the profile, skills and each experience entry are
+# tailored by independent calls that run concurrently
+TAILOR_PROFILE_PROMPT = """
+Using the provided resume and job description, tailor the resume's profile: the
+header, professional title and summary. Copy the contact details, education,
+publications and open-source contributions from the resume unchanged.
+
+Summary guidelines:
+- Follow this template: "[Title] with [N-years] of experience in [industry if relevant]. Some career highlights include: [Projects/accomplishments relevant to JD's responsibilities]. I would like to leverage my experience to [outcome the role is looking for] at [company name and its goal/product type]"
+- Explicitly mention the company name in a meaningful way
+- Focus on achievements that directly relate to the job requirements
+- Use similar terminology as the job description
+
 Resume:
 {resume}
 
@@ -67,12 +126,89 @@ Job Description:
 
 {format_instructions}
 
-Remember to:
-- Keep all information truthful and accurate
-- Maintain chronological order
-- Ensure technical terms are used accurately and in context
-- Focus on accomplishments rather than just responsibilities
-- Demonstrate impact and results
+Keep all information truthful and accurate.
+""" # noqa: E501
 
-Return the tailored resume information in the specified JSON structure.
-""" # noqa: E501
\ No newline at end of file
+TAILOR_SKILLS_PROMPT = """
+Using the provided resume and job description, tailor the resume's skills section:
+- Reorganize skills to prioritize those mentioned in the job description
+- Add any relevant skills from the resume's experience that match the job requirements
+- Ensure all technical skills mentioned in the experience bullets are listed
+- Group skills by categories that align with the job requirements
+
+Only list skills the resume supports.
+
+Resume:
+{resume}
+
+Job Description:
+{job_description}
+
+{format_instructions}
+"""
+
+TAILOR_EXPERIENCE_PROMPT = """
+Tailor the following entry from a resume's professional experience to the job
+description. Keep the title, company, location and dates unchanged.
+
+Guidelines:
+- Limit to maximum 8 bullet points, focusing on the most relevant achievements
+- Integrate specific technical skills into bullet points (e.g., change "Implemented a website" to "Implemented a React-based website with Node.js backend")
+- Prioritize achievements that demonstrate required skills, similar responsibilities and relevant industry experience
+- Quantify achievements where possible (%, $, time saved, etc.)
+- Use action verbs and terminology that match the job description's language
+
+Experience entry:
+{role}
+
+Job Description:
+{job_description}
+
+{format_instructions}
+
+Keep all information truthful and accurate.
+""" # noqa: E501
+
+# Delta tailoring: the resume is shown as an outline with IDs and the model
+# returns edits, so unchanged text is never regenerated
+TAILOR_PATCH_PROMPT = """
+Tailor the resume outlined below to the job description by describing edits to it.
+Every experience entry and bullet has an ID in square brackets; refer to them by ID.
+
+1. Title and Summary:
+   - Align the professional title with the target role
+   - Rewrite the summary to follow this template: "[Title] with [N-years] of experience in [industry if relevant]. Some career highlights include: [Projects/accomplishments relevant to JD's responsibilities]. I would like to leverage my experience to [outcome the role is looking for] at [company name and its goal/product type]"
+
+2. Experience, for each entry:
+   - List the IDs of the bullets to keep, most relevant first, at most 8
+   - Give reworded text only for bullets that should change, integrating specific technical skills and the job description's terminology; use null to keep a bullet's wording
+   - Quantify achievements where possible
+
+3. Skills:
+   - Return the complete skills section, reorganized to prioritize skills in the job description
+   - Ensure all technical skills mentioned in the bullets are listed
+   - Only list skills the resume supports
+
+Contact details, education, publications and open-source contributions are kept
+as they are and must not be repeated.
+
+Resume outline:
+{resume}
+
+Job Description:
+{job_description}
+
+{format_instructions}
+
+Keep all information truthful and accurate.
+""" # noqa: E501
+
+PARSE_RESUME_PROMPT = """
+Extract the following resume into a structured format. Copy all text exactly as
+written, without rewording, summarizing or dropping any entry or bullet point.
+
+Resume:
+{resume}
+
+{format_instructions}
+"""
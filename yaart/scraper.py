@@ -1,43 +1,294 @@
+import asyncio
 import httpx
-from typing import Optional
-from bs4 import BeautifulSoup
+from dataclasses import dataclass
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterable, Optional, Union
+from urllib.parse import urlsplit
 from yaart.models import JobDescription
 from yaart.llm import ResumeAssistant
+from yaart.extract import Extraction, FastTextExtractor, TextExtractor
+from yaart import jsonld
+from yaart.adapters import AdapterRegistry
+from yaart.http_cache import HTTPCache
+from yaart.instrumentation import Instrumentation
+from yaart.ratelimit import HostRateLimiter
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)' \
+    'AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+DEFAULT_TIMEOUT = httpx.Timeout(30.0, connect=10.0)
+DEFAULT_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=20,
+    keepalive_expiry=60.0
+)
+# HTTP/2 needs the optional `h2` package (`pip install httpx[http2]`)
+HTTP2_AVAILABLE = find_spec("h2") is not None
+
+
+@dataclass
+class ScrapeResult:
+    """Outcome of scraping a single URL in a bulk run"""
+    url: str
+    job_description: Optional[JobDescription] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class FetchedPage:
+    """HTML for a URL and whether it was served unchanged from the cache"""
+    url: str
+    html: str
+    not_modified: bool = False
+
 
 class JobScraper:
-    def __init__(self, assistant: Optional[ResumeAssistant] = None):
+    def __init__(
+        self,
+        assistant: Optional[ResumeAssistant] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        timeout: httpx.Timeout = DEFAULT_TIMEOUT,
+        limits: httpx.Limits = DEFAULT_LIMITS,
+        http2: Optional[bool] = None,
+        cache: Optional[Union[HTTPCache, str, Path]] = None,
+        extractor: Optional[TextExtractor] = None,
+        use_structured_data: bool = True,
+        adapters: Optional[AdapterRegistry] = None,
+        instrumentation: Optional[Instrumentation] = None
+    ):
         self.assistant = assistant or ResumeAssistant()
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)' \
-            'AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
+        self.headers = dict(DEFAULT_HEADERS)
+        self.timeout = timeout
+        self.limits = limits
+        self.http2 = HTTP2_AVAILABLE if http2 is None else http2
+        self._client = client
+        # Only close clients we created; injected clients belong to the caller
+        self._owns_client = client is None
+        if cache is not None and not isinstance(cache, HTTPCache):
+            cache = HTTPCache(cache)
+        self.cache = cache
+        self.extractor = extractor or FastTextExtractor()
+        self.use_structured_data = use_structured_data
+        self.adapters = adapters if adapters is not None else AdapterRegistry()
+        self.instrumentation = instrumentation or Instrumentation()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared HTTP client, created on first use and reused across requests"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                headers=self.headers,
+                follow_redirects=True,
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2
+            )
+            self._owns_client = True
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP client and its connection pool"""
+        if self._client is not None and self._owns_client:
+            await self._client.aclose()
+        self._client = None
+
+    async def __aenter__(self) -> "JobScraper":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def fetch_page(self, url: str) -> FetchedPage:
+        """
+        Fetch a page, revalidating any cached copy with a conditional GET.
+
+        When the server answers 304 Not Modified the cached body is returned
+        and `not_modified` is set so callers can skip re-parsing it.
+        """
+        cached = await asyncio.to_thread(self.cache.get, url) \
+            if self.cache is not None else None
+        headers = cached.conditional_headers() if cached is not None else None
+
+        response = await self.client.get(url, headers=headers)
+        await response.aread()
+
+        if self.cache is not None:
+            not_modified = cached is not None and response.status_code == 304
+            self.instrumentation.emit("cache", cache="http", hit=not_modified)
+            if cached is not None and not_modified:
+                return FetchedPage(url=url, html=cached.body, not_modified=True)
+            if response.is_success:
+                await asyncio.to_thread(self.cache.store_response, url, response)
+        return FetchedPage(url=url, html=response.text)
+
+    def extract(self, html: str) -> Extraction:
+        """Extract the job posting text from a page, with size accounting"""
+        with self.instrumentation.span("extract") as span:
+            extraction = self.extractor.extract(html)
+            span.update(
+                input_chars=extraction.input_chars,
+                output_chars=extraction.output_chars,
+                truncated=extraction.truncated
+            )
+            return extraction
+
+    def extract_text(self, html: str) -> str:
+        """Reduce an HTML page to the text handed to the job description parser"""
+        return self.extract(html).text
+
+    async def parse_page(self, page: FetchedPage) -> JobDescription:
+        """
+        Parse a fetched page into a job description.
+
+        Pages embedding a schema.org JobPosting are mapped directly; the LLM
+        is only asked for the fields the structured data leaves empty.
+        """
+        posting = jsonld.find_job_posting(page.html) \
+            if self.use_structured_data else None
+        fields = None
+        if posting is not None:
+            try:
+                fields = jsonld.map_job_posting(posting, page.url)
+            except (ValueError, KeyError, TypeError, AttributeError):
+                # Malformed structured data; the LLM reads the page instead
+                fields = None
+        if fields is None:
+            return await self.assistant.aparse_jd(
+                self.extract_text(page.html), page.url
+            )
+        return await self.from_fields(fields, page.html)
+
+    async def from_fields(
+        self,
+        fields: Dict[str, Any],
+        fallback_html: str = ""
+    ) -> JobDescription:
+        """Build a job description from structured fields, using the LLM only
+        for fields they leave empty"""
+        if not jsonld.missing_fields(fields):
+            return jsonld.to_job_description(fields)
+        text = jsonld.describe_for_llm(fields) if fields["description"] \
+            else self.extract_text(fallback_html)
+        parsed = await self.assistant.aparse_jd(text, fields["url"])
+        return jsonld.merge_job_description(fields, parsed)
+
+    async def fetch_fields(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetch a posting from its ATS JSON API when an adapter recognises the
+        URL. Returns None for unknown hosts or when the API call fails, so
+        callers can fall back to scraping the HTML page.
+        """
+        resolved = self.adapters.resolve(url)
+        if resolved is None:
+            return None
+        adapter, api_url = resolved
+        try:
+            response = await self.client.get(
+                api_url, headers={"Accept": "application/json"}
+            )
+            response.raise_for_status()
+            return adapter.to_fields(response.json(), url)
+        except (httpx.HTTPError, ValueError, KeyError, TypeError, AttributeError):
+            return None
 
     async def scrape_job_description(self, url: str) -> JobDescription:
         """Scrape and parse job description from URL"""
+        return await self._scrape(url)
+
+    async def revalidate_job_description(
+        self,
+        url: str,
+        stored: JobDescription
+    ) -> JobDescription:
+        """
+        Scrape a stored posting again, returning `stored` itself when its
+        page is unchanged.
+
+        Postings with an ATS adapter are re-read from the API. Other pages
+        are revalidated with a conditional GET, which needs the HTTP cache;
+        without one every revalidation would be a full re-parse, so it is
+        refused.
+        """
+        return await self._scrape(url, stored)
+
+    async def _scrape(
+        self,
+        url: str,
+        stored: Optional[JobDescription] = None
+    ) -> JobDescription:
         try:
-            async with httpx.AsyncClient(
-                headers=self.headers, follow_redirects=True) as client:
-                response = await client.get(url)
-                await response.aread()
-                
-                # Parse HTML and extract main content
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # Remove script and style elements
-                for script in soup(["script", "style"]):
-                    script.decompose()
-                
-                # Extract text content
-                text = soup.get_text()
-                
-                # Clean up whitespace
-                lines = (line.strip() for line in text.splitlines())
-                chunks = (phrase.strip() for line in lines for phrase in line.split("  ")) # noqa: E501
-                text = ' '.join(chunk for chunk in chunks if chunk)
-                
-                return self.assistant.parse_jd(text, url)
-                
+            with self.instrumentation.span("scrape", url=url) as span:
+                fields = await self.fetch_fields(url)
+                span["source"] = "api" if fields is not None else "page"
+                if fields is not None:
+                    return await self.from_fields(fields)
+                if stored is not None and self.cache is None:
+                    raise ValueError("revalidating a job page requires an HTTP cache")
+                page = await self.fetch_page(url)
+                if stored is not None and page.not_modified:
+                    return stored
+                return await self.parse_page(page)
         except httpx.HTTPError as e:
             raise ValueError(f"Failed to fetch job description: {str(e)}")
         except Exception as e:
-            raise ValueError(f"Failed to process job description: {str(e)}")
\ No newline at end of file
+            raise ValueError(f"Failed to process job description: {str(e)}")
+
+    async def scrape_many(
+        self,
+        urls: Iterable[str],
+        concurrency: int = 10,
+        per_host_limit: float = 1.0,
+        per_host_burst: int = 2
+    ) -> AsyncIterator[ScrapeResult]:
+        """
+        Scrape many job postings concurrently, yielding results as they complete.
+
+        Args:
+            urls: Job posting URLs to scrape
+            concurrency: Maximum number of postings processed at once
+            per_host_limit: Requests per second allowed for each host
+            per_host_burst: Requests a host may receive back-to-back before
+                the rate limit applies
+
+        Yields:
+            ScrapeResult for every URL, carrying either the parsed job
+            description or the error raised while scraping it
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        semaphore = asyncio.Semaphore(concurrency)
+        limiter = HostRateLimiter(per_host_limit, per_host_burst)
+        host_queues: Dict[str, asyncio.Lock] = {}
+
+        async def worker(url: str) -> ScrapeResult:
+            host = urlsplit(url).hostname or ""
+            # Wait out the host's rate limit before taking a slot, so a
+            # throttled host never idles slots other hosts could use. Each
+            # host queues for slots one URL at a time so its tokens can't
+            # pile up into a burst while the slots are busy.
+            async with host_queues.setdefault(host, asyncio.Lock()):
+                await limiter.acquire(host)
+                await semaphore.acquire()
+            try:
+                job_description = await self.scrape_job_description(url)
+                return ScrapeResult(url=url, job_description=job_description)
+            except Exception as e:
+                return ScrapeResult(url=url, error=e)
+            finally:
+                semaphore.release()
+
+        tasks = [asyncio.ensure_future(worker(url)) for url in urls]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Stop outstanding work if the caller stops iterating early
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,118 @@
+import re
+from typing import Iterable, List, Optional
+from yaart.models import Experience, Skill
+
+# "## Professional Experience", "## Work Experience", ...; not "### ..."
+EXPERIENCE_SECTION_PATTERN = re.compile(r"^##\s+[^#]*experience", re.IGNORECASE)
+SKILLS_SECTION_PATTERN = re.compile(r"^##\s+[^#]*skills", re.IGNORECASE)
+SECTION_PATTERN = re.compile(r"^#{1,2}\s")
+BULLET_PREFIXES = ("- ", "* ", "+ ")
+
+# Group that collects skills found in bullets but missing from every group
+ADDITIONAL_SKILLS_CATEGORY = "Additional Skills"
+# Longer requirement phrases ("5+ years building ...") are not skill names
+MAX_SKILL_WORDS = 4
+# Skill names this short are matched case-sensitively
+MAX_SHORT_SKILL_CHARS = 2
+
+
+def section_lines(markdown: str, pattern: re.Pattern) -> List[str]:
+    """Lines of the first `## ` section whose heading matches pattern"""
+    lines = markdown.splitlines()
+    start = next(
+        (i for i, line in enumerate(lines) if pattern.match(line.strip())), None
+    )
+    if start is None:
+        return []
+    section = []
+    for line in lines[start + 1:]:
+        if SECTION_PATTERN.match(line.strip()):
+            break
+        section.append(line)
+    return section
+
+
+def split_roles(markdown: str) -> List[str]:
+    """
+    Markdown of each entry in a resume's experience section, in order.
+
+    An entry starts at a `### ` heading, or at a bold line that opens the
+    section or follows a bullet list, so both the sample.md layout and
+    TailoredResume.to_markdown() output split correctly. Returns an empty
+    list when no experience section is found.
+    """
+    roles: List[List[str]] = []
+    previous: Optional[str] = None
+    for line in section_lines(markdown, EXPERIENCE_SECTION_PATTERN):
+        stripped = line.strip()
+        if not stripped:
+            if roles:
+                roles[-1].append(line)
+            continue
+        starts_role = stripped.startswith("### ") or (
+            stripped.startswith("**")
+            and (previous is None or previous.startswith(BULLET_PREFIXES))
+        )
+        if starts_role:
+            roles.append([])
+        if roles:
+            roles[-1].append(line)
+        previous = stripped
+    return ["\n".join(role).strip() for role in roles]
+
+
+def resume_skills(markdown: str) -> List[str]:
+    """Skills listed in a resume's skills section as `**Group:** a, b, c`"""
+    skills: List[str] = []
+    for line in section_lines(markdown, SKILLS_SECTION_PATTERN):
+        _, _, listed = line.rpartition(":**")
+        skills.extend(
+            skill.strip() for skill in listed.replace("*", "").split(",")
+        )
+    return [skill for skill in skills if skill]
+
+
+def skill_mentioned(skill: str, text: str) -> bool:
+    # Boundaries allow names like "C++", "C#", ".NET" and "Node.js"
+    pattern = rf"(?<![A-Za-z0-9]){re.escape(skill)}(?![A-Za-z0-9+#])"
+    if len(skill) > MAX_SHORT_SKILL_CHARS:
+        return re.search(pattern, text, re.IGNORECASE) is not None
+    # Short names like "Go", "R" or "C" are also ordinary words and
+    # abbreviations, so they must match exactly and stand on their own
+    # rather than in "go-to-market" or "R&D"
+    pattern = rf"(?<![&-]){pattern}(?![&-])"
+    return re.search(pattern, text) is not None
+
+
+def reconcile_skills(
+    skills: List[Skill],
+    experience: List[Experience],
+    candidates: Iterable[str],
+    category: str = ADDITIONAL_SKILLS_CATEGORY
+) -> List[Skill]:
+    """
+    Make the skills section cover the skills used in experience bullets.
+
+    Each candidate (e.g. a job requirement or a skill from the base resume)
+    that a bullet mentions but no skill group lists is appended to
+    `category`, which is created if needed. Groups are otherwise unchanged,
+    so the result is deterministic for the same inputs.
+    """
+    listed = {skill.lower() for group in skills for skill in group.skills}
+    bullets = "\n".join(bullet for exp in experience for bullet in exp.bullets)
+    missing = []
+    for candidate in candidates:
+        name = candidate.strip()
+        if not name or name.lower() in listed or len(name.split()) > MAX_SKILL_WORDS:
+            continue
+        if skill_mentioned(name, bullets):
+            missing.append(name)
+            listed.add(name.lower())
+    if not missing:
+        return skills
+    groups = [group.model_copy(deep=True) for group in skills]
+    for group in groups:
+        if group.category == category:
+            group.skills.extend(missing)
+            return groups
+    return groups + [Skill(category=category, skills=missing)]
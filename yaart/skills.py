@@ -0,0 +1,38 @@
+import re
+from typing import Dict
+
+# Common spellings mapped to one canonical (lowercase) skill name
+SKILL_ALIASES: Dict[str, str] = {
+    "amazon web services": "aws",
+    "golang": "go",
+    "gcp": "google cloud",
+    "google cloud platform": "google cloud",
+    "js": "javascript",
+    "k8s": "kubernetes",
+    "ml": "machine learning",
+    "node": "node.js",
+    "nodejs": "node.js",
+    "postgres": "postgresql",
+    "py": "python",
+    "python3": "python",
+    "react.js": "react",
+    "reactjs": "react",
+    "ts": "typescript",
+}
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+# Trailing list punctuation; a leading "." is kept for names like ".NET"
+TRAILING_PUNCTUATION = ",;:.!?"
+
+
+def canonical_skill(name: str) -> str:
+    """
+    Canonical form of a skill name for grouping across postings.
+
+    Case, spacing and trailing punctuation are normalized and known aliases
+    are folded, so "Postgres", "PostgreSQL " and "postgresql." all map to
+    "postgresql".
+    """
+    skill = WHITESPACE_PATTERN.sub(" ", name).strip()
+    skill = skill.rstrip(TRAILING_PUNCTUATION).lower()
+    return SKILL_ALIASES.get(skill, skill)
@@ -0,0 +1,222 @@
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from pydantic import TypeAdapter
+from yaart.models import (
+    EXPERIENCE_HEADING,
+    HEADER_FIELDS,
+    Experience,
+    TailoredResume,
+    education_markdown,
+    experience_markdown,
+    header_markdown,
+    open_source_markdown,
+    publications_markdown,
+    skills_markdown,
+    summary_markdown,
+)
+
+# Sections in document order; optional ones may be missing from the output
+SECTION_ORDER = (
+    "header", "summary", "education", "skills", "experience",
+    "publications", "open_source",
+)
+OPTIONAL_SECTIONS = ("publications", "open_source")
+SECTION_RENDERERS: Dict[str, Callable[[Any], str]] = {
+    "summary": summary_markdown,
+    "education": education_markdown,
+    "skills": skills_markdown,
+    "publications": publications_markdown,
+    "open_source": open_source_markdown,
+}
+
+_FIELD_ADAPTERS = {
+    name: TypeAdapter(field.rebuild_annotation())
+    for name, field in TailoredResume.model_fields.items()
+}
+
+
+@dataclass
+class ResumeSection:
+    """
+    A rendered markdown fragment of a tailored resume.
+
+    Experience is emitted as one section per role (`index` set) preceded by
+    the section heading (`index` None). Joining every fragment's markdown
+    and stripping the result gives TailoredResume.to_markdown().
+    """
+    name: str
+    markdown: str
+    index: Optional[int] = None
+
+
+class JSONObjectScanner:
+    """
+    Incremental scanner over a JSON object that arrives in chunks.
+
+    `feed` reports each top-level member as ("member", key, value) once its
+    value is complete, and each object element of the arrays named in
+    `array_keys` as ("item", key, value) as soon as it closes. Text before
+    the opening brace, such as a markdown code fence, is skipped.
+    """
+
+    def __init__(self, array_keys: Iterable[str] = ()):
+        self.array_keys = set(array_keys)
+        self.text = ""
+        self.done = False
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._key_start: Optional[int] = None
+        self._key: Optional[str] = None
+        self._value_start: Optional[int] = None
+        self._value_is_array = False
+        self._item_start: Optional[int] = None
+
+    def feed(self, chunk: str) -> List[Tuple[str, str, Any]]:
+        self.text += chunk
+        events: List[Tuple[str, str, Any]] = []
+        text = self.text
+        while self._pos < len(text) and not self.done:
+            i = self._pos
+            char = text[i]
+            self._pos += 1
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._key_start is not None:
+                        self._key = json.loads(
+                            text[self._key_start:i + 1], strict=False
+                        )
+                        self._key_start = None
+                continue
+            if self._depth == 0:
+                if char == "{":
+                    self._depth = 1
+                continue
+            if char == '"':
+                self._in_string = True
+                if self._depth == 1 and self._key is None:
+                    self._key_start = i
+            elif char == ":" and self._depth == 1 and self._value_start is None:
+                self._value_start = i + 1
+            elif char in "{[":
+                if self._depth == 1 and char == "[":
+                    self._value_is_array = True
+                elif (self._depth == 2 and char == "{" and self._value_is_array
+                      and self._key in self.array_keys):
+                    self._item_start = i
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if (self._depth == 2 and self._item_start is not None
+                        and self._key is not None):
+                    item = json.loads(text[self._item_start:i + 1], strict=False)
+                    events.append(("item", self._key, item))
+                    self._item_start = None
+                elif self._depth == 0:
+                    events.extend(self._end_member(i))
+                    self.done = True
+            elif char == "," and self._depth == 1:
+                events.extend(self._end_member(i))
+        return events
+
+    def _end_member(self, end: int) -> List[Tuple[str, str, Any]]:
+        key, start = self._key, self._value_start
+        self._key = self._value_start = None
+        self._value_is_array = False
+        if key is None or start is None:
+            return []
+        return [("member", key, json.loads(self.text[start:end], strict=False))]
+
+
+class ResumeSectionStream:
+    """
+    Turns a streamed TailoredResume JSON completion into markdown sections.
+
+    Sections are released in document order as soon as the fields they
+    render are complete and valid. Once a value fails validation nothing
+    more is released until `finish`, which takes the fully parsed (and, if
+    needed, repaired) resume and releases whatever is left.
+    """
+
+    def __init__(self):
+        self.scanner = JSONObjectScanner(array_keys=("experience",))
+        self._members: Dict[str, Any] = {}
+        self._experience: List[Experience] = []
+        self._released_roles = 0
+        self._cursor = 0
+        self._held = False
+
+    @property
+    def text(self) -> str:
+        """Everything fed so far"""
+        return self.scanner.text
+
+    def feed(self, chunk: str) -> List[ResumeSection]:
+        try:
+            events = self.scanner.feed(chunk)
+        except ValueError:
+            # Malformed JSON; finish gets the resume the repair path recovers
+            events = []
+            self._held = True
+        for kind, key, value in events:
+            try:
+                if kind == "item":
+                    self._experience.append(Experience.model_validate(value))
+                elif key in _FIELD_ADAPTERS:
+                    self._members[key] = _FIELD_ADAPTERS[key].validate_python(value)
+            except ValueError:
+                self._held = True
+        if self._held:
+            return []
+        return self._release(finished=False)
+
+    def finish(self, resume: TailoredResume) -> List[ResumeSection]:
+        """Release the remaining sections from the fully parsed resume"""
+        self._members = {
+            name: getattr(resume, name) for name in TailoredResume.model_fields
+        }
+        self._experience = list(resume.experience)
+        return self._release(finished=True)
+
+    def _release(self, finished: bool) -> List[ResumeSection]:
+        sections: List[ResumeSection] = []
+        while self._cursor < len(SECTION_ORDER):
+            name = SECTION_ORDER[self._cursor]
+            if name == "header":
+                if not all(field in self._members for field in HEADER_FIELDS):
+                    break
+                sections.append(ResumeSection("header", header_markdown(
+                    *(self._members[field] for field in HEADER_FIELDS)
+                )))
+            elif name == "experience":
+                sections.extend(self._release_roles())
+                if "experience" not in self._members:
+                    break
+                if not self._released_roles:
+                    sections.append(ResumeSection("experience", EXPERIENCE_HEADING))
+            elif name in self._members:
+                markdown = SECTION_RENDERERS[name](self._members[name])
+                if markdown:
+                    sections.append(ResumeSection(name, markdown))
+            elif not (finished and name in OPTIONAL_SECTIONS):
+                break
+            self._cursor += 1
+        return sections
+
+    def _release_roles(self) -> List[ResumeSection]:
+        sections = []
+        for index in range(self._released_roles, len(self._experience)):
+            if index == 0:
+                sections.append(ResumeSection("experience", EXPERIENCE_HEADING))
+            sections.append(ResumeSection(
+                "experience", experience_markdown(self._experience[index]), index
+            ))
+        self._released_roles = len(self._experience)
+        return sections
@@ -0,0 +1,185 @@
+import json
+from inspect import isclass
+from typing import (
+    Annotated, Any, Dict, List, Optional, Tuple, Type, Union, get_args
+)
+from langchain_core.exceptions import OutputParserException
+from langchain_core.output_parsers import BaseOutputParser
+from langchain_core.outputs import Generation
+from langchain_core.utils.json import parse_json_markdown
+from pydantic import BaseModel, SkipValidation, TypeAdapter, ValidationError
+
+FieldPath = Tuple[Union[str, int], ...]
+
+
+def load_payload(text: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Best-effort JSON object from model output, tolerating code fences and
+    output cut off mid-object. Returns None when nothing usable is found.
+    """
+    if not text:
+        return None
+    try:
+        payload = parse_json_markdown(text)
+    except (ValueError, TypeError):
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+class ToolCallOutputParser(BaseOutputParser):
+    """
+    Validates native structured output against a Pydantic model.
+
+    Reads the arguments of the first tool call, falling back to JSON in the
+    message content (as returned for cached completions). Validation errors
+    raise OutputParserException with the payload as `llm_output`, the same
+    contract as PydanticOutputParser, so callers can repair either.
+    """
+    pydantic_object: Annotated[Type[BaseModel], SkipValidation()]
+
+    @property
+    def _type(self) -> str:
+        return "tool_call_pydantic"
+
+    def parse_result(self, result: List[Generation], *, partial: bool = False) -> Any:
+        message = getattr(result[0], "message", None)
+        tool_calls = getattr(message, "tool_calls", None)
+        if tool_calls:
+            return self._validate(tool_calls[0]["args"])
+        return self.parse(result[0].text)
+
+    def parse(self, text: str) -> Any:
+        payload = load_payload(text)
+        if payload is None:
+            raise OutputParserException(
+                f"Could not find a JSON object in completion: {text[:200]}",
+                llm_output=text
+            )
+        return self._validate(payload)
+
+    def _validate(self, payload: Dict[str, Any]) -> Any:
+        try:
+            return self.pydantic_object.model_validate(payload)
+        except ValidationError as e:
+            json_string = json.dumps(payload)
+            raise OutputParserException(
+                f"Failed to validate {self.pydantic_object.__name__}: {e}",
+                llm_output=json_string
+            ) from e
+
+
+def path_key(path: FieldPath) -> str:
+    return ".".join(str(part) for part in path)
+
+
+def invalid_fields(error: ValidationError) -> Dict[str, FieldPath]:
+    """
+    Fields to re-request for a validation error, keyed by dotted path.
+
+    Errors inside a list of scalars are widened to the whole field, and
+    paths nested inside another invalid path are dropped. An error on the
+    document itself is keyed by the empty path.
+    """
+    paths: Dict[str, FieldPath] = {}
+    for detail in error.errors():
+        path: FieldPath = tuple(detail["loc"])
+        while path and not isinstance(path[-1], str):
+            path = path[:-1]
+        paths[path_key(path)] = path
+    return {
+        key: path for key, path in paths.items()
+        if not any(other != path and path[:len(other)] == other
+                   for other in paths.values())
+    }
+
+
+def get_path(data: Any, path: FieldPath) -> Any:
+    for part in path:
+        try:
+            data = data[part]
+        except (KeyError, IndexError, TypeError):
+            return None
+    return data
+
+
+def set_path(data: Dict[str, Any], path: FieldPath, value: Any) -> None:
+    target: Any = data
+    for part in path[:-1]:
+        target = target[part]
+    target[path[-1]] = value
+
+
+def _nested_model(annotation: Any) -> Optional[Type[BaseModel]]:
+    if isclass(annotation) and issubclass(annotation, BaseModel):
+        return annotation
+    for arg in get_args(annotation):
+        model = _nested_model(arg)
+        if model is not None:
+            return model
+    return None
+
+
+def field_schema(model: Type[BaseModel], path: FieldPath) -> Optional[Dict[str, Any]]:
+    """JSON schema of the field at path, or None if the path is unknown"""
+    current: Optional[Type[BaseModel]] = model
+    field = None
+    for part in path:
+        if isinstance(part, int):
+            continue
+        if current is None or part not in current.model_fields:
+            return None
+        field = current.model_fields[part]
+        current = _nested_model(field.annotation)
+    if field is None:
+        return None
+    schema = TypeAdapter(field.rebuild_annotation()).json_schema()
+    if field.description:
+        schema["description"] = field.description
+    return schema
+
+
+def describe_invalid_fields(
+    model: Type[BaseModel],
+    data: Dict[str, Any],
+    fields: Dict[str, FieldPath],
+    error: ValidationError
+) -> str:
+    """Repair instructions: each invalid field with its value, errors, schema
+    and the object it belongs to"""
+    messages: Dict[str, List[str]] = {key: [] for key in fields}
+    for detail in error.errors():
+        loc = tuple(detail["loc"])
+        for key, path in fields.items():
+            if loc[:len(path)] == path:
+                messages[key].append(detail["msg"])
+    blocks = []
+    for key, path in fields.items():
+        lines = [
+            f"- path: {key}",
+            f"  current value: {json.dumps(get_path(data, path))}",
+            f"  errors: {'; '.join(dict.fromkeys(messages[key]))}",
+            f"  schema: {json.dumps(field_schema(model, path))}",
+        ]
+        if len(path) > 1:
+            lines.append(f"  belongs to: {json.dumps(get_path(data, path[:-1]))}")
+        blocks.append("\n".join(lines))
+    return "\n".join(blocks)
+
+
+def apply_repairs(
+    data: Dict[str, Any],
+    fields: Dict[str, FieldPath],
+    repaired: Any
+) -> Dict[str, Any]:
+    """Copy of data with the repaired values written back; keys the model
+    was not asked about are ignored"""
+    data = json.loads(json.dumps(data))
+    if not isinstance(repaired, dict):
+        return data
+    for key, path in fields.items():
+        if key in repaired:
+            try:
+                set_path(data, path, repaired[key])
+            except (KeyError, IndexError, TypeError):
+                continue
+    return data
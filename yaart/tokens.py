@@ -0,0 +1,251 @@
+import asyncio
+import math
+import re
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+CHARS_PER_TOKEN = 4
+
+# Paragraphs mentioning these are what parse_jd extracts
+SIGNAL_PATTERN = re.compile(
+    r"responsibilit|requirement|qualification|skill|experience|degree|education|"
+    r"salary|compensation|pay range|benefit|location|remote|hybrid|on-?site|"
+    r"years|you will|you'll|must|preferred|nice to have|bonus|equity|\$\d",
+    re.IGNORECASE
+)
+# Page furniture and legal text that rarely changes the parsed result
+NOISE_PATTERN = re.compile(
+    r"cookie|privacy|equal (?:employment )?opportunity|\beeo\b|accommodation|"
+    r"copyright|all rights reserved|subscribe|sign in|log in|apply now|"
+    r"share this|follow us|terms of (?:use|service)|veteran|gender identity",
+    re.IGNORECASE
+)
+BULLET_PATTERN = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s")
+
+
+def approximate_tokens(text: str) -> int:
+    """Character based token estimate used when no tokenizer is available"""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+class TokenCounter:
+    """
+    Counts tokens with the tiktoken encoding for `model`, falling back to a
+    character based estimate when tiktoken or the encoding is unavailable.
+    """
+
+    def __init__(self, model: Optional[str] = None, encoding: Any = None):
+        self.model = model
+        self._encoding = encoding
+        self._resolved = encoding is not None or model is None
+        self._resolve_lock = threading.Lock()
+
+    @classmethod
+    def for_llm(cls, llm: Any) -> "TokenCounter":
+        """Counter for the model name a LangChain model is configured with"""
+        for attr in ("model_name", "model"):
+            name = getattr(llm, attr, None)
+            if isinstance(name, str):
+                return cls(name)
+        return cls()
+
+    @property
+    def encoding(self) -> Any:
+        if not self._resolved and self.model is not None:
+            with self._resolve_lock:
+                if not self._resolved:
+                    try:
+                        import tiktoken
+                        self._encoding = tiktoken.encoding_for_model(self.model)
+                    except Exception:
+                        # Unknown model, tiktoken missing or encoding not
+                        # downloadable
+                        self._encoding = None
+                    self._resolved = True
+        return self._encoding
+
+    async def aresolve(self) -> None:
+        """
+        Load the encoding in a worker thread, as tiktoken may download it
+        on first use, so later counts don't block the event loop.
+        """
+        if not self._resolved:
+            await asyncio.to_thread(lambda: self.encoding)
+
+    def count(self, text: str) -> int:
+        encoding = self.encoding
+        if encoding is None:
+            return approximate_tokens(text)
+        return len(encoding.encode(text, disallowed_special=()))
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Longest prefix of text that fits in max_tokens"""
+        encoding = self.encoding
+        if encoding is None:
+            return text[:max_tokens * CHARS_PER_TOKEN]
+        tokens = encoding.encode(text, disallowed_special=())
+        return encoding.decode(tokens[:max_tokens])
+
+
+def dedupe_lines(text: str) -> str:
+    """Drop repeated lines (ignoring case and spacing) and runs of blank lines"""
+    seen = set()
+    lines: List[str] = []
+    for line in text.splitlines():
+        key = " ".join(line.lower().split())
+        if not key:
+            if lines and lines[-1]:
+                lines.append("")
+            continue
+        if key in seen:
+            continue
+        seen.add(key)
+        lines.append(line.rstrip())
+    return "\n".join(lines).strip()
+
+
+def score_paragraph(paragraph: str, index: int) -> int:
+    """Higher for paragraphs likely to hold fields parse_jd extracts"""
+    score = 3 * len(SIGNAL_PATTERN.findall(paragraph))
+    score -= 5 * len(NOISE_PATTERN.findall(paragraph))
+    score += sum(1 for line in paragraph.splitlines() if BULLET_PATTERN.match(line))
+    if index < 3:
+        # The title, company and location usually lead the posting
+        score += 2
+    return score
+
+
+def compress_text(text: str, max_tokens: int, counter: TokenCounter) -> str:
+    """
+    Deterministically shrink text to at most max_tokens.
+
+    Repeated lines are removed first. If that is not enough, paragraphs (or
+    lines, for text without blank lines) are ranked by score_paragraph and
+    the best ones that fit are kept in their original order.
+    """
+    text = dedupe_lines(text)
+    if counter.count(text) <= max_tokens:
+        return text
+    separator = "\n\n" if "\n\n" in text else "\n"
+    paragraphs = text.split(separator)
+    ranked = sorted(
+        range(len(paragraphs)),
+        key=lambda i: (-score_paragraph(paragraphs[i], i), i)
+    )
+    separator_tokens = counter.count(separator)
+    kept = set()
+    used = 0
+    for i in ranked:
+        cost = counter.count(paragraphs[i]) + separator_tokens
+        if used + cost <= max_tokens:
+            kept.add(i)
+            used += cost
+    if not kept:
+        return counter.truncate(paragraphs[ranked[0]], max_tokens)
+    compressed = separator.join(paragraphs[i] for i in sorted(kept))
+    # Per-paragraph counts can undercount merges across separators
+    if counter.count(compressed) > max_tokens:
+        compressed = counter.truncate(compressed, max_tokens)
+    return compressed
+
+
+@dataclass
+class TokenUsage:
+    """Tokens used by one assistant call"""
+    operation: str
+    input_tokens: int
+    output_tokens: int
+    # Prompt size before compression; equals input_tokens when not compressed
+    original_input_tokens: int
+    compressed: bool = False
+    # Zero when the completion came from the response cache
+    llm_calls: int = 0
+    # Prompt tokens the provider read from / wrote to its prompt prefix cache
+    cached_input_tokens: int = 0
+    cache_creation_input_tokens: int = 0
+
+
+class TokenUsageHandler(BaseCallbackHandler):
+    """
+    Collects token counts for the model calls made during one run.
+
+    Provider-reported usage is used when the message carries it; otherwise
+    the completion text is counted with `counter`.
+    """
+
+    def __init__(self, counter: TokenCounter):
+        self.counter = counter
+        # Parallel branches of one run report to the same handler
+        self._lock = threading.Lock()
+        self.llm_calls = 0
+        self.reported_input_tokens = 0
+        self.cached_input_tokens = 0
+        self.cache_creation_input_tokens = 0
+        self.output_tokens = 0
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        with self._lock:
+            self._add(response)
+
+    def _add(self, response: LLMResult) -> None:
+        for generations in response.generations:
+            for generation in generations:
+                self.llm_calls += 1
+                message = getattr(generation, "message", None)
+                usage = getattr(message, "usage_metadata", None)
+                if usage:
+                    self.reported_input_tokens += usage.get("input_tokens", 0)
+                    self.output_tokens += usage.get("output_tokens", 0)
+                    details = usage.get("input_token_details") or {}
+                    self.cached_input_tokens += details.get("cache_read") or 0
+                    self.cache_creation_input_tokens += \
+                        details.get("cache_creation") or 0
+                else:
+                    self.output_tokens += self.counter.count(generation.text)
+
+    def usage(self, operation: str, input_tokens: int,
+              original_input_tokens: Optional[int] = None) -> TokenUsage:
+        """Build the usage record, given the estimated prompt size"""
+        if original_input_tokens is None:
+            original_input_tokens = input_tokens
+        return TokenUsage(
+            operation=operation,
+            input_tokens=self.reported_input_tokens or input_tokens,
+            output_tokens=self.output_tokens,
+            original_input_tokens=original_input_tokens,
+            compressed=original_input_tokens > input_tokens,
+            llm_calls=self.llm_calls,
+            cached_input_tokens=self.cached_input_tokens,
+            cache_creation_input_tokens=self.cache_creation_input_tokens
+        )
+
+
+class TokenUsageTracker:
+    """Running token totals per operation, recent records and listeners"""
+
+    def __init__(self, history: int = 1000):
+        self.records: Deque[TokenUsage] = deque(maxlen=history)
+        self.listeners: List[Callable[[TokenUsage], None]] = []
+        self._totals: Dict[str, Dict[str, int]] = {}
+
+    def record(self, usage: TokenUsage) -> None:
+        self.records.append(usage)
+        totals = self._totals.setdefault(usage.operation, {
+            "calls": 0, "input_tokens": 0, "output_tokens": 0,
+            "original_input_tokens": 0, "cached_input_tokens": 0,
+        })
+        totals["calls"] += 1
+        totals["input_tokens"] += usage.input_tokens
+        totals["output_tokens"] += usage.output_tokens
+        totals["original_input_tokens"] += usage.original_input_tokens
+        totals["cached_input_tokens"] += usage.cached_input_tokens
+        for listener in self.listeners:
+            listener(usage)
+
+    def totals(self) -> Dict[str, Dict[str, int]]:
+        """Totals keyed by operation, e.g. {"parse_jd": {"calls": 2, ...}}"""
+        return {operation: dict(totals) for operation, totals in self._totals.items()}
@@ -0,0 +1,101 @@
+import fnmatch
+from typing import Callable, Iterable, List, Sequence, Tuple
+from urllib.parse import SplitResult, parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track where a visitor came from. Generic names
+# such as "ref", "source" or "src" are left alone, since some job boards use
+# them to select the posting.
+DEFAULT_TRACKING_PARAMS = (
+    "utm_*", "gclid", "gclsrc", "dclid", "fbclid", "msclkid", "mc_cid", "mc_eid",
+    "_hsenc", "_hsmi", "hsa_*", "trk", "trkid", "trackingid", "gh_src",
+    "lever-source", "lever-origin", "lever-via", "ashby_jid_source", "iis", "iisn",
+)
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+Rule = Callable[[SplitResult], SplitResult]
+
+
+def greenhouse_rule(parts: SplitResult) -> SplitResult:
+    """Fold job-boards.greenhouse.io into boards.greenhouse.io and drop a
+    gh_jid that repeats the job id already in the path"""
+    if not parts.netloc.endswith("greenhouse.io"):
+        return parts
+    netloc = parts.netloc.replace("job-boards.", "boards.", 1)
+    query = parts.query
+    if "/jobs/" in parts.path:
+        query = urlencode([
+            (key, value) for key, value in parse_qsl(query, keep_blank_values=True)
+            if key != "gh_jid"
+        ])
+    return parts._replace(netloc=netloc, query=query)
+
+
+def lever_rule(parts: SplitResult) -> SplitResult:
+    """Treat a Lever application form URL as the posting it belongs to"""
+    if parts.netloc.endswith("lever.co") and parts.path.rstrip("/").endswith("/apply"):
+        return parts._replace(path=parts.path.rstrip("/")[:-len("/apply")])
+    return parts
+
+
+DEFAULT_RULES: Tuple[Rule, ...] = (greenhouse_rule, lever_rule)
+
+
+class URLCanonicalizer:
+    """
+    Normalizes job posting URLs so that the same posting reached through
+    tracking links, trailing slashes or host aliases maps to one key.
+    """
+
+    def __init__(
+        self,
+        drop_params: Iterable[str] = DEFAULT_TRACKING_PARAMS,
+        rules: Sequence[Rule] = DEFAULT_RULES,
+        strip_trailing_slash: bool = True,
+        sort_params: bool = True,
+        force_https: bool = False
+    ):
+        self.drop_params: List[str] = [param.lower() for param in drop_params]
+        self.rules = list(rules)
+        self.strip_trailing_slash = strip_trailing_slash
+        self.sort_params = sort_params
+        self.force_https = force_https
+
+    def _keep_param(self, key: str) -> bool:
+        key = key.lower()
+        return not any(
+            fnmatch.fnmatchcase(key, pattern) for pattern in self.drop_params
+        )
+
+    def canonicalize(self, url: str) -> str:
+        parts = urlsplit(url.strip())
+        scheme = parts.scheme.lower()
+        if self.force_https and scheme == "http":
+            scheme = "https"
+        host = (parts.hostname or "").lower()
+        if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+            host = f"{host}:{parts.port}"
+        path = parts.path or "/"
+        if self.strip_trailing_slash and len(path) > 1:
+            path = path.rstrip("/") or "/"
+        params = [
+            (key, value)
+            for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if self._keep_param(key)
+        ]
+        if self.sort_params:
+            params.sort()
+        canonical = SplitResult(scheme, host, path, urlencode(params), "")
+        for rule in self.rules:
+            canonical = rule(canonical)
+        return urlunsplit(canonical)
+
+    def __call__(self, url: str) -> str:
+        return self.canonicalize(url)
+
+
+_default_canonicalizer = URLCanonicalizer()
+
+
+def canonicalize_url(url: str) -> str:
+    """Canonicalize a URL with the default rules"""
+    return _default_canonicalizer.canonicalize(url)